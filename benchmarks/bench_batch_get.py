@@ -0,0 +1,50 @@
+"""Compare sequential GetItem reads with BatchGetItem on a moto table
+
+Run from the repository root with: python -m benchmarks.bench_batch_get
+"""
+
+import timeit
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from src.models.pynamo_models import (  # noqa: E402
+    VesselItemModel,
+    VesselItemNotFound,
+)
+from tests.resources.vessel_data import VESSEL_ITEMS  # noqa: E402
+
+VESSELS = 200
+REPEAT = 3
+
+
+def main() -> None:
+    with mock_dynamodb():
+        create_shipping_data_table()
+        VesselItemModel.write_vessel_items(VESSEL_ITEMS)
+        keys = [(item["reporting_period"], item["imo_number"]) for item in VESSEL_ITEMS]
+        keys += [(2018, str(1000000 + index)) for index in range(VESSELS - len(keys))]
+
+        def read_sequentially() -> None:
+            for key in keys:
+                try:
+                    VesselItemModel.read_vessel_item(*key)
+                except VesselItemNotFound:
+                    pass
+
+        def read_in_batches() -> None:
+            VesselItemModel.read_vessel_items(keys)
+
+        sequential = min(timeit.repeat(read_sequentially, number=1, repeat=REPEAT))
+        batched = min(timeit.repeat(read_in_batches, number=1, repeat=REPEAT))
+
+    print(f"GetItem:      {sequential * 1000:8.1f} ms per {VESSELS} vessels")
+    print(f"BatchGetItem: {batched * 1000:8.1f} ms per {VESSELS} vessels")
+    print(f"speedup:      {sequential / batched:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
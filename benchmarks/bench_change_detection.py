@@ -0,0 +1,79 @@
+"""Compare rewriting a republished reporting period with skipping its unchanged
+vessel items, on a moto table
+
+Capacity units are estimated from the size of the items, since moto does not
+report realistic consumed capacity. Reading the stored content hashes costs
+half a read capacity unit per 4 KB item with eventually consistent reads.
+
+Run from the repository root with: python -m benchmarks.bench_change_detection
+"""
+
+import math
+import time
+from copy import deepcopy
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from src.models.capacity import estimate_write_units  # noqa: E402
+from src.models.pynamo_models import BATCH_WRITE_SIZE, VesselItemModel  # noqa: E402
+from tests.resources.vessel_data import VESSEL_ITEMS  # noqa: E402
+
+VESSELS = 1000
+CHANGED_EVERY = 20
+
+
+def generate_vessel_items(count: int) -> list:
+    vessel_items = []
+    for index in range(count):
+        vessel_item = deepcopy(VESSEL_ITEMS[index % len(VESSEL_ITEMS)])
+        vessel_item["imo_number"] = str(9000000 + index * 37)
+        vessel_items.append(vessel_item)
+    return vessel_items
+
+
+def ingest(vessel_items: list, skip_unchanged: bool) -> tuple:
+    started = time.perf_counter()
+    written = 0
+    for start in range(0, len(vessel_items), BATCH_WRITE_SIZE):
+        result = VesselItemModel.write_vessel_items(
+            vessel_items[start : start + BATCH_WRITE_SIZE],
+            skip_unchanged=skip_unchanged,
+        )
+        written += result.written
+    return time.perf_counter() - started, written
+
+
+def republish(
+    vessel_items: list, republished_items: list, skip_unchanged: bool
+) -> tuple:
+    with mock_dynamodb():
+        create_shipping_data_table()
+        ingest(vessel_items, skip_unchanged=False)
+        return ingest(republished_items, skip_unchanged)
+
+
+def main() -> None:
+    vessel_items = generate_vessel_items(VESSELS)
+    republished_items = deepcopy(vessel_items)
+    for vessel_item in republished_items[::CHANGED_EVERY]:
+        vessel_item["name"] = f"{vessel_item['name']} II"
+
+    item = VesselItemModel.from_vessel_item(vessel_items[0]).serialize()
+    write_units = estimate_write_units(item)
+    read_units = 0.5 * math.ceil(write_units / 4)
+
+    for label, skip_unchanged in (("rewrite", False), ("skip", True)):
+        duration, written = republish(vessel_items, republished_items, skip_unchanged)
+        units = written * write_units + skip_unchanged * VESSELS * read_units
+        print(
+            f"{label:8} {duration * 1000:8.1f} ms, {written:5} items written, "
+            f"{units:8.1f} capacity units"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare clean_raw_vessel_data with a compiled CleaningPlan on 10k rows
+
+Run from the repository root with: python -m benchmarks.bench_cleaning_plan
+"""
+
+import timeit
+from itertools import cycle, islice
+
+from src.data_ingestion.data_processing import (
+    CleaningPlan,
+    clean_raw_vessel_data,
+    load_column_type_mappings,
+)
+from tests.resources.vessel_data import VESSEL_DATA_RAW
+
+ROWS = 10_000
+REPEAT = 5
+
+
+def main() -> None:
+    column_type_mappings = load_column_type_mappings()
+    rows = list(islice(cycle(VESSEL_DATA_RAW), ROWS))
+    cleaning_plan = CleaningPlan(list(VESSEL_DATA_RAW[0]), column_type_mappings)
+
+    def clean_with_passes() -> None:
+        for row in rows:
+            clean_raw_vessel_data(dict(row), column_type_mappings)
+
+    def clean_with_plan() -> None:
+        for row in rows:
+            cleaning_plan.clean(dict(row))
+
+    passes = min(timeit.repeat(clean_with_passes, number=1, repeat=REPEAT))
+    plan = min(timeit.repeat(clean_with_plan, number=1, repeat=REPEAT))
+
+    print(f"clean_raw_vessel_data: {passes * 1000:8.1f} ms per {ROWS} rows")
+    print(f"CleaningPlan.clean:    {plan * 1000:8.1f} ms per {ROWS} rows")
+    print(f"speedup:               {passes / plan:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare row by row and columnar cleaning of 10k CSV rows
+
+Run from the repository root with: python -m benchmarks.bench_columnar
+"""
+
+import timeit
+from itertools import cycle, islice
+
+from src.data_ingestion.columnar import COLUMNAR_BLOCK_SIZE, ColumnarCleaner
+from src.data_ingestion.data_processing import (
+    CleaningPlan,
+    clean_column,
+    load_column_type_mappings,
+)
+from tests.resources.csv_content import CSV_CONTENT
+
+ROWS = 10_000
+REPEAT = 5
+
+
+def main() -> None:
+    columns = [clean_column(column) for column in CSV_CONTENT[0]]
+    rows = list(islice(cycle(CSV_CONTENT[1:]), ROWS))
+    cleaning_plan = CleaningPlan(columns, load_column_type_mappings())
+    columnar_cleaner = ColumnarCleaner(columns, cleaning_plan)
+
+    def clean_by_row() -> None:
+        for row in rows:
+            cleaning_plan.clean(dict(zip(columns, row)))
+
+    def clean_by_column() -> None:
+        for start in range(0, ROWS, COLUMNAR_BLOCK_SIZE):
+            columnar_cleaner.clean_block(rows[start : start + COLUMNAR_BLOCK_SIZE])
+
+    by_row = min(timeit.repeat(clean_by_row, number=1, repeat=REPEAT))
+    by_column = min(timeit.repeat(clean_by_column, number=1, repeat=REPEAT))
+
+    print(f"row engine:      {by_row * 1000:8.1f} ms per {ROWS} rows")
+    print(f"columnar engine: {by_column * 1000:8.1f} ms per {ROWS} rows")
+    print(f"speedup:         {by_row / by_column:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare cleaning and validating 20k CSV rows in one process with fanning the
+file out to a process pool in byte ranges
+
+Writing to DynamoDB is left out, so only the CPU bound part of ingestion which
+fan-out spreads over cores is timed. The time to scan the file for record
+boundaries is included.
+
+Run from the repository root with: python -m benchmarks.bench_fan_out
+"""
+
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+from typing import List, Optional
+
+from src.data_ingestion.checkpoint import CheckpointedCsvRows
+from src.data_ingestion.data_processing import ByteOffsetLines
+from src.data_ingestion.fan_out import split_byte_ranges
+from src.data_ingestion.handler import get_vessel_generator
+from tests.resources.csv_content import CSV_CONTENT
+
+ROWS = 20_000
+PROCESSES = os.cpu_count() or 1
+
+
+def generate_content() -> bytes:
+    csv_file = io.StringIO(newline="")
+    writer = csv.writer(csv_file)
+    writer.writerow(CSV_CONTENT[0])
+    for index, row in enumerate(islice(cycle(CSV_CONTENT[1:]), ROWS)):
+        writer.writerow([str(1000000 + index)] + row[1:])
+    return csv_file.getvalue().encode("utf-8")
+
+
+def count_vessel_items(content: bytes, header: Optional[List[str]] = None) -> int:
+    csv_rows = CheckpointedCsvRows(ByteOffsetLines([content]), header=header)
+    return sum(1 for item in get_vessel_generator({}, csv_rows) or () if item)
+
+
+def main() -> None:
+    content = generate_content()
+
+    started = time.perf_counter()
+    single = count_vessel_items(content)
+    single_duration = time.perf_counter() - started
+
+    started = time.perf_counter()
+    _, byte_ranges = split_byte_ranges([content], len(content), PROCESSES)
+    with ProcessPoolExecutor(max_workers=PROCESSES) as executor:
+        fanned_out = sum(
+            executor.map(
+                count_vessel_items,
+                [content[start:end] for start, end in byte_ranges],
+                [CSV_CONTENT[0]] * len(byte_ranges),
+            )
+        )
+    fan_out_duration = time.perf_counter() - started
+
+    assert single == fanned_out == ROWS
+    print(f"single process: {single_duration * 1000:8.1f} ms per {ROWS} rows")
+    print(
+        f"fan-out:        {fan_out_duration * 1000:8.1f} ms per {ROWS} rows "
+        f"over {len(byte_ranges)} processes"
+    )
+    print(f"speedup:        {single_duration / fan_out_duration:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare VesselItem validation with the fast validator on 10k items
+
+Run from the repository root with: python -m benchmarks.bench_fast_validation
+"""
+
+import timeit
+from itertools import cycle, islice
+
+from src.models.fast_validation import validate_vessel_item
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+ITEMS = 10_000
+REPEAT = 5
+
+
+def main() -> None:
+    items = list(islice(cycle(VESSEL_ITEMS), ITEMS))
+
+    def validate_with_pydantic() -> None:
+        for item in items:
+            model_to_primitive_dict(VesselItem(**item))
+
+    def validate_fast() -> None:
+        for item in items:
+            validate_vessel_item(item)
+
+    pydantic = min(timeit.repeat(validate_with_pydantic, number=1, repeat=REPEAT))
+    fast = min(timeit.repeat(validate_fast, number=1, repeat=REPEAT))
+
+    print(f"VesselItem:           {pydantic * 1000:8.1f} ms per {ITEMS} items")
+    print(f"validate_vessel_item: {fast * 1000:8.1f} ms per {ITEMS} items")
+    print(f"speedup:              {pydantic / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
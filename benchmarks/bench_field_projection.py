@@ -0,0 +1,49 @@
+"""Compare validating whole vessel items with validating projected fields
+
+Run from the repository root with: python -m benchmarks.bench_field_projection
+"""
+
+import json
+import timeit
+from itertools import cycle, islice
+
+from src.models.field_projection import project_vessel_item
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+ITEMS = 10_000
+REPEAT = 5
+FIELD_PATHS = [
+    "imo_number",
+    "name",
+    "reporting_period",
+    "co2_emissions_metrics.all_voyages.total",
+]
+
+
+def main() -> None:
+    items = list(islice(cycle(VESSEL_ITEMS), ITEMS))
+    projected_items = [project_vessel_item(item, FIELD_PATHS) for item in items]
+
+    def validate_whole_items() -> None:
+        for item in items:
+            model_to_primitive_dict(VesselItem(**item))
+
+    def validate_projected_items() -> None:
+        for item in projected_items:
+            project_vessel_item(item, FIELD_PATHS)
+
+    whole = min(timeit.repeat(validate_whole_items, number=1, repeat=REPEAT))
+    projected = min(timeit.repeat(validate_projected_items, number=1, repeat=REPEAT))
+    whole_size = len(json.dumps(items[0]))
+    projected_size = len(json.dumps(projected_items[0]))
+
+    print(f"whole items:     {whole * 1000:8.1f} ms, {whole_size} bytes per item")
+    print(
+        f"projected items: {projected * 1000:8.1f} ms, {projected_size} bytes per item"
+    )
+    print(f"speedup:         {whole / projected:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Measure the cold start import time of the lambda entry points
+
+Each entry point is imported REPEATS times in a fresh interpreter with
+`python -X importtime`. The report shows the median cumulative import time of
+each entry point and the median self time of the top level packages it loads,
+so the cost of each dependency can be seen. The script exits with status 1
+when an entry point goes over its budget, or loads a package which should
+only be imported on the code paths that need it.
+
+The budgets leave headroom over the times measured on a development machine,
+pass --budget-scale to adjust them for slower or faster machines.
+
+Run from the repository root with: python -m benchmarks.bench_import_time
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+REPEATS = 7
+TOP_PACKAGES = 8
+
+BUDGET_MS = {
+    "src.rest_api.handler": 300.0,
+    "src.data_ingestion.handler": 300.0,
+}
+FORBIDDEN_PACKAGES = ("aws_lambda_powertools", "boto3", "s3transfer", "multiprocessing")
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """Parse the lines written to stderr by python -X importtime"""
+    import_times = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append(
+                ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return import_times
+
+
+def measure_import(module: str) -> List[ImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={
+            "AWS_REGION": "eu-west-2",
+            "AWS_DEFAULT_REGION": "eu-west-2",
+            **os.environ,
+        },
+        check=True,
+    )
+    return parse_import_times(result.stderr)
+
+
+def get_package_self_times(import_times: List[ImportTime]) -> Dict[str, int]:
+    package_self_times: Dict[str, int] = defaultdict(int)
+    for import_time in import_times:
+        package = import_time.module.split(".")[0]
+        if package == "src":
+            package = ".".join(import_time.module.split(".")[:2])
+        package_self_times[package] += import_time.self_us
+    return package_self_times
+
+
+def report(module: str, budget_ms: float) -> bool:
+    runs = [measure_import(module) for _ in range(REPEATS)]
+    total_ms = (
+        statistics.median(
+            next(t.cumulative_us for t in run if t.module == module and t.depth == 0)
+            for run in runs
+        )
+        / 1000
+    )
+    package_self_times = [get_package_self_times(run) for run in runs]
+    packages = set().union(*package_self_times)
+    median_package_ms = {
+        package: statistics.median(
+            times.get(package, 0) for times in package_self_times
+        )
+        / 1000
+        for package in packages
+    }
+    forbidden = sorted(package for package in packages if package in FORBIDDEN_PACKAGES)
+
+    within_budget = total_ms <= budget_ms and not forbidden
+    print(
+        f"{module}: {total_ms:.1f} ms (budget {budget_ms:.1f} ms) "
+        f"{'ok' if within_budget else 'OVER BUDGET'}"
+    )
+    for package, package_ms in sorted(
+        median_package_ms.items(), key=lambda item: item[1], reverse=True
+    )[:TOP_PACKAGES]:
+        print(f"    {package:<32} {package_ms:8.1f} ms")
+    if forbidden:
+        print(f"    imports {', '.join(forbidden)}, which should be imported lazily")
+    return within_budget
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiply the import time budgets by this factor",
+    )
+    args = parser.parse_args()
+
+    results = [
+        report(module, budget_ms * args.budget_scale)
+        for module, budget_ms in BUDGET_MS.items()
+    ]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
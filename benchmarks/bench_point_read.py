@@ -0,0 +1,62 @@
+"""Compare reading a vessel item with Query and with GetItem on a moto table
+
+Run from the repository root with: python -m benchmarks.bench_point_read
+"""
+
+import timeit
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from src.models.pydantic_models import (  # noqa: E402
+    VesselItem,
+    model_to_primitive_dict,
+)
+from src.models.pynamo_models import (  # noqa: E402
+    VesselItemModel,
+    get_partition_key,
+    get_sort_key,
+)
+from tests.resources.vessel_data import VESSEL_ITEMS  # noqa: E402
+
+READS = 200
+
+
+def read_with_query(reporting_period: int, imo_number: str) -> dict:
+    sort_key = get_sort_key(reporting_period, imo_number)
+    vessel_item = list(
+        VesselItemModel.query(
+            get_partition_key(imo_number), VesselItemModel.sk == sort_key
+        )
+    )[0]
+    return model_to_primitive_dict(VesselItem(**vessel_item.convert_to_dictionary()))
+
+
+def main() -> None:
+    with mock_dynamodb():
+        create_shipping_data_table()
+        VesselItemModel.write_vessel_items(VESSEL_ITEMS)
+        keys = [(item["reporting_period"], item["imo_number"]) for item in VESSEL_ITEMS]
+
+        def read_all_with_query() -> None:
+            for key in keys:
+                read_with_query(*key)
+
+        def read_all_with_get_item() -> None:
+            for key in keys:
+                VesselItemModel.read_vessel_item(*key)
+
+        number = READS // len(keys)
+        query = timeit.timeit(read_all_with_query, number=number) / READS
+        get_item = timeit.timeit(read_all_with_get_item, number=number) / READS
+
+    print(f"Query:   {query * 1_000_000:10.1f} us per read")
+    print(f"GetItem: {get_item * 1_000_000:10.1f} us per read")
+    print(f"speedup: {query / get_item:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare json.loads(model.json()) with model_to_primitive_dict on 10k items
+
+Run from the repository root with: python -m benchmarks.bench_primitive_export
+"""
+
+import json
+import timeit
+from itertools import cycle, islice
+
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+ITEMS = 10_000
+REPEAT = 5
+
+
+def main() -> None:
+    models = [VesselItem(**item) for item in islice(cycle(VESSEL_ITEMS), ITEMS)]
+
+    def export_with_json() -> None:
+        for model in models:
+            json.loads(model.json())
+
+    def export_with_primitives() -> None:
+        for model in models:
+            model_to_primitive_dict(model)
+
+    round_trip = min(timeit.repeat(export_with_json, number=1, repeat=REPEAT))
+    primitive = min(timeit.repeat(export_with_primitives, number=1, repeat=REPEAT))
+
+    print(f"json.loads(model.json()): {round_trip * 1000:8.1f} ms per {ITEMS} items")
+    print(f"model_to_primitive_dict:  {primitive * 1000:8.1f} ms per {ITEMS} items")
+    print(f"speedup:                  {round_trip / primitive:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
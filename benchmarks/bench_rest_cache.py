@@ -0,0 +1,45 @@
+"""Compare cached and uncached REST API lookups against a moto DynamoDB table
+
+Run from the repository root with: python -m benchmarks.bench_rest_cache
+"""
+
+import timeit
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from src.models.pynamo_models import VesselItemModel  # noqa: E402
+from src.rest_api.cache import get_vessel_item_cache  # noqa: E402
+from src.rest_api.handler import handler  # noqa: E402
+from tests.resources.vessel_data import VESSEL_ITEMS  # noqa: E402
+
+LOOKUPS = 200
+EVENT = {"query": {"reporting_period": 2018, "imo_number": "5383304"}}
+
+
+def main() -> None:
+    with mock_dynamodb():
+        create_shipping_data_table()
+        VesselItemModel.write_vessel_item(VESSEL_ITEMS[0])
+
+        def lookup_uncached() -> None:
+            get_vessel_item_cache().clear()
+            handler(EVENT, None)
+
+        def lookup_cached() -> None:
+            handler(EVENT, None)
+
+        uncached = timeit.timeit(lookup_uncached, number=LOOKUPS) / LOOKUPS
+        handler(EVENT, None)
+        cached = timeit.timeit(lookup_cached, number=LOOKUPS) / LOOKUPS
+
+    print(f"uncached lookup: {uncached * 1_000_000:10.1f} us")
+    print(f"cached lookup:   {cached * 1_000_000:10.1f} us")
+    print(f"speedup:         {uncached / cached:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
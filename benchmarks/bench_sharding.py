@@ -0,0 +1,83 @@
+"""Spread of vessel items over the partition key shards, and the time to list
+a reporting period page by page on a moto table
+
+moto does not throttle hot partitions, so the write throughput gained by
+sharding is estimated from the 1,000 write capacity units per second a single
+partition key can take.
+
+Run from the repository root with: python -m benchmarks.bench_sharding
+"""
+
+import timeit
+from collections import Counter
+from copy import deepcopy
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from src.models.capacity import estimate_write_units  # noqa: E402
+from src.models.pynamo_models import (  # noqa: E402
+    PARTITION_KEY_SHARDS,
+    VesselItemModel,
+    get_shard,
+)
+from tests.resources.vessel_data import VESSEL_ITEMS  # noqa: E402
+
+VESSELS = 12_000
+LISTED_VESSELS = 500
+PAGE_SIZE = 100
+PARTITION_WRITE_UNITS_PER_SECOND = 1000
+
+
+def generate_vessel_items(count: int) -> list:
+    vessel_items = []
+    for index in range(count):
+        vessel_item = deepcopy(VESSEL_ITEMS[index % len(VESSEL_ITEMS)])
+        vessel_item["imo_number"] = str(9000000 + index * 37)
+        vessel_items.append(vessel_item)
+    return vessel_items
+
+
+def main() -> None:
+    vessel_items = generate_vessel_items(VESSELS)
+    item_units = estimate_write_units(
+        VesselItemModel.from_vessel_item(vessel_items[0]).serialize()
+    )
+    shard_sizes = Counter(get_shard(item["imo_number"]) for item in vessel_items)
+    largest_shard = max(shard_sizes.values())
+
+    single_key = VESSELS * item_units / PARTITION_WRITE_UNITS_PER_SECOND
+    sharded = largest_shard * item_units / PARTITION_WRITE_UNITS_PER_SECOND
+    print(f"items per shard:  {min(shard_sizes.values())} to {largest_shard}")
+    print(f"single key write: {single_key:8.1f} s for {VESSELS} vessels at best")
+    print(f"sharded write:    {sharded:8.1f} s for {VESSELS} vessels at best")
+    print(f"speedup:          {single_key / sharded:8.2f}x")
+
+    with mock_dynamodb():
+        create_shipping_data_table()
+        listed_items = sorted(
+            vessel_items[:LISTED_VESSELS], key=lambda item: item["imo_number"]
+        )
+        for start in range(0, LISTED_VESSELS, 25):
+            VesselItemModel.write_vessel_items(listed_items[start : start + 25])
+
+        def list_all() -> None:
+            cursor = VesselItemModel.list_vessel_items(2018, PAGE_SIZE)[1]
+            while cursor is not None:
+                cursor = VesselItemModel.list_vessel_items(
+                    2018, PAGE_SIZE, cursor=cursor
+                )[1]
+
+        listing = min(timeit.repeat(list_all, number=1, repeat=3))
+
+    print(
+        f"list:             {listing * 1000:8.1f} ms per {LISTED_VESSELS} vessels "
+        f"over {PARTITION_KEY_SHARDS} shards"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+from moto import mock_dynamodb  # noqa: E402
+
+from benchmarks.synthetic_csv import generate_csv_content  # noqa: E402
+from src.data_ingestion.checkpoint import CheckpointedCsvRows  # noqa: E402
+from src.data_ingestion.data_processing import (  # noqa: E402
+    ByteOffsetLines,
+    CleaningPlan,
+    create_vessel_item,
+    generate_csv_dictionaries,
+    load_column_type_mappings,
+)
+from src.data_ingestion.runtime_context import reset_runtime_context  # noqa: E402
+from src.models.pydantic_models import VesselItem  # noqa: E402
+
+BENCHMARK_ROWS = int(os.environ.get("BENCHMARK_ROWS", "10000"))
+# Writes to moto are far slower than to DynamoDB, so fewer rows are ingested
+# end to end
+END_TO_END_ROWS = int(os.environ.get("BENCHMARK_END_TO_END_ROWS", "2000"))
+
+
+@pytest.fixture(autouse=True)
+def runtime_context(monkeypatch):
+    # Writes are not rate limited, moto does not enforce capacity
+    monkeypatch.setenv("WRITE_CAPACITY_UNITS", "1000000")
+    reset_runtime_context()
+    yield
+    reset_runtime_context()
+
+
+@pytest.fixture(scope="session")
+def benchmark_rows():
+    return BENCHMARK_ROWS
+
+
+@pytest.fixture(scope="session")
+def csv_content(benchmark_rows):
+    return generate_csv_content(benchmark_rows)
+
+
+@pytest.fixture(scope="session")
+def end_to_end_rows():
+    return END_TO_END_ROWS
+
+
+@pytest.fixture(scope="session")
+def end_to_end_csv_content(end_to_end_rows):
+    return generate_csv_content(end_to_end_rows)
+
+
+@pytest.fixture(scope="session")
+def raw_vessel_data(csv_content):
+    return list(
+        generate_csv_dictionaries(CheckpointedCsvRows(ByteOffsetLines([csv_content])))
+    )
+
+
+@pytest.fixture(scope="session")
+def cleaning_plan(raw_vessel_data):
+    return CleaningPlan(list(raw_vessel_data[0]), load_column_type_mappings())
+
+
+@pytest.fixture(scope="session")
+def cleaned_vessel_data(raw_vessel_data, cleaning_plan):
+    return [cleaning_plan.clean(vessel_data) for vessel_data in raw_vessel_data]
+
+
+@pytest.fixture(scope="session")
+def valid_vessel_items(cleaned_vessel_data):
+    vessel_items = []
+    for vessel_data in cleaned_vessel_data:
+        vessel_item = create_vessel_item(vessel_data)
+        try:
+            VesselItem(**vessel_item)
+        except ValidationError:
+            continue
+        vessel_items.append(vessel_item)
+    return vessel_items
+
+
+@pytest.fixture()
+def shipping_data_table():
+    with mock_dynamodb():
+        create_shipping_data_table()
+        yield
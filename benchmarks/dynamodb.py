@@ -0,0 +1,44 @@
+"""Helpers for benchmarks run against a moto DynamoDB stand-in"""
+
+import os
+
+import boto3
+
+
+def set_test_credentials() -> None:
+    os.environ.setdefault("AWS_REGION", "eu-west-2")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-2")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+
+def create_shipping_data_table() -> None:
+    """Create the shipping-data table, inside an active moto mock"""
+    boto3.resource("dynamodb", "eu-west-2").create_table(
+        TableName="shipping-data",
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+            {"AttributeName": "GSI1PK", "AttributeType": "S"},
+            {"AttributeName": "GSI1SK", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "GSI1",
+                "KeySchema": [
+                    {"AttributeName": "GSI1PK", "KeyType": "HASH"},
+                    {"AttributeName": "GSI1SK", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 25,
+                    "WriteCapacityUnits": 25,
+                },
+            }
+        ],
+        ProvisionedThroughput={"ReadCapacityUnits": 25, "WriteCapacityUnits": 25},
+    )
@@ -0,0 +1,83 @@
+"""Profile the data-ingestion handler ingesting a local CSV file
+
+The file is uploaded to a moto S3 bucket, the handler is invoked with an S3
+event flagged for profiling and writes to a moto shipping-data table. The
+hottest functions of the profile are printed. Only the thread running the
+handler is profiled, so batch writes show up as time waiting for the writer
+threads.
+
+Run from the repository root with:
+python -m benchmarks.profile_ingestion <csv file> [--top 25] [--sort tottime]
+"""
+
+import argparse
+import glob
+import os
+import pstats
+import shutil
+import tempfile
+import urllib.parse
+
+from benchmarks.dynamodb import create_shipping_data_table, set_test_credentials
+
+set_test_credentials()
+
+import boto3  # noqa: E402
+from moto import mock_dynamodb, mock_s3  # noqa: E402
+
+from src.data_ingestion.handler import handler  # noqa: E402
+
+BUCKET = "shipping-api-profiling"
+KEY = "raw/profiling.csv"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_file", help="Path of the CSV file to ingest")
+    parser.add_argument(
+        "--top", type=int, default=25, help="Number of functions to print"
+    )
+    parser.add_argument(
+        "--sort",
+        default="cumulative",
+        choices=["cumulative", "tottime", "ncalls"],
+        help="Order to print the functions in",
+    )
+    parser.add_argument("--output", help="Also save the profile to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as profile_dir, mock_s3(), mock_dynamodb():
+        os.environ["PROFILE_DIR"] = profile_dir
+        os.environ.pop("PROFILE_BUCKET", None)
+        create_shipping_data_table()
+        s3_client = boto3.client("s3", "eu-west-2")
+        s3_client.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+        s3_client.upload_file(args.csv_file, BUCKET, KEY)
+
+        response = handler(
+            {
+                "profile": True,
+                "Records": [
+                    {
+                        "s3": {
+                            "bucket": {"name": BUCKET},
+                            "object": {"key": urllib.parse.quote_plus(KEY)},
+                        }
+                    }
+                ],
+            },
+            None,
+        )
+
+        [path] = glob.glob(os.path.join(profile_dir, "*.prof"))
+        if args.output:
+            shutil.copy(path, args.output)
+        print(f"handler response: {response}")
+        pstats.Stats(path).sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
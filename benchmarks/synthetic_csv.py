@@ -0,0 +1,199 @@
+"""Generate synthetic EU MRV emissions CSV files of any size
+
+Rows use the header of the published files, and values are generated for
+each column by its type in data/config/column_type_mappings.json. Like the
+published files they contain empty, "N/A" and "Not Applicable" values,
+malformed dates, technical efficiency strings such as "EEDI (4.5 gCO₂/t·nm)"
+and quoted free text spanning several lines, and about INVALID_ROW_RATE of
+the rows are rejected by validation. Files are reproducible for a given
+seed.
+
+Run from the repository root with:
+python -m benchmarks.synthetic_csv <csv file> [--rows 100000] [--seed 0]
+"""
+
+import argparse
+import csv
+import io
+import random
+from typing import Callable, Dict, Iterator, List
+
+from src.data_ingestion.data_processing import clean_column, load_column_type_mappings
+from tests.resources.csv_content import CSV_CONTENT
+
+HEADER = CSV_CONTENT[0]
+FIRST_IMO_NUMBER = 1000000
+# Share of rows without a verifier accreditation number, which fail validation
+INVALID_ROW_RATE = 0.02
+
+NULL_VALUES = ["", "N/A", "Not Applicable"]
+SHIP_TYPES = [
+    "Bulk carrier",
+    "Chemical tanker",
+    "Container ship",
+    "Container/ro-ro cargo ship",
+    "Gas carrier",
+    "General cargo ship",
+    "LNG carrier",
+    "Oil tanker",
+    "Passenger ship",
+    "Refrigerated cargo carrier",
+    "Ro-pax ship",
+    "Ro-ro ship",
+    "Vehicle carrier",
+    "Other ship types",
+]
+TECHNICAL_EFFICIENCY_INDICATORS = ["EEDI", "EIV"]
+PORTS = ["Valletta", "Monrovia", "Majuro", "Piraeus", "Limassol", "Hamburg"]
+NAME_WORDS = ["Star", "Ocean", "Nordic", "Atlantic", "Spirit", "Pioneer", "Maria"]
+VERIFIERS = [
+    {
+        "verifier_name": "ICS Verification Services Single Member P.C.",
+        "verifier_nab": "Hellenic Accreditation System (ESYD)",
+        "verifier_address": "55 Filonos Str.\n185 35 Piraeus, Greece",
+        "verifier_city": "Piraeus",
+        "verifier_accreditation_number": "1101",
+        "verifier_country": "Greece",
+    },
+    {
+        "verifier_name": "VERIFAVIA (UK) LTD",
+        "verifier_nab": "UKAS",
+        "verifier_address": "20-22 Wenlock Road",
+        "verifier_city": "London",
+        "verifier_accreditation_number": "4599",
+        "verifier_country": "United Kingdom",
+    },
+    {
+        "verifier_name": "DNV GL AS",
+        "verifier_nab": "Norsk Akkreditering",
+        "verifier_address": 'Veritasveien 1,\n1363 Høvik\n"Maritime"',
+        "verifier_city": "Høvik",
+        "verifier_accreditation_number": "0083",
+        "verifier_country": "Norway",
+    },
+]
+FREE_TEXT = [
+    "Values are reported for the whole year.",
+    'Laden voyages are defined as voyages with "cargo on board".\r\nBallast voyages are excluded.',
+    "Transport work is based on cargo mass,\nas recorded in the bills of lading.",
+]
+
+ValueGenerator = Callable[[random.Random], str]
+
+
+def generate_float(generator: random.Random) -> str:
+    draw = generator.random()
+    if draw < 0.3:
+        return generator.choice(NULL_VALUES)
+    if draw < 0.4:
+        return str(generator.randint(0, 20000))
+    return f"{generator.uniform(0, 50000):.2f}"
+
+
+def generate_date(generator: random.Random) -> str:
+    draw = generator.random()
+    if draw < 0.02:
+        return generator.choice(["N/A", "2019-02-05", "31/02/2019", "05.02.2019"])
+    return f"{generator.randint(1, 28):02}/{generator.randint(1, 12):02}/{generator.randint(2018, 2023)}"
+
+
+def generate_technical_efficiency(generator: random.Random) -> str:
+    if generator.random() < 0.2:
+        return generator.choice(NULL_VALUES)
+    indicator = generator.choice(TECHNICAL_EFFICIENCY_INDICATORS)
+    return f"{indicator} ({generator.uniform(1, 60):.2f} gCO₂/t·nm)"
+
+
+def generate_free_text(generator: random.Random) -> str:
+    if generator.random() < 0.7:
+        return ""
+    return generator.choice(FREE_TEXT)
+
+
+def generate_name(generator: random.Random) -> str:
+    return " ".join(generator.sample(NAME_WORDS, 2))
+
+
+def generate_port(generator: random.Random) -> str:
+    return generator.choice(PORTS) if generator.random() < 0.3 else ""
+
+
+def generate_monitoring_method(generator: random.Random) -> str:
+    return "Yes" if generator.random() < 0.5 else ""
+
+
+def get_value_generators() -> Dict[str, ValueGenerator]:
+    """Value generators of the columns, by cleaned column name"""
+    column_type_mappings = load_column_type_mappings()
+    columns = [clean_column(column) for column in HEADER]
+    value_generators: Dict[str, ValueGenerator] = {}
+    for column in column_type_mappings["float_columns"]:
+        value_generators[column] = generate_float
+    for column in column_type_mappings["date_columns"]:
+        value_generators[column] = generate_date
+    value_generators.update(
+        {
+            "name": generate_name,
+            "ship_type": lambda generator: generator.choice(SHIP_TYPES),
+            "reporting_period": lambda generator: str(generator.randint(2018, 2022)),
+            "technical_efficiency": generate_technical_efficiency,
+            "port_of_registry": generate_port,
+            "home_port": generate_port,
+            "ice_class": lambda generator: generator.choice(["", "", "IA", "IC"]),
+            "verifier_number": lambda generator: "",
+            "a": generate_monitoring_method,
+            "b": generate_monitoring_method,
+            "c": generate_monitoring_method,
+            "d": generate_monitoring_method,
+            "additional_information_to_facilitate_the_understanding_of_the_reported_average_operational_energy_efficiency_indicators": generate_free_text,
+        }
+    )
+    missing_columns = set(column_type_mappings["float_columns"]).union(
+        column_type_mappings["upper_case_columns"],
+        column_type_mappings["date_columns"],
+    ) - set(columns)
+    if missing_columns:
+        raise ValueError(f"Header is missing mapped columns: {missing_columns}")
+    return value_generators
+
+
+def generate_rows(rows: int, seed: int = 0) -> Iterator[List[str]]:
+    """Generate the header row then `rows` data rows, with unique IMO numbers"""
+    generator = random.Random(seed)
+    value_generators = get_value_generators()
+    columns = [clean_column(column) for column in HEADER]
+    yield list(HEADER)
+    for index in range(rows):
+        verifier = generator.choice(VERIFIERS)
+        if generator.random() < INVALID_ROW_RATE:
+            verifier = {**verifier, "verifier_accreditation_number": ""}
+        row = []
+        for column in columns:
+            if column == "imo_number":
+                row.append(str(FIRST_IMO_NUMBER + index))
+            elif column in verifier:
+                row.append(verifier[column])
+            else:
+                row.append(value_generators[column](generator))
+        yield row
+
+
+def generate_csv_content(rows: int, seed: int = 0) -> bytes:
+    csv_file = io.StringIO(newline="")
+    csv.writer(csv_file).writerows(generate_rows(rows, seed))
+    return csv_file.getvalue().encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_file", help="Path to write the CSV file to")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.csv_file, "w", newline="", encoding="utf-8") as csv_file:
+        csv.writer(csv_file).writerows(generate_rows(args.rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmarks of each stage of ingestion and of ingestion end to end
+
+Run from the repository root with: yarn benchmark
+
+Stages are measured on a synthetic file of BENCHMARK_ROWS rows (default
+10000), set the environment variable to measure larger files. Ingestion end
+to end writes BENCHMARK_END_TO_END_ROWS rows (default 2000) to a moto
+shipping-data table, and records the time spent in each stage and the write
+latencies. Each benchmark records rows per second in its extra info.
+
+Runs are saved under .benchmarks and compared with the previous run, failing
+when a mean gets more than 10% slower.
+"""
+
+import pytest
+
+from src.data_ingestion.checkpoint import CheckpointedCsvRows
+from src.data_ingestion.data_processing import ByteOffsetLines, create_vessel_item
+from src.data_ingestion.handler import get_vessel_generator, write_vessel_generator
+from src.data_ingestion.instrumentation import PipelineMetrics
+from src.data_ingestion.runtime_context import get_runtime_context
+from src.models.fast_validation import validate_vessel_item
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+
+
+def record_rows_per_second(benchmark, rows):
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["rows_per_second"] = rows / benchmark.stats.stats.mean
+
+
+def test_parse(benchmark, benchmark_rows, csv_content):
+
+    rows = benchmark(
+        lambda: sum(1 for _ in CheckpointedCsvRows(ByteOffsetLines([csv_content])))
+    )
+
+    assert rows == benchmark_rows + 1
+    record_rows_per_second(benchmark, benchmark_rows)
+
+
+def test_clean(benchmark, raw_vessel_data, cleaning_plan):
+
+    benchmark(
+        lambda: [cleaning_plan.clean(vessel_data) for vessel_data in raw_vessel_data]
+    )
+
+    record_rows_per_second(benchmark, len(raw_vessel_data))
+
+
+def test_build(benchmark, cleaned_vessel_data):
+
+    benchmark(
+        lambda: [create_vessel_item(vessel_data) for vessel_data in cleaned_vessel_data]
+    )
+
+    record_rows_per_second(benchmark, len(cleaned_vessel_data))
+
+
+@pytest.mark.parametrize("engine", ["pydantic", "fast"])
+def test_validate(benchmark, valid_vessel_items, engine):
+
+    if engine == "fast":
+        validate = validate_vessel_item
+    else:
+
+        def validate(vessel_item):
+            return model_to_primitive_dict(VesselItem(**vessel_item))
+
+    benchmark(lambda: [validate(vessel_item) for vessel_item in valid_vessel_items])
+
+    record_rows_per_second(benchmark, len(valid_vessel_items))
+
+
+def test_end_to_end(
+    benchmark, end_to_end_rows, end_to_end_csv_content, shipping_data_table
+):
+
+    runtime_context = get_runtime_context()
+    # Every round writes the same items, which would be skipped after the first
+    runtime_context.skip_unchanged_items = False
+
+    def setup():
+        runtime_context.pipeline_metrics = PipelineMetrics()
+        csv_rows = CheckpointedCsvRows(ByteOffsetLines([end_to_end_csv_content]))
+        return (get_vessel_generator({}, csv_rows),), {}
+
+    summary = benchmark.pedantic(write_vessel_generator, setup=setup, rounds=3)
+
+    assert summary.rows == end_to_end_rows
+    assert summary.written == summary.cleaned
+    record_rows_per_second(benchmark, end_to_end_rows)
+    stages = runtime_context.pipeline_metrics.get_summary(
+        summary.rows, len(end_to_end_csv_content)
+    )
+    benchmark.extra_info.update(
+        {
+            name: value
+            for name, value in stages.items()
+            if name.endswith("_wall_ms") or name.startswith("write_latency")
+        }
+    )
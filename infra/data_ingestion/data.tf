@@ -28,6 +28,7 @@ data "aws_iam_policy_document" "lambda_policy" {
       "dynamodb:BatchWriteItem",
       "dynamodb:PutItem",
       "dynamodb:UpdateItem",
+      "dynamodb:DeleteItem",
       "dynamodb:DescribeTable"
     ]
     resources = [
@@ -62,6 +63,12 @@ data "aws_iam_policy_document" "lambda_policy" {
     ]
   }
 
+  statement {
+    effect    = "Allow"
+    actions   = ["lambda:InvokeFunction"]
+    resources = ["arn:aws:lambda:${var.aws_region}:${var.aws_account_id}:function:*-${var.service_name}"]
+  }
+
   statement {
     effect = "Allow"
     actions = [
@@ -35,6 +35,12 @@ data "aws_iam_policy_document" "lambda_policy" {
     ]
   }
 
+  statement {
+    effect    = "Allow"
+    actions   = ["ssm:GetParameter"]
+    resources = [aws_ssm_parameter.next_token_secret.arn]
+  }
+
   statement {
     effect = "Allow"
     actions = [
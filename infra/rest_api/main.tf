@@ -16,3 +16,17 @@ resource "aws_iam_role_policy_attachment" "lambda_iam_to_policy_attachment" {
   policy_arn = aws_iam_policy.inline_policy.arn
   role       = aws_iam_role.lambda_iam.name
 }
+
+
+# Secrets
+
+resource "random_password" "next_token_secret" {
+  length  = 64
+  special = false
+}
+
+resource "aws_ssm_parameter" "next_token_secret" {
+  name  = "/${var.project}/${var.service_name}/next-token-secret"
+  type  = "SecureString"
+  value = random_password.next_token_secret.result
+}
@@ -0,0 +1,155 @@
+import csv
+import json
+import logging
+from array import array
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.data_ingestion.data_processing import ByteOffsetLines
+from src.data_ingestion.runtime_context import get_runtime_context
+from src.models.pynamo_models import IngestionCheckpointModel
+
+LOGGER = logging.getLogger()
+
+MAX_CONTINUATIONS = 50
+
+
+class CheckpointedCsvRows:
+    """
+    CSV rows read from a byte offset of a file, which can stop at a row boundary
+
+    The header row is returned first. When resuming from a checkpoint the
+    rows are read from its byte offset, so the header stored with it is
+    returned instead. Before each data row `should_stop` is called, and once
+    it returns True no more rows are returned, leaving `offset` and `rows`
+    just after the last row returned.
+    """
+
+    def __init__(
+        self,
+        lines: ByteOffsetLines,
+        header: Optional[List[str]] = None,
+        rows: int = 0,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self.lines = lines
+        self.header = header
+        self.rows = rows
+        self.stopped = False
+        # Byte offset of each data row read
+        self.row_offsets = array("q")
+
+        self._should_stop = should_stop
+        self._reader = csv.reader(lines, delimiter=",")
+        self._header_returned = False
+
+    @property
+    def offset(self) -> int:
+        return self.lines.offset
+
+    def __iter__(self) -> "CheckpointedCsvRows":
+        return self
+
+    def __next__(self) -> List[str]:
+        if not self._header_returned:
+            self._header_returned = True
+            if self.header is None:
+                self.header = next(self._reader)
+            return self.header
+
+        if self.stopped or self._should_stop():
+            self.stopped = True
+            raise StopIteration
+        offset = self.lines.offset
+        row = next(self._reader)
+        self.row_offsets.append(offset)
+        self.rows += 1
+        return row
+
+    def rewind(self, rows: int) -> None:
+        """Move `offset` and `rows` back to before the data row `rows` rows in
+
+        Rows are counted from the first one read, so a checkpoint taken after
+        rewinding resumes from that row.
+        """
+        if rows < len(self.row_offsets):
+            self.lines.offset = self.row_offsets[rows]
+            self.rows -= len(self.row_offsets) - rows
+
+
+def get_deadline(
+    context: Any,
+    reserve_ms: int,
+    get_drain_ms: Callable[[], float] = lambda: 0.0,
+) -> Callable[[], bool]:
+    """Check whether too little of the invocation is left to read more rows
+
+    Rows stop once the time left is less than the time get_drain_ms estimates
+    the batches still in flight will take to write, plus reserve_ms to record
+    a checkpoint and continue the ingestion.
+    """
+    if context is None:
+        return lambda: False
+    return lambda: context.get_remaining_time_in_millis() < reserve_ms + get_drain_ms()
+
+
+def continue_ingestion(
+    event: dict,
+    context: Any,
+    location: Tuple[str, str, str],
+    csv_rows: CheckpointedCsvRows,
+    checkpoint: Optional[IngestionCheckpointModel],
+) -> bool:
+    """Record how far a CSV file was ingested and invoke the lambda again
+
+    The continuation is invoked asynchronously with the same S3 event, and
+    resumes from the checkpoint. Rows after the checkpoint are written again
+    under the same keys if an invocation fails, so each row ends up written
+    once. No continuation is invoked when the file did not advance, after
+    MAX_CONTINUATIONS continuations or without a Lambda context.
+
+    Args:
+        event (dict): S3 event
+        context (Any): Lambda context
+        location (Tuple[str, str, str]): Bucket, object key and ETag of the CSV file
+        csv_rows (CheckpointedCsvRows): Rows which stopped before the deadline,
+            or rewound to the first row of a batch which failed
+        checkpoint (Optional[IngestionCheckpointModel]): Checkpoint the
+            invocation resumed from
+
+    Returns:
+        bool: Whether a continuation was invoked
+    """
+    continuations = int(checkpoint.continuations) + 1 if checkpoint else 1
+    IngestionCheckpointModel.write_checkpoint(
+        *location,
+        offset=csv_rows.offset,
+        rows=csv_rows.rows,
+        header=csv_rows.header or [],
+        continuations=continuations,
+    )
+
+    if checkpoint and csv_rows.offset <= checkpoint.offset:
+        LOGGER.error(
+            {
+                "message": "Ingestion made no progress since the last checkpoint",
+                "content": {"offset": csv_rows.offset},
+            }
+        )
+        return False
+    if continuations > MAX_CONTINUATIONS:
+        LOGGER.error(
+            {
+                "message": "Ingestion stopped after too many continuations",
+                "content": {"offset": csv_rows.offset, "rows": csv_rows.rows},
+            }
+        )
+        return False
+    if context is None:
+        return False
+
+    get_runtime_context().lambda_client.invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps(event).encode("utf-8"),
+    )
+    return True
@@ -0,0 +1,67 @@
+from typing import Any, Callable, List, Optional, Sequence
+
+from src.data_ingestion.data_processing import CleaningPlan
+
+COLUMNAR_BLOCK_SIZE = 1024
+
+
+def clean_column_values(values: Sequence[Any], cleaning_function: Callable) -> list:
+    """Clean all values of a column, calling the cleaning function once per distinct value
+
+    Args:
+        values (Sequence[Any]): Raw values of one column
+        cleaning_function (Callable): Cleaning function for the column
+
+    Returns:
+        list: Cleaned values, in the same order as the raw values
+    """
+    cleaned_values = {value: cleaning_function(value) for value in set(values)}
+    return [cleaned_values[value] for value in values]
+
+
+class ColumnarCleaner:
+    """
+    Cleans CSV rows a block at a time, one column at a time
+
+    Each block of rows is transposed into columns, every column is cleaned
+    with the cleaning plan's function for that column, and rows are only
+    rebuilt afterwards, as tuples of values in the order of `names`. Zipped
+    with `names`, cleaned rows are identical to CleaningPlan.clean. Rows the
+    plan would not clean column by column, i.e. short rows, rows of an
+    incomplete plan or blocks in which a cleaning function raises, are
+    returned as None so the caller can clean them row by row and get the same
+    result or error.
+    """
+
+    def __init__(self, columns: List[str], cleaning_plan: CleaningPlan) -> None:
+        self.columns = columns
+        last_indexes = {column: index for index, column in enumerate(columns)}
+        self.cleaning_functions = [
+            (column, last_indexes[column], cleaning_function)
+            for column, cleaning_function in cleaning_plan.cleaning_functions
+        ]
+        self.names = [column for column, _, _ in self.cleaning_functions]
+        self.usable = cleaning_plan.complete
+
+    def clean_block(self, rows: List[list]) -> List[Optional[tuple]]:
+        cleaned_rows: List[Optional[tuple]] = [None] * len(rows)
+        regular_positions = [
+            position
+            for position, row in enumerate(rows)
+            if len(row) >= len(self.columns)
+        ]
+        if not self.usable or not regular_positions or not self.columns:
+            return cleaned_rows
+
+        raw_columns = list(zip(*(rows[position] for position in regular_positions)))
+        try:
+            cleaned_columns = [
+                clean_column_values(raw_columns[index], cleaning_function)
+                for _, index, cleaning_function in self.cleaning_functions
+            ]
+        except ValueError:
+            return cleaned_rows
+
+        for position, values in zip(regular_positions, zip(*cleaned_columns)):
+            cleaned_rows[position] = values
+        return cleaned_rows
@@ -1,9 +1,23 @@
+import codecs
+import io
 import json
 import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from src.data_ingestion.vessel_item_builder import compile_vessel_item_builder
 
 
 def make_upper_case(value: str) -> Optional[str]:
@@ -56,9 +70,72 @@ def extract_technical_efficiency(technical_efficiency: str) -> Optional[float]:
         return None
 
 
+def decode_lines(
+    chunks: Iterable[bytes], encoding: str = "utf-8"
+) -> Generator[str, None, None]:
+    """Incrementally decode byte chunks into lines, keeping line endings
+
+    Lines are split the same way as a file opened with newline="", which is
+    what csv.reader expects, so quoted fields spanning several lines are
+    reassembled by the reader. Only the current chunk and any incomplete
+    trailing line are held in memory.
+
+    Args:
+        chunks (Iterable[bytes]): Byte chunks, e.g. from StreamingBody.iter_chunks
+        encoding (str): Encoding of the byte stream
+
+    Returns:
+        Generator[str, None, None]: Generator that yields decoded lines
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        end = pending.rfind("\n") + 1
+        if end:
+            yield from io.StringIO(pending[:end], newline="")
+            pending = pending[end:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield from io.StringIO(pending, newline="")
+
+
+class ByteOffsetLines:
+    """
+    Lines decoded from byte chunks by decode_lines, counting the bytes read
+
+    `offset` is the byte offset in the file just after the last line
+    returned, where a ranged GET can carry on reading.
+    """
+
+    def __init__(
+        self, chunks: Iterable[bytes], encoding: str = "utf-8", offset: int = 0
+    ) -> None:
+        self.encoding = encoding
+        self.offset = offset
+        self._lines = decode_lines(chunks, encoding)
+
+    def __iter__(self) -> "ByteOffsetLines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self.offset += len(line.encode(self.encoding))
+        return line
+
+
+def generate_csv_dictionaries(csv_rows: Iterable[list]) -> Generator[dict, None, None]:
+    csv_rows = iter(csv_rows)
+    header = next(csv_rows, None)
+    if header is None:
+        return
+    columns = [clean_column(col) for col in header]
+    for row in csv_rows:
+        yield dict(zip(columns, row))
+
+
 def convert_csv_to_dictionaries(csv_content: List[list]) -> List[dict]:
-    columns = [clean_column(col) for col in csv_content[0]]
-    return [dict(zip(columns, row)) for row in csv_content[1:]]
+    return list(generate_csv_dictionaries(csv_content))
 
 
 def apply_cleaning_function(
@@ -86,31 +163,23 @@ def load_column_type_mappings() -> dict:
     return column_type_mappings
 
 
-def clean_raw_vessel_data(vessel_data_raw: dict, column_type_mappings: dict) -> dict:
-
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, column_type_mappings["float_columns"], clean_numerical_data
-    )
-
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, column_type_mappings["upper_case_columns"], make_upper_case
-    )
-
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, column_type_mappings["date_columns"], convert_date
-    )
+def get_cleaning_passes(column_type_mappings: dict) -> List[Tuple[list, Callable]]:
+    return [
+        (column_type_mappings["float_columns"], clean_numerical_data),
+        (column_type_mappings["upper_case_columns"], make_upper_case),
+        (column_type_mappings["date_columns"], convert_date),
+        (["a", "b", "c", "d"], clean_monitoring_methods),
+        (["technical_efficiency"], extract_technical_efficiency),
+        (["reporting_period"], int),
+    ]
 
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, ["a", "b", "c", "d"], clean_monitoring_methods
-    )
 
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, ["technical_efficiency"], extract_technical_efficiency
-    )
+def clean_raw_vessel_data(vessel_data_raw: dict, column_type_mappings: dict) -> dict:
 
-    vessel_data_raw = apply_cleaning_function(
-        vessel_data_raw, ["reporting_period"], int
-    )
+    for columns, cleaning_function in get_cleaning_passes(column_type_mappings):
+        vessel_data_raw = apply_cleaning_function(
+            vessel_data_raw, columns, cleaning_function
+        )
 
     vessel_data_raw = apply_cleaning_function(
         vessel_data_raw, list(vessel_data_raw.keys()), clean_null_values
@@ -119,302 +188,95 @@ def clean_raw_vessel_data(vessel_data_raw: dict, column_type_mappings: dict) ->
     return vessel_data_raw
 
 
-def create_vessel_item(vessel_data: dict) -> dict:
-    return {
-        "imo_number": vessel_data["imo_number"],
-        "name": vessel_data["name"],
-        "ship_type": vessel_data["ship_type"],
-        "reporting_period": vessel_data["reporting_period"],
-        "technical_efficiency": vessel_data["technical_efficiency"],
-        "port_of_registry": vessel_data["port_of_registry"],
-        "home_port": vessel_data["home_port"],
-        "ice_class": vessel_data["ice_class"],
-        "doc_issue_date": vessel_data["doc_issue_date"],
-        "doc_expiry_date": vessel_data["doc_expiry_date"],
-        "verifier_details": {
-            "verifier_number": vessel_data["verifier_number"],
-            "verifier_name": vessel_data["verifier_name"],
-            "verifier_accreditation_body": vessel_data["verifier_nab"],
-            "verifier_address": vessel_data["verifier_address"],
-            "verifier_city": vessel_data["verifier_city"],
-            "verifier_accreditation_number": vessel_data[
-                "verifier_accreditation_number"
-            ],
-            "verifier_country": vessel_data["verifier_country"],
-        },
-        "monitoring_methods": {
-            "a": {
-                "value": vessel_data["a"],
-                "description": "BDN and period stock takes of fuel tanks",
-            },
-            "b": {
-                "value": vessel_data["b"],
-                "description": "Bunker fuel tank monitoring on-board",
-            },
-            "c": {
-                "value": vessel_data["c"],
-                "description": "Flow meters for applicable combustion processes",
-            },
-            "d": {
-                "value": vessel_data["d"],
-                "description": "Direct CO2 emissions measurement",
-            },
-        },
-        "fuel_consumption_metrics": {
-            "all_voyages": {
-                "total": {
-                    "value": vessel_data["total_fuel_consumption_m_tonnes"],
-                    "unit": "metric tonne",
-                },
-                "annual_average": {
-                    "per_distance": {
-                        "value": vessel_data[
-                            "annual_average_fuel_consumption_per_distance_kg_n_mile"
-                        ],
-                        "unit": "kilogram / nautical mile",
-                    },
-                    "per_transport_work": {
-                        "mass": {
-                            "value": vessel_data[
-                                "annual_average_fuel_consumption_per_transport_work_mass_g_m_tonnes_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "volume": {
-                            "value": vessel_data[
-                                "annual_average_fuel_consumption_per_transport_work_volume_g_m_n_miles"
-                            ],
-                            "unit": "gram / (meter^3 * nautical mile)",
-                        },
-                        "deadweight_tonnage": {
-                            "value": vessel_data[
-                                "annual_average_fuel_consumption_per_transport_work_dwt_g_dwt_carried_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "passengers": {
-                            "value": vessel_data[
-                                "annual_average_fuel_consumption_per_transport_work_pax_g_pax_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "freight": {
-                            "value": vessel_data[
-                                "fuel_consumption_per_transport_work_freight_on_laden_voyages_g_m_tonnes_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                    },
-                },
-            },
-            "laden_voyages": {
-                "total": {
-                    "value": vessel_data[
-                        "fuel_consumptions_assigned_to_on_laden_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                },
-                "per_distance": {
-                    "value": vessel_data[
-                        "fuel_consumption_per_distance_on_laden_voyages_kg_n_mile"
-                    ],
-                    "unit": "kilogram / nautical mile",
-                },
-                "per_transport_work": {
-                    "mass": {
-                        "value": vessel_data[
-                            "fuel_consumption_per_transport_work_mass_on_laden_voyages_g_m_tonnes_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "volume": {
-                        "value": vessel_data[
-                            "fuel_consumption_per_transport_work_volume_on_laden_voyages_g_m_n_miles"
-                        ],
-                        "unit": "gram / (meter^3 * nautical mile)",
-                    },
-                    "deadweight_tonnage": {
-                        "value": vessel_data[
-                            "fuel_consumption_per_transport_work_dwt_on_laden_voyages_g_dwt_carried_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "passengers": {
-                        "value": vessel_data[
-                            "fuel_consumption_per_transport_work_pax_on_laden_voyages_g_pax_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "freight": {
-                        "value": vessel_data[
-                            "fuel_consumption_per_transport_work_pax_on_laden_voyages_g_pax_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                },
-            },
-        },
-        "co2_emissions_metrics": {
-            "all_voyages": {
-                "total": {
-                    "value": vessel_data["total_co_emissions_m_tonnes"],
-                    "unit": "metric tonne",
-                },
-                "between_ports": {
-                    "value": vessel_data[
-                        "co_emissions_from_all_voyages_between_ports_under_a_ms_jurisdiction_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                    "description": "CO2 emissions from all voyages between ports under a Member State jurisdiction",
-                },
-                "departed_from_ports": {
-                    "value": vessel_data[
-                        "co_emissions_from_all_voyages_which_departed_from_ports_under_a_ms_jurisdiction_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                    "description": "CO2 emissions from all voyages which departed from ports under a Member State jurisdiction",
-                },
-                "to_ports": {
-                    "value": vessel_data[
-                        "co_emissions_from_all_voyages_to_ports_under_a_ms_jurisdiction_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                    "description": "CO2 emissions from all voyages to ports under a Member State jurisdiction",
-                },
-                "within_ports_at_berth": {
-                    "value": vessel_data[
-                        "co_emissions_which_occurred_within_ports_under_a_ms_jurisdiction_at_berth_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                    "description": "CO2 emissions which occurred within ports under a Member State jurisdiction at berth",
-                },
-                "passenger_transport": {
-                    "value": vessel_data[
-                        "co_emissions_assigned_to_passenger_transport_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                },
-                "freight_transport": {
-                    "value": vessel_data[
-                        "co_emissions_assigned_to_freight_transport_m_tonnes"
-                    ],
-                    "unit": "metric tonne",
-                },
-                "annual_average": {
-                    "per_distance": {
-                        "value": vessel_data[
-                            "annual_average_co_emissions_per_distance_kg_co_n_mile"
-                        ],
-                        "unit": "kilogram / nautical mile",
-                    },
-                    "per_transport_work": {
-                        "mass": {
-                            "value": vessel_data[
-                                "annual_average_co_emissions_per_transport_work_mass_g_co_m_tonnes_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "volume": {
-                            "value": vessel_data[
-                                "annual_average_co_emissions_per_transport_work_volume_g_co_m_n_miles"
-                            ],
-                            "unit": "gram / (meter^3 * nautical mile)",
-                        },
-                        "deadweight_tonnage": {
-                            "value": vessel_data[
-                                "annual_average_co_emissions_per_transport_work_dwt_g_co_dwt_carried_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "passengers": {
-                            "value": vessel_data[
-                                "annual_average_co_emissions_per_transport_work_pax_g_co_pax_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                        "freight": {
-                            "value": vessel_data[
-                                "annual_average_co_emissions_per_transport_work_freight_g_co_m_tonnes_n_miles"
-                            ],
-                            "unit": "gram / (metric tonne * nautical mile)",
-                        },
-                    },
-                },
-            },
-            "laden_voyages": {
-                "total": {
-                    "value": vessel_data["co_emissions_assigned_to_on_laden_m_tonnes"],
-                    "unit": "metric tonne",
-                },
-                "per_distance": {
-                    "value": vessel_data[
-                        "co_emissions_per_distance_on_laden_voyages_kg_co_n_mile"
-                    ],
-                    "unit": "kilogram / nautical mile",
-                },
-                "per_transport_work": {
-                    "mass": {
-                        "value": vessel_data[
-                            "co_emissions_per_transport_work_mass_on_laden_voyages_g_co_m_tonnes_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "volume": {
-                        "value": vessel_data[
-                            "co_emissions_per_transport_work_volume_on_laden_voyages_g_co_m_n_miles"
-                        ],
-                        "unit": "gram / (meter^3 * nautical mile)",
-                    },
-                    "deadweight_tonnage": {
-                        "value": vessel_data[
-                            "co_emissions_per_transport_work_dwt_on_laden_voyages_g_co_dwt_carried_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "passengers": {
-                        "value": vessel_data[
-                            "co_emissions_per_transport_work_pax_on_laden_voyages_g_co_pax_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                    "freight": {
-                        "value": vessel_data[
-                            "co_emissions_per_transport_work_freight_on_laden_voyages_g_co_m_tonnes_n_miles"
-                        ],
-                        "unit": "gram / (metric tonne * nautical mile)",
-                    },
-                },
-            },
-        },
-        "time_metrics": {
-            "annual_total_time_spent_at_sea": {
-                "value": vessel_data["annual_total_time_spent_at_sea_hours"],
-                "unit": "hour",
-            },
-            "total_time_spent_at_sea": {
-                "value": vessel_data["total_time_spent_at_sea_hours"],
-                "unit": "hour",
-            },
-            "total_time_spent_at_sea_through_ice": {
-                "value": vessel_data["total_time_spent_at_sea_through_ice_hours"],
-                "unit": "hour",
-            },
-        },
-        "distance_metrics": {
-            "distance_travelled_through_ice": {
-                "value": vessel_data["through_ice_n_miles"],
-                "unit": "nautical mile",
-            }
-        },
-        "density_metrics": {
-            "average_cargo_density": {
-                "value": vessel_data[
-                    "average_density_of_the_cargo_transported_m_tonnes_m"
-                ],
-                "unit": "metric tonne / meter^3",
-            }
-        },
-        "additional_information": vessel_data[
-            "additional_information_to_facilitate_the_understanding_of_the_reported_average_operational_energy_efficiency_indicators"
-        ],
-    }
+PRECOMPUTED_VALUES = ("", "N/A", "n/a", "Not Applicable", "No", "Yes")
+
+
+def compose_cleaning_functions(cleaning_functions: List[Callable]) -> Callable:
+    """Compose cleaning functions into one, applied left to right
+
+    Results for the most common empty values are computed up front, so the
+    composed function skips the cleaning functions (and the exceptions they
+    raise) for those values.
+    """
+    if len(cleaning_functions) == 1:
+        cleaning_function = cleaning_functions[0]
+    else:
+
+        def cleaning_function(value: Any) -> Any:
+            for function in cleaning_functions:
+                value = function(value)
+            return value
+
+    precomputed_values = {}
+    for value in PRECOMPUTED_VALUES:
+        try:
+            precomputed_values[value] = cleaning_function(value)
+        except ValueError:
+            pass
+
+    def composed_cleaning_function(value: Any) -> Any:
+        if type(value) is str and value in precomputed_values:
+            return precomputed_values[value]
+        return cleaning_function(value)
+
+    return composed_cleaning_function
+
+
+# Cleaning functions whose output can never be a null value marker, so the
+# final clean_null_values pass can be left out after them
+NULL_SAFE_CLEANING_FUNCTIONS = (
+    clean_numerical_data,
+    convert_date,
+    extract_technical_efficiency,
+    int,
+)
+
+
+class CleaningPlan:
+    """
+    Cleaning functions for every column of a CSV file, composed once per file
+
+    Cleaning a row with the plan gives the same result as clean_raw_vessel_data,
+    but touches each value once instead of once per cleaning pass. Rows which
+    clean_raw_vessel_data would reject with a KeyError are handed to it, so
+    the same error is raised.
+    """
+
+    def __init__(self, columns: List[str], column_type_mappings: dict) -> None:
+        self.column_type_mappings = column_type_mappings
+
+        cleaning_functions: Dict[str, List[Callable]] = {
+            column: [] for column in columns
+        }
+        self.complete = True
+        for pass_columns, cleaning_function in get_cleaning_passes(
+            column_type_mappings
+        ):
+            for column in pass_columns:
+                if column not in cleaning_functions:
+                    self.complete = False
+                    break
+                cleaning_functions[column].append(cleaning_function)
+
+        for functions in cleaning_functions.values():
+            if not functions or functions[-1] not in NULL_SAFE_CLEANING_FUNCTIONS:
+                functions.append(clean_null_values)
+
+        self.cleaning_functions = [
+            (column, compose_cleaning_functions(functions))
+            for column, functions in cleaning_functions.items()
+        ]
+
+    def clean(self, vessel_data_raw: dict) -> dict:
+        if self.complete:
+            try:
+                return {
+                    column: cleaning_function(vessel_data_raw[column])
+                    for column, cleaning_function in self.cleaning_functions
+                }
+            except KeyError:
+                pass
+        return clean_raw_vessel_data(vessel_data_raw, self.column_type_mappings)
+
+
+create_vessel_item: Callable[[dict], dict] = compile_vessel_item_builder()
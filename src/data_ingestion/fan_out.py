@@ -0,0 +1,107 @@
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class IngestionSummary(NamedTuple):
+    """Counts of ingesting CSV rows
+
+    durable_rows is the number of rows before the first row of the earliest
+    batch with items which could not be written, all rows when none failed.
+    """
+
+    rows: int = 0
+    cleaned: int = 0
+    rejected: int = 0
+    batches: int = 0
+    written: int = 0
+    failed: int = 0
+    skipped: int = 0
+    changed: int = 0
+    superseded: int = 0
+    durable_rows: int = 0
+
+
+class FanOutSummary(NamedTuple):
+    """Byte ranges of a file found complete, handed out and failed"""
+
+    ranges: int = 0
+    completed_ranges: int = 0
+    dispatched_ranges: int = 0
+    failed_ranges: int = 0
+
+
+class ByteRange(NamedTuple):
+    """Bytes from start up to end, exclusive, or to the end of the file"""
+
+    start: int
+    end: Optional[int] = None
+
+
+def merge_summaries(summaries: Iterable[IngestionSummary]) -> IngestionSummary:
+    return IngestionSummary(*map(sum, zip(IngestionSummary(), *summaries)))
+
+
+def find_record_boundaries(
+    chunks: Iterable[bytes], targets: Sequence[int]
+) -> List[int]:
+    """Find the first record boundary at or after each target byte offset
+
+    A record boundary is the offset just after a newline which is not inside
+    a quoted field. Quotes are counted from the start of the file, so
+    newlines inside quoted fields, like those of the free text
+    additional_information column, are never taken for the end of a record.
+    Escaped quotes come in pairs and do not change whether a newline is
+    quoted. Only bytes are scanned, nothing is decoded or parsed.
+
+    Args:
+        chunks (Iterable[bytes]): Byte chunks of the file, from its start
+        targets (Sequence[int]): Byte offsets to find boundaries after
+
+    Returns:
+        List[int]: Distinct record boundaries, in increasing order. Targets
+        after the last newline have no boundary
+    """
+    pending = sorted(targets)
+    boundaries: List[int] = []
+    offset = 0
+    in_quotes = False
+    for chunk in chunks:
+        position = 0
+        while pending and position < len(chunk):
+            search_from = max(pending[0] - offset, position)
+            newline = chunk.find(b"\n", search_from)
+            if newline == -1:
+                break
+            in_quotes ^= chunk.count(b'"', position, newline) % 2 == 1
+            position = newline + 1
+            if not in_quotes:
+                boundaries.append(offset + position)
+                pending = [target for target in pending if target >= offset + position]
+        in_quotes ^= chunk.count(b'"', position) % 2 == 1
+        offset += len(chunk)
+        if not pending:
+            break
+    return boundaries
+
+
+def split_byte_ranges(
+    chunks: Iterable[bytes], size: int, count: int
+) -> Tuple[int, List[ByteRange]]:
+    """Split a CSV file into up to `count` byte ranges of whole records
+
+    Args:
+        chunks (Iterable[bytes]): Byte chunks of the file, from its start
+        size (int): Size of the file in bytes
+        count (int): Number of ranges to aim for
+
+    Returns:
+        Tuple[int, List[ByteRange]]: Byte offset of the end of the header row,
+        and byte ranges of the data rows, end exclusive
+    """
+    targets = [0] + [size * index // count for index in range(1, count)]
+    boundaries = find_record_boundaries(chunks, targets)
+    if not boundaries:
+        return size, []
+    ends = boundaries[1:] + [size]
+    return boundaries[0], [
+        ByteRange(start, end) for start, end in zip(boundaries, ends) if start < end
+    ]
@@ -1,39 +1,165 @@
-import csv
 import json
 import logging
+import time
 import urllib.parse
-from typing import Generator, List, Optional, Union
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import boto3
-from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import ClientError
 from pydantic import ValidationError
+from pynamodb.connection import TableConnection
 
+from src.data_ingestion.checkpoint import (
+    CheckpointedCsvRows,
+    continue_ingestion,
+    get_deadline,
+)
+from src.data_ingestion.columnar import COLUMNAR_BLOCK_SIZE, ColumnarCleaner
 from src.data_ingestion.data_processing import (
+    ByteOffsetLines,
+    CleaningPlan,
+    clean_column,
     clean_raw_vessel_data,
-    convert_csv_to_dictionaries,
     create_vessel_item,
-    load_column_type_mappings,
 )
-from src.models.pydantic_models import VesselItem
-from src.models.pynamo_models import VesselItemModel
+from src.data_ingestion.fan_out import (
+    ByteRange,
+    FanOutSummary,
+    IngestionSummary,
+    merge_summaries,
+    split_byte_ranges,
+)
+from src.data_ingestion.instrumentation import emit_embedded_metrics
+from src.data_ingestion.runtime_context import get_runtime_context
+from src.data_ingestion.vessel_item_builder import compile_vessel_item_builder
+from src.data_ingestion.writer_pool import (
+    CreateConnection,
+    VesselWriterPool,
+    WriteBatch,
+)
+from src.models.fast_validation import validate_vessel_item
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+from src.models.pynamo_models import (
+    BATCH_WRITE_SIZE,
+    BatchWriteResult,
+    ByteRangeCompletionModel,
+    IngestionCheckpointModel,
+    VesselItemModel,
+)
+from src.profiling.profiler import profile_handler
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.typing import LambdaContext
 
 LOGGER = logging.getLogger()
 LOGGER.setLevel(logging.INFO)
 
+S3_CHUNK_SIZE = 256 * 1024
 
-def read_csv_from_s3(event: dict) -> Union[List[list], None]:
+T = TypeVar("T")
 
-    s3_client = boto3.client("s3")
 
+def get_s3_location(event: dict) -> Tuple[str, str]:
+    """Bucket and object key of the CSV file referenced by an S3 event"""
     bucket = event["Records"][0]["s3"]["bucket"]["name"]
     key = urllib.parse.unquote_plus(
         event["Records"][0]["s3"]["object"]["key"], encoding="utf-8"
     )
+    return bucket, key
+
+
+def get_s3_etag(event: dict) -> str:
+    return event["Records"][0]["s3"]["object"].get("eTag", "")
+
+
+def open_csv_rows(
+    bucket: str,
+    key: str,
+    etag: str = "",
+    byte_range: Optional[ByteRange] = None,
+    header: Optional[List[str]] = None,
+    rows: int = 0,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> CheckpointedCsvRows:
+    """Open rows of a CSV file in S3, all of them or those in a byte range
+
+    A byte range must start at a record boundary, and the header row of the
+    file must then be given. Ranges which start at the end of the file have
+    no rows.
+    """
+    request = {"Bucket": bucket, "Key": key}
+    if byte_range:
+        end = "" if byte_range.end is None else byte_range.end - 1
+        request["Range"] = f"bytes={byte_range.start}-{end}"
+        if etag:
+            request["IfMatch"] = etag
+    runtime_context = get_runtime_context()
+    metrics = runtime_context.pipeline_metrics
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response["Body"].read().decode("utf-8").splitlines(True)
-        csv_reader = csv.reader(content, delimiter=",")
-        return [row for row in csv_reader]
+        with metrics.stage("s3_read"):
+            response = runtime_context.s3_client.get_object(**request)
+        chunks = metrics.time_iterator(
+            "s3_read", response["Body"].iter_chunks(S3_CHUNK_SIZE)
+        )
+    except ClientError as error:
+        if error.response["Error"]["Code"] != "InvalidRange":
+            raise
+        chunks = iter(())
+    return CheckpointedCsvRows(
+        ByteOffsetLines(chunks, offset=byte_range.start if byte_range else 0),
+        header=header,
+        rows=rows,
+        should_stop=should_stop,
+    )
+
+
+def read_csv_from_s3(
+    event: dict,
+    checkpoint: Optional[IngestionCheckpointModel] = None,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> Optional[CheckpointedCsvRows]:
+    """Open the CSV file referenced by an S3 event as a stream of rows
+
+    The object body is decoded and parsed incrementally, so memory use does
+    not grow with the size of the file. Errors raised while the stream is
+    being consumed propagate to the caller. When resuming from a checkpoint
+    only the bytes after it are requested, with a ranged GET.
+
+    Args:
+        event (dict): S3 event
+        checkpoint (Optional[IngestionCheckpointModel]): Checkpoint of an
+            earlier invocation to resume from
+        should_stop (Callable[[], bool]): Called before each data row, rows
+            stop once it returns True
+
+    Returns:
+        Optional[CheckpointedCsvRows]: Iterator over CSV rows, header row first
+    """
+    try:
+        bucket, key = get_s3_location(event)
+        if checkpoint is None:
+            return open_csv_rows(bucket, key, should_stop=should_stop)
+        return open_csv_rows(
+            bucket,
+            key,
+            get_s3_etag(event),
+            ByteRange(int(checkpoint.offset), None),
+            header=[str(column) for column in checkpoint.header],
+            rows=int(checkpoint.rows),
+            should_stop=should_stop,
+        )
     except Exception as error:
         LOGGER.error(
             {"message": "Error when reading CSV file from S3", "content": error}
@@ -41,27 +167,104 @@ def read_csv_from_s3(event: dict) -> Union[List[list], None]:
         return None
 
 
-def write_item_to_dynamodb(item: dict) -> None:
-    vessel_item = VesselItemModel.write_vessel_item(item)
-    if not vessel_item:
+def generate_batches(
+    items: Iterable[T], batch_size: int = BATCH_WRITE_SIZE
+) -> Generator[List[T], None, None]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def write_items_to_dynamodb(
+    items: List[dict], connection: Optional[TableConnection] = None
+) -> BatchWriteResult:
+    runtime_context = get_runtime_context()
+    started = time.perf_counter()
+    result = VesselItemModel.write_vessel_items(
+        items,
+        connection,
+        runtime_context.write_rate_limiter,
+        skip_unchanged=runtime_context.skip_unchanged_items,
+    )
+    runtime_context.pipeline_metrics.record_write(
+        len(items), (time.perf_counter() - started) * 1000
+    )
+    if result.failed:
         LOGGER.warning(
             {
-                "message": "Item could not be written to DynamoDB",
+                "message": "Items could not be written to DynamoDB",
                 "content": {
-                    "item": item,
+                    "written": result.written,
+                    "failed": result.failed,
+                    "imo_numbers": [item["imo_number"] for item in items],
                 },
             }
         )
+    return result
+
+
+def log_missing_columns(error: KeyError) -> None:
+    LOGGER.warning(
+        {
+            "message": "Vessel data did not include reporting period or IMO number",
+            "content": error,
+        }
+    )
+
+
+def process_vessel_data(
+    vessel_data: Union[dict, Sequence],
+    reporting_period: Any,
+    imo_number: Any,
+    build_vessel_item: Callable[[Any], dict] = create_vessel_item,
+) -> Optional[dict]:
+    """Process cleaned vessel data into a nested and modelled dictionary
+
+    Args:
+        vessel_data (Union[dict, Sequence]): Cleaned vessel data as a flat
+            dictionary, or a row of values read by build_vessel_item
+        reporting_period (Any): Raw reporting period, used in log messages
+        imo_number (Any): Raw IMO number, used in log messages
+        build_vessel_item (Callable[[Any], dict]): Builds the nested vessel
+            item from the vessel data
+
+    Returns:
+        Optional[dict]: Cleaned, nested dictioniary with vessel data
+    """
+    runtime_context = get_runtime_context()
+    metrics = runtime_context.pipeline_metrics
+    try:
+        with metrics.stage("build"):
+            vessel_item = build_vessel_item(vessel_data)
+        with metrics.stage("validate"):
+            if runtime_context.validation_engine == "fast":
+                return validate_vessel_item(vessel_item)
+            vessel_item_object = VesselItem(**vessel_item)
+            return model_to_primitive_dict(vessel_item_object)
+    except ValidationError as error:
+        LOGGER.warning(
+            {
+                "message": f"Vessel data could not be processed for reporting period: {reporting_period} and IMO number: {imo_number}",
+                "content": error,
+            }
+        )
+    except KeyError as error:
+        log_missing_columns(error)
+    return None
 
 
 def process_raw_vessel_data(
-    vessel_data_raw: dict, column_type_mappings: dict
+    vessel_data_raw: dict,
+    column_type_mappings: dict,
+    cleaning_plan: Optional[CleaningPlan] = None,
 ) -> Optional[dict]:
     """Process vessel data from raw form to clean nested and modelled dictionary
 
     Args:
         vessel_data_raw (dict): Raw vessel data as a flat dictionary
         column_type_mappings (dict): Mappings of column names to data types
+        cleaning_plan (Optional[CleaningPlan]): Cleaning plan compiled for the
+            columns of the CSV file, used instead of clean_raw_vessel_data
 
     Returns:
         Optional[dict]: Cleaned, nested dictioniary with vessel data
@@ -69,64 +272,481 @@ def process_raw_vessel_data(
     try:
         reporting_period = vessel_data_raw["reporting_period"]
         imo_number = vessel_data_raw["imo_number"]
-        try:
-            vessel_data = clean_raw_vessel_data(vessel_data_raw, column_type_mappings)
-            vessel_item = create_vessel_item(vessel_data)
-            vessel_item_object = VesselItem(**vessel_item)
-            return json.loads(vessel_item_object.json())
-        except ValidationError as error:
-            LOGGER.warning(
-                {
-                    "message": f"Vessel data could not be processed for reporting period: {reporting_period} and IMO number: {imo_number}",
-                    "content": error,
-                }
-            )
-            return None
+        with get_runtime_context().pipeline_metrics.stage("clean"):
+            if cleaning_plan:
+                vessel_data = cleaning_plan.clean(vessel_data_raw)
+            else:
+                vessel_data = clean_raw_vessel_data(
+                    vessel_data_raw, column_type_mappings
+                )
     except KeyError as error:
-        LOGGER.warning(
-            {
-                "message": "Vessel data did not include reporting period or IMO number",
-                "content": error,
-            }
-        )
+        log_missing_columns(error)
         return None
+    return process_vessel_data(vessel_data, reporting_period, imo_number)
+
+
+def generate_vessel_items_by_column(
+    columns: List[str],
+    csv_rows: Iterable[list],
+    column_type_mappings: dict,
+    cleaning_plan: CleaningPlan,
+) -> Generator[Optional[dict], None, None]:
+    """Generate vessel items, cleaning blocks of rows column by column
+
+    Rows which cannot be cleaned column by column are processed row by row,
+    so the generated items and log messages are the same as with
+    process_raw_vessel_data.
+    """
+    columnar_cleaner = ColumnarCleaner(columns, cleaning_plan)
+    reporting_period_index = columns.index("reporting_period")
+    imo_number_index = columns.index("imo_number")
+    names = columnar_cleaner.names
+
+    def build_vessel_item_from_dictionary(values: Sequence) -> dict:
+        return create_vessel_item(dict(zip(names, values)))
+
+    try:
+        build_vessel_item = compile_vessel_item_builder(names)
+    except KeyError:
+        build_vessel_item = build_vessel_item_from_dictionary
+
+    metrics = get_runtime_context().pipeline_metrics
+    for block in generate_batches(csv_rows, COLUMNAR_BLOCK_SIZE):
+        with metrics.stage("clean"):
+            cleaned_block = columnar_cleaner.clean_block(block)
+        for row, vessel_data in zip(block, cleaned_block):
+            if vessel_data is None:
+                yield process_raw_vessel_data(
+                    dict(zip(columns, row)), column_type_mappings, cleaning_plan
+                )
+            else:
+                yield process_vessel_data(
+                    vessel_data,
+                    row[reporting_period_index],
+                    row[imo_number_index],
+                    build_vessel_item,
+                )
 
 
 def get_vessel_generator(
-    event: dict,
+    event: dict, csv_rows: Optional[Iterable[list]] = None
 ) -> Optional[Generator[Optional[dict], None, None]]:
     """Create a vessel generator which generates clean vessel items
 
     Args:
         event (dict): S3 event
+        csv_rows (Optional[Iterable[list]]): Rows of the CSV file, header row
+            first, read from the S3 object of the event when not given
 
     Returns:
         Optional[Generator[Optional[dict], None, None]]: Generator that
         yields clean vessel items
     """
 
-    csv_content = read_csv_from_s3(event)
-    column_type_mappings = load_column_type_mappings()
+    if csv_rows is None:
+        csv_rows = read_csv_from_s3(event)
+    runtime_context = get_runtime_context()
+    column_type_mappings = runtime_context.column_type_mappings
+
+    if csv_rows is not None:
+        csv_rows = runtime_context.pipeline_metrics.time_iterator("parse", csv_rows)
+        columns = [clean_column(column) for column in next(csv_rows, [])]
+        cleaning_plan = CleaningPlan(columns, column_type_mappings)
+
+        if runtime_context.cleaning_engine == "columnar" and {
+            "reporting_period",
+            "imo_number",
+        }.issubset(columns):
+            return generate_vessel_items_by_column(
+                columns, csv_rows, column_type_mappings, cleaning_plan
+            )
 
-    if csv_content:
-        vessel_data_raw_dictionaries = convert_csv_to_dictionaries(csv_content)
         vessel_generator = (
-            process_raw_vessel_data(vessel_data_raw, column_type_mappings)
-            for vessel_data_raw in vessel_data_raw_dictionaries
+            process_raw_vessel_data(
+                dict(zip(columns, row)), column_type_mappings, cleaning_plan
+            )
+            for row in csv_rows
         )
 
         return vessel_generator
     return None
 
 
-def handler(event: dict, context: LambdaContext) -> dict:
-    LOGGER.info({"message": "Incoming S3 event", "content": json.dumps(event)})
+def write_vessel_generator(
+    vessel_generator: Iterable[Optional[dict]],
+    write_batch: WriteBatch = write_items_to_dynamodb,
+    batch_size: int = BATCH_WRITE_SIZE,
+    workers: Optional[int] = None,
+    create_connection: Optional[CreateConnection] = None,
+) -> IngestionSummary:
+    """Write the vessel items of a generator, counting rejected rows
 
-    vessel_generator = get_vessel_generator(event)
-    if vessel_generator:
+    The generator yields one vessel item per row, None for rows which could
+    not be cleaned or validated.
+
+    Args:
+        vessel_generator (Iterable[Optional[dict]]): Vessel items of the rows
+        write_batch (WriteBatch): Writes a batch of vessel items from a
+            writer thread, to DynamoDB by default
+        batch_size (int): Number of vessel items in each batch
+        workers (Optional[int]): Number of writer threads, WRITER_THREADS
+            by default
+        create_connection (Optional[CreateConnection]): Creates the
+            connection each writer thread hands to write_batch, a table
+            connection by default
+
+    Returns:
+        IngestionSummary: Number of rows read, cleaned, rejected and written,
+        and of rows before the first batch which failed
+    """
+    runtime_context = get_runtime_context()
+    rows = 0
+    # Number of rows before the first row of each batch
+    batch_rows: List[int] = []
+
+    def generate_cleaned_vessel_items() -> Generator[dict, None, None]:
+        nonlocal rows
+        items = 0
         for vessel_item in vessel_generator:
+            rows += 1
             if vessel_item:
-                write_item_to_dynamodb(vessel_item)
+                if items % batch_size == 0:
+                    batch_rows.append(rows - 1)
+                items += 1
+                yield vessel_item
+
+    cleaned = 0
+    write_wait = runtime_context.pipeline_metrics.stage("write_wait")
+    with VesselWriterPool(
+        write_batch,
+        workers=workers or runtime_context.writer_threads,
+        max_pending=runtime_context.writer_max_pending_batches,
+        create_connection=create_connection,
+        rate_limiter=runtime_context.write_rate_limiter,
+    ) as writer_pool:
+        runtime_context.writer_pool = writer_pool
+        try:
+            for batch in generate_batches(generate_cleaned_vessel_items(), batch_size):
+                cleaned += len(batch)
+                with write_wait:
+                    writer_pool.submit(batch)
+            with write_wait:
+                writer_pool.close()
+        finally:
+            runtime_context.writer_pool = None
+
+    return IngestionSummary(
+        rows=rows,
+        cleaned=cleaned,
+        rejected=rows - cleaned,
+        batches=writer_pool.batches,
+        written=writer_pool.written,
+        failed=writer_pool.failed,
+        skipped=writer_pool.skipped,
+        changed=writer_pool.changed,
+        superseded=writer_pool.superseded,
+        durable_rows=(
+            rows
+            if writer_pool.first_failed_batch is None
+            else batch_rows[writer_pool.first_failed_batch]
+        ),
+    )
+
+
+def ingest_byte_range(
+    bucket: str,
+    key: str,
+    etag: str,
+    header: List[str],
+    start: int,
+    end: int,
+    write_capacity_units: Optional[float] = None,
+) -> IngestionSummary:
+    """Ingest the rows in a byte range of a CSV file, see fan_out_ingestion
+
+    The range is recorded as complete once all its vessel items have been
+    written.
+
+    Raises:
+        RuntimeError: If vessel items could not be written, so the range is
+            retried
+    """
+    if write_capacity_units:
+        get_runtime_context().set_write_capacity(write_capacity_units)
+    csv_rows = open_csv_rows(bucket, key, etag, ByteRange(start, end), header)
+    vessel_generator = get_vessel_generator({}, csv_rows)
+    if vessel_generator is None:
+        return IngestionSummary()
+    summary = write_vessel_generator(vessel_generator)
+    if summary.failed:
+        raise RuntimeError(
+            f"{summary.failed} vessel items of bytes {start}-{end} were not written"
+        )
+    ByteRangeCompletionModel.write_completion(
+        bucket, key, etag, start, end, summary._asdict()
+    )
+    return summary
+
+
+def invoke_byte_range_worker(context: Any, byte_range_event: dict) -> None:
+    """Invoke the lambda asynchronously to ingest a byte range
+
+    Lambda retries failed asynchronous invocations, and a worker which fails
+    leaves its range incomplete for the next coordinator.
+    """
+    get_runtime_context().lambda_client.invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps({"byte_range": byte_range_event}).encode("utf-8"),
+    )
+
+
+def fan_out_ingestion(
+    bucket: str, key: str, context: Any, ranges: int, executor: str
+) -> Tuple[FanOutSummary, IngestionSummary]:
+    """Ingest a CSV file in byte ranges of whole records, concurrently
+
+    The object is scanned once for record boundaries, without parsing it,
+    then its data rows are split into up to `ranges` byte ranges. Ranges
+    recorded as complete by an earlier invocation are left out, so a
+    coordinator which is retried only hands out the rest. Each range is read
+    with a ranged GET and ingested with the header row of the file, and gets
+    an even share of WRITE_CAPACITY_UNITS.
+
+    With the "lambda" executor each range is ingested by an asynchronous
+    worker invocation of the lambda, so workers are not bound by the
+    timeout of the coordinator, and log their own summaries. With the
+    "process" executor the ranges are ingested by a local process pool and
+    their summaries are merged. Lambda does not support process pools.
+
+    Args:
+        bucket (str): Bucket of the CSV file
+        key (str): Object key of the CSV file
+        context (Any): Lambda context, used to invoke workers
+        ranges (int): Number of byte ranges to aim for
+        executor (str): "lambda" or "process"
+
+    Returns:
+        Tuple[FanOutSummary, IngestionSummary]: Number of byte ranges which
+        were already complete, handed out and which failed, and the summary
+        merged over the ranges ingested by the process pool
+    """
+    runtime_context = get_runtime_context()
+    s3_client = runtime_context.s3_client
+    head = s3_client.head_object(Bucket=bucket, Key=key)
+    etag = head["ETag"]
+    response = s3_client.get_object(Bucket=bucket, Key=key, IfMatch=etag)
+    header_end, byte_ranges = split_byte_ranges(
+        response["Body"].iter_chunks(S3_CHUNK_SIZE), head["ContentLength"], ranges
+    )
+    if not byte_ranges:
+        return FanOutSummary(), IngestionSummary()
+    completed_ranges = ByteRangeCompletionModel.read_completed_ranges(bucket, key, etag)
+    pending_ranges = [
+        byte_range for byte_range in byte_ranges if byte_range not in completed_ranges
+    ]
+    fan_out_summary = FanOutSummary(
+        ranges=len(byte_ranges),
+        completed_ranges=len(byte_ranges) - len(pending_ranges),
+        dispatched_ranges=len(pending_ranges),
+    )
+    if not pending_ranges:
+        return fan_out_summary, IngestionSummary()
+
+    header = next(iter(open_csv_rows(bucket, key, etag, ByteRange(0, header_end))))
+    byte_range_events = [
+        {
+            "bucket": bucket,
+            "key": key,
+            "etag": etag,
+            "header": header,
+            "start": byte_range.start,
+            "end": byte_range.end,
+            "write_capacity_units": runtime_context.write_capacity_units
+            / len(byte_ranges),
+        }
+        for byte_range in pending_ranges
+    ]
+
+    if executor != "process":
+        for event in byte_range_events:
+            invoke_byte_range_worker(context, event)
+        return fan_out_summary, IngestionSummary()
+
+    # multiprocessing is slow to import and only used to fan out locally
+    from concurrent.futures import ProcessPoolExecutor
+
+    summaries = []
+    failed_ranges = 0
+    with ProcessPoolExecutor(max_workers=len(byte_range_events)) as process_pool:
+        futures = [
+            process_pool.submit(ingest_byte_range, **event)
+            for event in byte_range_events
+        ]
+        for event, future in zip(byte_range_events, futures):
+            try:
+                summaries.append(future.result())
+            except Exception as error:
+                failed_ranges += 1
+                LOGGER.error(
+                    {
+                        "message": "Byte range could not be ingested",
+                        "content": {
+                            "start": event["start"],
+                            "end": event["end"],
+                            "error": str(error),
+                        },
+                    }
+                )
+    return (
+        fan_out_summary._replace(failed_ranges=failed_ranges),
+        merge_summaries(summaries),
+    )
+
+
+def emit_pipeline_metrics(key: str, rows: int, bytes_read: int) -> None:
+    """Emit the pipeline metrics of the invocation, when they are recorded"""
+    runtime_context = get_runtime_context()
+    metrics = runtime_context.pipeline_metrics
+    if metrics.enabled:
+        summary = metrics.get_summary(rows, bytes_read)
+        emit_embedded_metrics(
+            summary, runtime_context.metrics_namespace, metadata={"file": key}
+        )
+
 
+@profile_handler("data-ingestion")
+def handler(event: dict, context: "LambdaContext") -> dict:
+    LOGGER.info({"message": "Incoming S3 event", "content": json.dumps(event)})
+
+    started = time.perf_counter()
+    runtime_context = get_runtime_context()
+    start = "warm" if runtime_context.invocations else "cold"
+    runtime_context.invocations += 1
+    LOGGER.info(
+        {
+            "message": "Runtime context ready",
+            "content": {
+                "start": start,
+                "invocations": runtime_context.invocations,
+                "init_duration_ms": runtime_context.init_duration_ms,
+                "context_duration_ms": (time.perf_counter() - started) * 1000,
+            },
+        }
+    )
+
+    runtime_context.reset_pipeline_metrics()
+    runtime_context.set_write_capacity(runtime_context.write_capacity_units)
+
+    if "byte_range" in event:
+        byte_range_event = event["byte_range"]
+        summary = ingest_byte_range(**byte_range_event)
+        emit_pipeline_metrics(
+            byte_range_event["key"],
+            summary.rows,
+            byte_range_event["end"] - byte_range_event["start"],
+        )
+        LOGGER.info(
+            {
+                "message": "Finished writing byte range to DynamoDB",
+                "content": {
+                    "file": byte_range_event["key"],
+                    "start": byte_range_event["start"],
+                    "end": byte_range_event["end"],
+                    **summary._asdict(),
+                },
+            }
+        )
+        return {"body": "Success!", "summary": summary._asdict()}
+
+    try:
+        bucket, key = get_s3_location(event)
+        etag = get_s3_etag(event)
+    except KeyError as error:
+        LOGGER.error(
+            {"message": "Event does not reference an S3 object", "content": error}
+        )
+        return {"body": "Unsuccesful"}
+
+    rate_limiter = runtime_context.write_rate_limiter
+    consumed_units = rate_limiter.consumed_units
+    throttles = rate_limiter.throttles
+
+    if runtime_context.ingestion_mode == "fan_out":
+        fan_out_summary, summary = fan_out_ingestion(
+            bucket,
+            key,
+            context,
+            runtime_context.fan_out_ranges,
+            runtime_context.fan_out_executor,
+        )
+        LOGGER.info(
+            {
+                "message": "Finished fanning out vessel items to DynamoDB",
+                "content": {
+                    "file": key,
+                    **fan_out_summary._asdict(),
+                    **summary._asdict(),
+                    "start": start,
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                },
+            }
+        )
+        if fan_out_summary.failed_ranges:
+            return {"body": "Unsuccesful"}
+        return {"body": "Success!"}
+
+    checkpoint = IngestionCheckpointModel.read_checkpoint(bucket, key, etag)
+    csv_rows = read_csv_from_s3(
+        event,
+        checkpoint,
+        get_deadline(
+            context,
+            runtime_context.checkpoint_reserve_ms,
+            runtime_context.get_write_drain_ms,
+        ),
+    )
+    vessel_generator = (
+        get_vessel_generator(event, csv_rows) if csv_rows is not None else None
+    )
+    if csv_rows is not None and vessel_generator:
+        summary = write_vessel_generator(vessel_generator)
+
+        continued = False
+        if summary.failed:
+            # Resume from the first batch which failed, so its rows are retried
+            csv_rows.rewind(summary.durable_rows)
+        if csv_rows.stopped or summary.failed:
+            continued = continue_ingestion(
+                event, context, (bucket, key, etag), csv_rows, checkpoint
+            )
+        elif checkpoint:
+            checkpoint.delete()
+
+        emit_pipeline_metrics(
+            key,
+            summary.rows,
+            csv_rows.offset - (int(checkpoint.offset) if checkpoint else 0),
+        )
+
+        LOGGER.info(
+            {
+                "message": "Finished writing vessel items to DynamoDB",
+                "content": {
+                    "file": key,
+                    **summary._asdict(),
+                    "file_rows": csv_rows.rows,
+                    "offset": csv_rows.offset,
+                    "resumed": checkpoint is not None,
+                    "continued": continued,
+                    "consumed_capacity_units": rate_limiter.consumed_units
+                    - consumed_units,
+                    "throttles": rate_limiter.throttles - throttles,
+                    "write_rate": rate_limiter.rate,
+                    "start": start,
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                },
+            }
+        )
         return {"body": "Success!"}
     return {"body": "Unsuccesful"}
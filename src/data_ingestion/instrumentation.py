@@ -0,0 +1,180 @@
+import json
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from types import TracebackType
+from typing import (
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+WRITE_LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class StageStats:
+    def __init__(self) -> None:
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.calls = 0
+
+
+class StageTimer:
+    """Times a stage each time it is entered, excluding nested stages"""
+
+    def __init__(self, metrics: "PipelineMetrics", stats: StageStats) -> None:
+        self.metrics = metrics
+        self.stats = stats
+
+    def __enter__(self) -> None:
+        # Start wall time, start CPU time, and wall and CPU time of nested stages
+        self.metrics._open_stages.append(
+            [time.perf_counter(), time.thread_time(), 0.0, 0.0]
+        )
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        wall_s = time.perf_counter()
+        cpu_s = time.thread_time()
+        open_stages = self.metrics._open_stages
+        started_wall_s, started_cpu_s, nested_wall_s, nested_cpu_s = open_stages.pop()
+        wall_s -= started_wall_s
+        cpu_s -= started_cpu_s
+        self.stats.wall_s += wall_s - nested_wall_s
+        self.stats.cpu_s += cpu_s - nested_cpu_s
+        self.stats.calls += 1
+        if open_stages:
+            open_stages[-1][2] += wall_s
+            open_stages[-1][3] += cpu_s
+
+
+class PipelineMetrics:
+    """
+    Cumulative wall and CPU time of each stage of ingesting a CSV file
+
+    Stages are timed in the thread reading the file. Time spent in a stage
+    entered from within another one, like reading from S3 while parsing CSV
+    rows, counts towards the inner stage only, so stage times add up to the
+    time spent in the pipeline. Batch writes run in the writer threads and
+    are recorded separately, as latencies.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.write_latencies_ms: List[float] = []
+        self.items_written = 0
+        self.started = time.perf_counter()
+
+        self._open_stages: List[List[float]] = []
+        self._timers: Dict[str, StageTimer] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        timer = self._timers.get(name)
+        if timer is None:
+            self.stages[name] = StageStats()
+            timer = self._timers[name] = StageTimer(self, self.stages[name])
+        return timer
+
+    def time_iterator(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Time getting each item of an iterable as a stage"""
+        iterator = iter(iterable)
+        timer = self.stage(name)
+        while True:
+            with timer:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record_write(self, items: int, latency_ms: float) -> None:
+        with self._lock:
+            self.items_written += items
+            self.write_latencies_ms.append(latency_ms)
+
+    def get_summary(self, rows: int, bytes_read: int) -> Dict[str, float]:
+        """Summarise the stages, throughput and write latency percentiles"""
+        duration_s = time.perf_counter() - self.started
+        summary: Dict[str, float] = {
+            "duration_ms": duration_s * 1000,
+            "rows": rows,
+            "rows_per_second": rows / duration_s if duration_s else 0.0,
+            "bytes_read": bytes_read,
+        }
+        for name, stats in self.stages.items():
+            summary[f"{name}_wall_ms"] = stats.wall_s * 1000
+            summary[f"{name}_cpu_ms"] = stats.cpu_s * 1000
+            summary[f"{name}_calls"] = stats.calls
+
+        latencies = sorted(self.write_latencies_ms)
+        summary["write_batches"] = len(latencies)
+        summary["write_items"] = self.items_written
+        if latencies:
+            for percentile in WRITE_LATENCY_PERCENTILES:
+                index = min(len(latencies) - 1, len(latencies) * percentile // 100)
+                summary[f"write_latency_p{percentile}_ms"] = latencies[index]
+            summary["write_latency_max_ms"] = latencies[-1]
+        return summary
+
+
+class NullPipelineMetrics(PipelineMetrics):
+    """Pipeline metrics which record nothing, used when instrumentation is off"""
+
+    enabled = False
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return NULL_STAGE
+
+    def time_iterator(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        return iter(iterable)
+
+    def record_write(self, items: int, latency_ms: float) -> None:
+        pass
+
+
+NULL_STAGE: ContextManager[None] = nullcontext()
+
+
+def get_metric_unit(name: str) -> str:
+    if name.endswith("_ms"):
+        return "Milliseconds"
+    if name == "rows_per_second":
+        return "Count/Second"
+    if name == "bytes_read":
+        return "Bytes"
+    return "Count"
+
+
+def emit_embedded_metrics(
+    summary: Dict[str, float], namespace: str, metadata: Dict[str, object]
+) -> None:
+    """Print the summary as CloudWatch metrics in Embedded Metric Format"""
+    # Powertools is only imported when instrumentation is on, to keep it out of
+    # the cold start of the lambda
+    from aws_lambda_powertools import Metrics
+
+    metrics = Metrics(namespace=namespace, service="data-ingestion")
+    for name, value in summary.items():
+        metrics.add_metric(name=name, unit=get_metric_unit(name), value=value)
+    for key, metadata_value in metadata.items():
+        metrics.add_metadata(key=key, value=metadata_value)
+    # As in Metrics.log_metrics, which every powertools version has, unlike
+    # flush_metrics
+    embedded_metrics = metrics.serialize_metric_set()
+    metrics.clear_metrics()
+    sys.stdout.write(json.dumps(embedded_metrics, separators=(",", ":")) + "\n")
@@ -0,0 +1,359 @@
+"""Ingest local CSV files without AWS, for capacity planning and tuning
+
+Rows go through the same parsing, cleaning, modelling and validation as in
+the data-ingestion lambda, and the vessel items are written to a sink:
+
+- dynamodb: an in-process moto stand-in, or DynamoDB Local with --endpoint
+- ndjson: a file with one vessel item per line
+- sqlite: a vessel_items table in a SQLite database
+
+Run from the root directory, eg.
+
+python -m src.data_ingestion.local_ingestion "data/raw/*.csv" --sink ndjson --output items.ndjson
+cat 2018.csv | python -m src.data_ingestion.local_ingestion - --sink sqlite --output items.db
+"""
+
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import IO, Any, Deque, Iterator, List, Optional
+
+from src.data_ingestion.checkpoint import CheckpointedCsvRows
+from src.data_ingestion.data_processing import ByteOffsetLines
+from src.data_ingestion.fan_out import ByteRange, split_byte_ranges
+from src.data_ingestion.handler import (
+    S3_CHUNK_SIZE,
+    generate_batches,
+    get_vessel_generator,
+    write_items_to_dynamodb,
+    write_vessel_generator,
+)
+from src.data_ingestion.instrumentation import PipelineMetrics
+from src.data_ingestion.runtime_context import get_runtime_context
+from src.models.pynamo_models import (
+    BATCH_WRITE_SIZE,
+    BatchWriteResult,
+    VesselItemModel,
+    get_content_hash,
+    get_partition_key,
+    get_sort_key,
+)
+
+LOGGER = logging.getLogger()
+
+RANGE_BYTES = 4 * 1024 * 1024
+
+
+class Sink(ABC):
+    """Where the vessel items of local ingestion are written to
+
+    write_batch is called from the writer threads.
+    """
+
+    @abstractmethod
+    def write_batch(self, items: List[dict], connection: Any) -> BatchWriteResult:
+        pass
+
+    def create_connection(self) -> Any:
+        """Connection each writer thread hands to write_batch, None by default"""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class DynamoDBSink(Sink):
+    """Writes to DynamoDB Local at an endpoint, or to a moto stand-in
+
+    The shipping-data table is created when it does not exist. Batches are
+    written with BatchWriteItem, BATCH_WRITE_SIZE items at a time. The
+    host and connection of VesselItemModel are restored on close.
+    """
+
+    def __init__(self, endpoint: Optional[str] = None) -> None:
+        self._mock = None
+        self._host = VesselItemModel.Meta.host
+        self._connection = VesselItemModel._connection
+        if endpoint:
+            VesselItemModel.Meta.host = endpoint
+            VesselItemModel._connection = None
+        else:
+            # moto is a development dependency, only needed for the stand-in
+            from moto import mock_dynamodb
+
+            os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+            os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+            self._mock = mock_dynamodb()
+            self._mock.start()
+        if not VesselItemModel.exists():
+            VesselItemModel.create_table(wait=True)
+
+    def create_connection(self) -> Any:
+        return VesselItemModel.create_connection()
+
+    def write_batch(self, items: List[dict], connection: Any) -> BatchWriteResult:
+        results = [
+            write_items_to_dynamodb(batch, connection)
+            for batch in generate_batches(items, BATCH_WRITE_SIZE)
+        ]
+        return BatchWriteResult(
+            written=sum(result.written for result in results),
+            failed=sum(result.failed for result in results),
+            skipped=sum(result.skipped for result in results),
+            changed=sum(result.changed for result in results),
+            superseded=sum(result.superseded for result in results),
+        )
+
+    def close(self) -> None:
+        if self._mock:
+            self._mock.stop()
+        VesselItemModel.Meta.host = self._host
+        VesselItemModel._connection = self._connection
+
+
+class NdjsonSink(Sink):
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write_batch(self, items: List[dict], connection: Any) -> BatchWriteResult:
+        lines = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items)
+        with self._lock:
+            self._file.write(lines)
+        return BatchWriteResult(written=len(items), failed=0)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SqliteSink(Sink):
+    """Writes vessel items to a vessel_items table, keyed like shipping-data"""
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS vessel_items ("
+            "pk TEXT NOT NULL, sk TEXT NOT NULL, imo_number TEXT NOT NULL, "
+            "reporting_period INTEGER NOT NULL, content_hash TEXT NOT NULL, "
+            "item TEXT NOT NULL, PRIMARY KEY (pk, sk))"
+        )
+        self._lock = threading.Lock()
+
+    def write_batch(self, items: List[dict], connection: Any) -> BatchWriteResult:
+        rows = [
+            (
+                get_partition_key(item["imo_number"]),
+                get_sort_key(item["reporting_period"], item["imo_number"]),
+                item["imo_number"],
+                item["reporting_period"],
+                get_content_hash(item),
+                json.dumps(item, ensure_ascii=False),
+            )
+            for item in items
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO vessel_items VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        return BatchWriteResult(written=len(items), failed=0)
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def create_sink(name: str, output: str, endpoint: Optional[str]) -> Sink:
+    if name == "dynamodb":
+        return DynamoDBSink(endpoint)
+    if name == "ndjson":
+        return NdjsonSink(output)
+    return SqliteSink(output)
+
+
+def read_chunks(file: IO[bytes]) -> Iterator[bytes]:
+    return iter(lambda: file.read(S3_CHUNK_SIZE), b"")
+
+
+def expand_paths(patterns: List[str]) -> List[str]:
+    """Paths matching each pattern, "-" stands for stdin"""
+    paths = []
+    for pattern in patterns:
+        matches = [pattern] if pattern == "-" else sorted(glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No files match {pattern}")
+        paths.extend(matches)
+    return paths
+
+
+def process_byte_range(
+    path: str, header: List[str], byte_range: ByteRange
+) -> List[Optional[dict]]:
+    """Vessel items of the rows in a byte range of a file, None for rejected rows"""
+    with open(path, "rb") as file:
+        file.seek(byte_range.start)
+        content = file.read(
+            (byte_range.end or os.path.getsize(path)) - byte_range.start
+        )
+    csv_rows = CheckpointedCsvRows(
+        ByteOffsetLines([content], offset=byte_range.start), header=header
+    )
+    return list(get_vessel_generator({}, csv_rows) or ())
+
+
+def generate_vessel_items_in_processes(
+    path: str, processes: int, range_bytes: int
+) -> Iterator[Optional[dict]]:
+    """Generate the vessel items of a file, processing byte ranges in a pool
+
+    Ranges are split at record boundaries, see split_byte_ranges, and their
+    items are generated in file order. At most two ranges per process are
+    pending, to bound memory use.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        header_end, byte_ranges = split_byte_ranges(
+            read_chunks(file), size, max(1, math.ceil(size / range_bytes))
+        )
+        file.seek(0)
+        header = next(CheckpointedCsvRows(ByteOffsetLines([file.read(header_end)])))
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending: Deque[Future] = deque()
+        for byte_range in byte_ranges:
+            pending.append(pool.submit(process_byte_range, path, header, byte_range))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def ingest_file(path: str, sink: Sink, arguments: argparse.Namespace) -> dict:
+    runtime_context = get_runtime_context()
+    if arguments.metrics:
+        runtime_context.pipeline_metrics = PipelineMetrics()
+    started = time.perf_counter()
+
+    write_vessel_items = partial(
+        write_vessel_generator,
+        write_batch=sink.write_batch,
+        batch_size=arguments.batch_size,
+        workers=arguments.writers,
+        create_connection=sink.create_connection,
+    )
+    if path == "-":
+        csv_rows = CheckpointedCsvRows(ByteOffsetLines(read_chunks(sys.stdin.buffer)))
+        summary = write_vessel_items(get_vessel_generator({}, csv_rows) or iter(()))
+        bytes_read = csv_rows.offset
+    elif arguments.processes > 1:
+        summary = write_vessel_items(
+            generate_vessel_items_in_processes(
+                path, arguments.processes, arguments.range_bytes
+            )
+        )
+        bytes_read = os.path.getsize(path)
+    else:
+        with open(path, "rb") as file:
+            csv_rows = CheckpointedCsvRows(ByteOffsetLines(read_chunks(file)))
+            summary = write_vessel_items(get_vessel_generator({}, csv_rows) or iter(()))
+        bytes_read = csv_rows.offset
+
+    duration_s = time.perf_counter() - started
+    result = {
+        "file": path,
+        **summary._asdict(),
+        "bytes_read": bytes_read,
+        "duration_ms": duration_s * 1000,
+        "rows_per_second": summary.rows / duration_s if duration_s else 0.0,
+    }
+    if arguments.metrics:
+        result["stages"] = runtime_context.pipeline_metrics.get_summary(
+            summary.rows, bytes_read
+        )
+    return result
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest local CSV files without AWS")
+    parser.add_argument(
+        "paths", nargs="+", help='CSV file paths or glob patterns, "-" for stdin'
+    )
+    parser.add_argument(
+        "--sink", choices=["dynamodb", "ndjson", "sqlite"], default="ndjson"
+    )
+    parser.add_argument("--output", help="Path of the NDJSON file or SQLite database")
+    parser.add_argument(
+        "--endpoint", help="DynamoDB Local endpoint, a moto stand-in by default"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_WRITE_SIZE,
+        help="Vessel items per batch handed to the writer threads",
+    )
+    parser.add_argument(
+        "--writers", type=int, default=4, help="Number of writer threads"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of processes parsing, cleaning and validating each file",
+    )
+    parser.add_argument(
+        "--range-bytes",
+        type=int,
+        default=RANGE_BYTES,
+        help="Size of the byte ranges of a file handed to each process",
+    )
+    parser.add_argument(
+        "--write-capacity",
+        type=float,
+        help="Write capacity units per second of the dynamodb sink, "
+        "WRITE_CAPACITY_UNITS or 200 by default",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Report the time spent in each stage and write latencies",
+    )
+    parser.add_argument("--log-level", default="INFO")
+    parsed_arguments = parser.parse_args(arguments)
+    if parsed_arguments.processes > 1 and "-" in parsed_arguments.paths:
+        parser.error("--processes needs file paths, stdin cannot be split")
+    if parsed_arguments.sink != "dynamodb" and not parsed_arguments.output:
+        parser.error(f"--sink {parsed_arguments.sink} needs an --output path")
+
+    logging.basicConfig()
+    LOGGER.setLevel(parsed_arguments.log_level)
+    runtime_context = get_runtime_context()
+    runtime_context.set_write_capacity(
+        parsed_arguments.write_capacity or runtime_context.write_capacity_units
+    )
+    paths = expand_paths(parsed_arguments.paths)
+    sink = create_sink(
+        parsed_arguments.sink, parsed_arguments.output, parsed_arguments.endpoint
+    )
+    try:
+        for path in paths:
+            LOGGER.info(
+                {
+                    "message": "Ingested local file",
+                    "content": ingest_file(path, sink, parsed_arguments),
+                }
+            )
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
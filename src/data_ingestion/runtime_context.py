@@ -0,0 +1,106 @@
+import os
+import time
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+
+import botocore.session
+
+from src.data_ingestion.data_processing import load_column_type_mappings
+from src.data_ingestion.instrumentation import NullPipelineMetrics, PipelineMetrics
+from src.models.capacity import WriteRateLimiter
+
+if TYPE_CHECKING:
+    from src.data_ingestion.writer_pool import VesselWriterPool
+
+
+class RuntimeContext:
+    """
+    Process-wide state of the data-ingestion lambda, kept across warm invocations
+
+    Holds the parsed column type mappings, settings read from the
+    environment, AWS clients, the write rate limiter and the pipeline metrics
+    of the current invocation. AWS clients are created on first use.
+    """
+
+    def __init__(self) -> None:
+        started = time.perf_counter()
+
+        self.column_type_mappings = load_column_type_mappings()
+
+        self.cleaning_engine = os.environ.get("CLEANING_ENGINE", "row")
+        self.validation_engine = os.environ.get("VALIDATION_ENGINE", "pydantic")
+        self.ingestion_mode = os.environ.get("INGESTION_MODE", "single")
+        self.fan_out_ranges = int(os.environ.get("FAN_OUT_RANGES", "4"))
+        self.fan_out_executor = os.environ.get("FAN_OUT_EXECUTOR", "lambda")
+        self.skip_unchanged_items = (
+            os.environ.get("SKIP_UNCHANGED_ITEMS", "true").lower() == "true"
+        )
+        self.writer_threads = int(os.environ.get("WRITER_THREADS", "4"))
+        self.writer_max_pending_batches = int(
+            os.environ.get("WRITER_MAX_PENDING_BATCHES", "8")
+        )
+        self.checkpoint_reserve_ms = int(
+            os.environ.get("CHECKPOINT_RESERVE_MS", "8000")
+        )
+        self.pipeline_metrics_enabled = (
+            os.environ.get("PIPELINE_METRICS", "false").lower() == "true"
+        )
+        self.metrics_namespace = os.environ.get("METRICS_NAMESPACE", "shipping-api")
+        self.write_capacity_units = float(os.environ.get("WRITE_CAPACITY_UNITS", "200"))
+        self.write_rate_limiter = WriteRateLimiter(max_rate=self.write_capacity_units)
+
+        self.invocations = 0
+        self.pipeline_metrics: PipelineMetrics = NullPipelineMetrics()
+        # Writer pool of the vessel items being written, if any
+        self.writer_pool: Optional["VesselWriterPool"] = None
+        self.init_duration_ms = (time.perf_counter() - started) * 1000
+
+    def reset_pipeline_metrics(self) -> PipelineMetrics:
+        """Start recording the pipeline metrics of a new invocation"""
+        self.pipeline_metrics = (
+            PipelineMetrics()
+            if self.pipeline_metrics_enabled
+            else NullPipelineMetrics()
+        )
+        return self.pipeline_metrics
+
+    def get_write_drain_ms(self) -> float:
+        """Estimated time to write the vessel items still in the writer pool"""
+        if self.writer_pool is None:
+            return 0.0
+        return self.writer_pool.get_drain_ms()
+
+    def set_write_capacity(self, units: float) -> WriteRateLimiter:
+        """Limit writes to `units` write capacity units per second
+
+        Fan-out workers each get a share of the table's write capacity. The
+        limiter is only replaced when the limit changes, so warm invocations
+        keep its rate.
+        """
+        if self.write_rate_limiter.max_rate != units:
+            self.write_rate_limiter = WriteRateLimiter(max_rate=units)
+        return self.write_rate_limiter
+
+    @cached_property
+    def botocore_session(self) -> botocore.session.Session:
+        # Clients are created from botocore directly, as importing boto3 also
+        # imports s3transfer and multiprocessing, which the lambda never uses
+        return botocore.session.get_session()
+
+    @cached_property
+    def s3_client(self) -> Any:
+        return self.botocore_session.create_client("s3")
+
+    @cached_property
+    def lambda_client(self) -> Any:
+        return self.botocore_session.create_client("lambda")
+
+
+@lru_cache(maxsize=None)
+def get_runtime_context() -> RuntimeContext:
+    return RuntimeContext()
+
+
+def reset_runtime_context() -> None:
+    """Drop the runtime context, so the next invocation starts cold"""
+    get_runtime_context.cache_clear()
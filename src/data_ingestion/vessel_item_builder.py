@@ -0,0 +1,332 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+METRIC_TONNE = "metric tonne"
+KILOGRAM_PER_NAUTICAL_MILE = "kilogram / nautical mile"
+GRAM_PER_TONNE_NAUTICAL_MILE = "gram / (metric tonne * nautical mile)"
+GRAM_PER_CUBIC_METRE_NAUTICAL_MILE = "gram / (meter^3 * nautical mile)"
+HOUR = "hour"
+NAUTICAL_MILE = "nautical mile"
+METRIC_TONNE_PER_CUBIC_METRE = "metric tonne / meter^3"
+
+
+class VesselItemField(NamedTuple):
+    """
+    Maps a column of the cleaned vessel data to a field of the vessel item
+
+    Fields with a unit or a description are built as a dictionary holding the
+    value next to them, other fields hold the value itself.
+    """
+
+    path: str
+    column: str
+    unit: Optional[str] = None
+    description: Optional[str] = None
+
+
+VESSEL_ITEM_FIELDS: List[VesselItemField] = [
+    VesselItemField("imo_number", "imo_number"),
+    VesselItemField("name", "name"),
+    VesselItemField("ship_type", "ship_type"),
+    VesselItemField("reporting_period", "reporting_period"),
+    VesselItemField("technical_efficiency", "technical_efficiency"),
+    VesselItemField("port_of_registry", "port_of_registry"),
+    VesselItemField("home_port", "home_port"),
+    VesselItemField("ice_class", "ice_class"),
+    VesselItemField("doc_issue_date", "doc_issue_date"),
+    VesselItemField("doc_expiry_date", "doc_expiry_date"),
+    VesselItemField("verifier_details.verifier_number", "verifier_number"),
+    VesselItemField("verifier_details.verifier_name", "verifier_name"),
+    VesselItemField("verifier_details.verifier_accreditation_body", "verifier_nab"),
+    VesselItemField("verifier_details.verifier_address", "verifier_address"),
+    VesselItemField("verifier_details.verifier_city", "verifier_city"),
+    VesselItemField(
+        "verifier_details.verifier_accreditation_number",
+        "verifier_accreditation_number",
+    ),
+    VesselItemField("verifier_details.verifier_country", "verifier_country"),
+    VesselItemField(
+        "monitoring_methods.a",
+        "a",
+        description="BDN and period stock takes of fuel tanks",
+    ),
+    VesselItemField(
+        "monitoring_methods.b", "b", description="Bunker fuel tank monitoring on-board"
+    ),
+    VesselItemField(
+        "monitoring_methods.c",
+        "c",
+        description="Flow meters for applicable combustion processes",
+    ),
+    VesselItemField(
+        "monitoring_methods.d", "d", description="Direct CO2 emissions measurement"
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.total",
+        "total_fuel_consumption_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_distance",
+        "annual_average_fuel_consumption_per_distance_kg_n_mile",
+        KILOGRAM_PER_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_transport_work.mass",
+        "annual_average_fuel_consumption_per_transport_work_mass_g_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_transport_work.volume",
+        "annual_average_fuel_consumption_per_transport_work_volume_g_m_n_miles",
+        GRAM_PER_CUBIC_METRE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_transport_work.deadweight_tonnage",
+        "annual_average_fuel_consumption_per_transport_work_dwt_g_dwt_carried_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_transport_work.passengers",
+        "annual_average_fuel_consumption_per_transport_work_pax_g_pax_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.all_voyages.annual_average.per_transport_work.freight",
+        "fuel_consumption_per_transport_work_freight_on_laden_voyages_g_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.total",
+        "fuel_consumptions_assigned_to_on_laden_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_distance",
+        "fuel_consumption_per_distance_on_laden_voyages_kg_n_mile",
+        KILOGRAM_PER_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_transport_work.mass",
+        "fuel_consumption_per_transport_work_mass_on_laden_voyages_g_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_transport_work.volume",
+        "fuel_consumption_per_transport_work_volume_on_laden_voyages_g_m_n_miles",
+        GRAM_PER_CUBIC_METRE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_transport_work.deadweight_tonnage",
+        "fuel_consumption_per_transport_work_dwt_on_laden_voyages_g_dwt_carried_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_transport_work.passengers",
+        "fuel_consumption_per_transport_work_pax_on_laden_voyages_g_pax_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "fuel_consumption_metrics.laden_voyages.per_transport_work.freight",
+        "fuel_consumption_per_transport_work_pax_on_laden_voyages_g_pax_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.total",
+        "total_co_emissions_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.between_ports",
+        "co_emissions_from_all_voyages_between_ports_under_a_ms_jurisdiction_m_tonnes",
+        METRIC_TONNE,
+        description="CO2 emissions from all voyages between ports under a Member State jurisdiction",
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.departed_from_ports",
+        "co_emissions_from_all_voyages_which_departed_from_ports_under_a_ms_jurisdiction_m_tonnes",
+        METRIC_TONNE,
+        description="CO2 emissions from all voyages which departed from ports under a Member State jurisdiction",
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.to_ports",
+        "co_emissions_from_all_voyages_to_ports_under_a_ms_jurisdiction_m_tonnes",
+        METRIC_TONNE,
+        description="CO2 emissions from all voyages to ports under a Member State jurisdiction",
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.within_ports_at_berth",
+        "co_emissions_which_occurred_within_ports_under_a_ms_jurisdiction_at_berth_m_tonnes",
+        METRIC_TONNE,
+        description="CO2 emissions which occurred within ports under a Member State jurisdiction at berth",
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.passenger_transport",
+        "co_emissions_assigned_to_passenger_transport_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.freight_transport",
+        "co_emissions_assigned_to_freight_transport_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_distance",
+        "annual_average_co_emissions_per_distance_kg_co_n_mile",
+        KILOGRAM_PER_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_transport_work.mass",
+        "annual_average_co_emissions_per_transport_work_mass_g_co_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_transport_work.volume",
+        "annual_average_co_emissions_per_transport_work_volume_g_co_m_n_miles",
+        GRAM_PER_CUBIC_METRE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_transport_work.deadweight_tonnage",
+        "annual_average_co_emissions_per_transport_work_dwt_g_co_dwt_carried_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_transport_work.passengers",
+        "annual_average_co_emissions_per_transport_work_pax_g_co_pax_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.all_voyages.annual_average.per_transport_work.freight",
+        "annual_average_co_emissions_per_transport_work_freight_g_co_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.total",
+        "co_emissions_assigned_to_on_laden_m_tonnes",
+        METRIC_TONNE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_distance",
+        "co_emissions_per_distance_on_laden_voyages_kg_co_n_mile",
+        KILOGRAM_PER_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_transport_work.mass",
+        "co_emissions_per_transport_work_mass_on_laden_voyages_g_co_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_transport_work.volume",
+        "co_emissions_per_transport_work_volume_on_laden_voyages_g_co_m_n_miles",
+        GRAM_PER_CUBIC_METRE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_transport_work.deadweight_tonnage",
+        "co_emissions_per_transport_work_dwt_on_laden_voyages_g_co_dwt_carried_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_transport_work.passengers",
+        "co_emissions_per_transport_work_pax_on_laden_voyages_g_co_pax_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "co2_emissions_metrics.laden_voyages.per_transport_work.freight",
+        "co_emissions_per_transport_work_freight_on_laden_voyages_g_co_m_tonnes_n_miles",
+        GRAM_PER_TONNE_NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "time_metrics.annual_total_time_spent_at_sea",
+        "annual_total_time_spent_at_sea_hours",
+        HOUR,
+    ),
+    VesselItemField(
+        "time_metrics.total_time_spent_at_sea", "total_time_spent_at_sea_hours", HOUR
+    ),
+    VesselItemField(
+        "time_metrics.total_time_spent_at_sea_through_ice",
+        "total_time_spent_at_sea_through_ice_hours",
+        HOUR,
+    ),
+    VesselItemField(
+        "distance_metrics.distance_travelled_through_ice",
+        "through_ice_n_miles",
+        NAUTICAL_MILE,
+    ),
+    VesselItemField(
+        "density_metrics.average_cargo_density",
+        "average_density_of_the_cargo_transported_m_tonnes_m",
+        METRIC_TONNE_PER_CUBIC_METRE,
+    ),
+    VesselItemField(
+        "additional_information",
+        "additional_information_to_facilitate_the_understanding_of_the_reported_average_operational_energy_efficiency_indicators",
+    ),
+]
+
+
+def render_value(field: VesselItemField, accessor: str) -> str:
+    if field.unit is None and field.description is None:
+        return accessor
+    parts = [f"'value': {accessor}"]
+    if field.unit is not None:
+        parts.append(f"'unit': {field.unit!r}")
+    if field.description is not None:
+        parts.append(f"'description': {field.description!r}")
+    return "{" + ", ".join(parts) + "}"
+
+
+def render_node(node: Dict[str, Any], get_accessor: Callable[[str], str]) -> str:
+    entries = []
+    for key, child in node.items():
+        if isinstance(child, VesselItemField):
+            rendered = render_value(child, get_accessor(child.column))
+        else:
+            rendered = render_node(child, get_accessor)
+        entries.append(f"{key!r}: {rendered}")
+    return "{" + ", ".join(entries) + "}"
+
+
+def compile_vessel_item_builder(
+    columns: Optional[Sequence[str]] = None,
+    fields: Sequence[VesselItemField] = tuple(VESSEL_ITEM_FIELDS),
+) -> Callable[[Any], dict]:
+    """Compile vessel item fields into a function which builds vessel items
+
+    The fields are turned into the source of a single function returning a
+    nested dictionary literal, so building an item costs no more than the
+    literal itself.
+
+    Args:
+        columns (Optional[Sequence[str]]): Column names of the rows the builder
+            will be given. Rows are then read by position, otherwise the builder
+            is given dictionaries and reads them by column name
+        fields (Sequence[VesselItemField]): Fields of the vessel item, in order
+
+    Raises:
+        KeyError: If a field's column is not one of the columns
+
+    Returns:
+        Callable[[Any], dict]: Vessel item builder, taking a dictionary or a
+        sequence of values depending on columns
+    """
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        *parents, name = field.path.split(".")
+        node = tree
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[name] = field
+
+    indexes = {column: index for index, column in enumerate(columns or [])}
+
+    def get_accessor(column: str) -> str:
+        if columns is None:
+            return f"row[{column!r}]"
+        return f"row[{indexes[column]}]"
+
+    source = (
+        f"def build_vessel_item(row):\n    return {render_node(tree, get_accessor)}\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<vessel_item_builder>", "exec"), namespace)  # nosec
+    return namespace["build_vessel_item"]
@@ -0,0 +1,162 @@
+import logging
+import queue
+import threading
+from types import TracebackType
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from src.models.capacity import WriteRateLimiter
+from src.models.pynamo_models import BatchWriteResult, VesselItemModel
+
+LOGGER = logging.getLogger()
+
+WriteBatch = Callable[[List[dict], Any], BatchWriteResult]
+CreateConnection = Callable[[], Any]
+
+
+class VesselWriterPool:
+    """
+    Writes batches of vessel items to DynamoDB from a pool of worker threads
+
+    Batches are handed to the workers through a bounded queue, so submit
+    blocks while max_pending batches are waiting to be written. This keeps
+    memory bounded while the calling thread carries on parsing and cleaning
+    rows. Each worker owns the connection returned by create_connection, its
+    own table connection by default, and hands it to write_batch. Batches are
+    numbered in the order they are submitted, and first_failed_batch is the
+    number of the first one with items which could not be written. With the
+    rate limiter the batches are written under, get_drain_ms estimates how
+    long the batches not written yet will take.
+    """
+
+    def __init__(
+        self,
+        write_batch: WriteBatch,
+        workers: int = 4,
+        max_pending: int = 8,
+        create_connection: Optional[CreateConnection] = None,
+        rate_limiter: Optional[WriteRateLimiter] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("A writer pool needs at least one worker")
+
+        self.write_batch = write_batch
+        self.create_connection = create_connection or VesselItemModel.create_connection
+        self.rate_limiter = rate_limiter
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.skipped = 0
+        self.changed = 0
+        self.superseded = 0
+        self.first_failed_batch: Optional[int] = None
+
+        self._submitted = 0
+        self._pending_items = 0
+        self._finished_items = 0
+        self._consumed_units = rate_limiter.consumed_units if rate_limiter else 0.0
+        self._queue: "queue.Queue[Optional[Tuple[int, List[dict]]]]" = queue.Queue(
+            max_pending
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"vessel-writer-{number}")
+            for number in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "VesselWriterPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def submit(self, batch: List[dict]) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot submit a batch to a closed writer pool")
+        with self._lock:
+            self._pending_items += len(batch)
+        self._queue.put((self._submitted, batch))
+        self._submitted += 1
+
+    def get_drain_ms(self) -> float:
+        """Estimate how long the items submitted and not written yet will take
+
+        Each pending item is assumed to consume as many write capacity units
+        as the items the pool has finished so far, or one before any has
+        finished, at the current rate of the rate limiter.
+
+        Returns:
+            float: Milliseconds to write the pending items, 0 without a rate
+            limiter
+        """
+        if self.rate_limiter is None:
+            return 0.0
+        with self._lock:
+            pending_items = self._pending_items
+            finished_items = self._finished_items
+        consumed_units = self.rate_limiter.consumed_units - self._consumed_units
+        units_per_item = consumed_units / finished_items if finished_items else 1.0
+        return pending_items * units_per_item / self.rate_limiter.rate * 1000
+
+    def close(self) -> BatchWriteResult:
+        """Wait for all submitted batches to be written and stop the workers
+
+        Returns:
+            BatchWriteResult: Total number of items written, failed, skipped,
+            changed and superseded
+        """
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+        return BatchWriteResult(
+            written=self.written,
+            failed=self.failed,
+            skipped=self.skipped,
+            changed=self.changed,
+            superseded=self.superseded,
+        )
+
+    def _work(self) -> None:
+        connection: Any = None
+        connected = False
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            number, batch = task
+            try:
+                if not connected:
+                    connection = self.create_connection()
+                    connected = True
+                result = self.write_batch(batch, connection)
+            except Exception as error:
+                LOGGER.error(
+                    {
+                        "message": "Error when writing batch to DynamoDB",
+                        "content": error,
+                    }
+                )
+                result = BatchWriteResult(written=0, failed=len(batch))
+            with self._lock:
+                self._pending_items -= len(batch)
+                self._finished_items += len(batch)
+                self.batches += 1
+                self.written += result.written
+                self.failed += result.failed
+                self.skipped += result.skipped
+                self.changed += result.changed
+                self.superseded += result.superseded
+                if result.failed and (
+                    self.first_failed_batch is None or number < self.first_failed_batch
+                ):
+                    self.first_failed_batch = number
@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+WRITE_UNIT_SIZE = 1024
+THROTTLING_ERROR_CODES = (
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+)
+
+
+def estimate_attribute_size(attribute_value: dict) -> int:
+    """Estimate the stored size in bytes of a serialized DynamoDB attribute value
+
+    Follows the DynamoDB item size rules: strings count their UTF-8 bytes,
+    numbers roughly one byte per two significant digits plus one, and maps and
+    lists three bytes plus one byte per element on top of their contents.
+    """
+    ((attribute_type, value),) = attribute_value.items()
+    if attribute_type == "S":
+        return len(value.encode("utf-8"))
+    if attribute_type == "N":
+        significant_digits = len(value.lstrip("-").replace(".", "").strip("0")) or 1
+        return (significant_digits + 1) // 2 + 1
+    if attribute_type == "M":
+        return 3 + sum(
+            len(name.encode("utf-8")) + estimate_attribute_size(element) + 1
+            for name, element in value.items()
+        )
+    if attribute_type == "L":
+        return 3 + sum(estimate_attribute_size(element) + 1 for element in value)
+    return 1
+
+
+def estimate_write_units(item: dict) -> int:
+    """Estimate the write capacity units needed to put a serialized item
+
+    Args:
+        item (dict): Item as returned by Model.serialize
+
+    Returns:
+        int: Write capacity units, one per started kilobyte
+    """
+    size = sum(
+        len(name.encode("utf-8")) + estimate_attribute_size(attribute_value)
+        for name, attribute_value in item.items()
+    )
+    return max(1, math.ceil(size / WRITE_UNIT_SIZE))
+
+
+def get_consumed_capacity(data: dict, table_name: str) -> Optional[float]:
+    """Capacity units consumed by a table itself, leaving out its indexes
+
+    Responses to requests with ReturnConsumedCapacity INDEXES break down the
+    units by table and index, and their CapacityUnits total includes the
+    writes to global secondary indexes, which have their own capacity.
+    """
+    consumed_capacity: Iterable[dict] = data.get("ConsumedCapacity") or []
+    for capacity in consumed_capacity:
+        if capacity.get("TableName") == table_name:
+            return capacity.get("Table", capacity).get("CapacityUnits")
+    return None
+
+
+class WriteRateLimiter:
+    """
+    Token bucket limiting write capacity units per second, shared by threads
+
+    Writers acquire their estimated units before each request and report
+    the capacity actually consumed afterwards. The refill rate follows AIMD:
+    it grows by `increase` units per second after each unthrottled request up
+    to `max_rate`, and is multiplied by `decrease` whenever DynamoDB throttles
+    a request, down to `min_rate`.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 5.0,
+        increase: float = 5.0,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.rate = max_rate
+        self.tokens = max_rate
+        self.consumed_units = 0.0
+        self.throttles = 0
+
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float) -> None:
+        """Block until `units` write capacity units are available and take them
+
+        Requests larger than one second of capacity wait for a full bucket and
+        leave it in debt, so they are never starved.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                needed = min(units, self.rate)
+                if self.tokens >= needed:
+                    self.tokens -= units
+                    return
+                wait = (needed - self.tokens) / self.rate
+            self._sleep(wait)
+
+    def record_write(
+        self, estimated_units: float, consumed_units: Optional[float], throttled: bool
+    ) -> None:
+        with self._lock:
+            if consumed_units is not None:
+                self.consumed_units += consumed_units
+                self.tokens -= consumed_units - estimated_units
+            else:
+                self.consumed_units += estimated_units
+            if throttled:
+                self._throttle()
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self._throttle()
+
+    def _throttle(self) -> None:
+        self.throttles += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = min(self.tokens, self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.rate, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
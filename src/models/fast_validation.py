@@ -0,0 +1,185 @@
+import re
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel, Extra
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+from src.models.pydantic_models import (
+    IMO_NUMBER_PATTERN,
+    VesselItem,
+    model_to_primitive_dict,
+)
+
+ISO_DATE_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}\Z")
+
+FieldValidator = Callable[[Any], Any]
+
+
+class NotFastValidated(Exception):
+    """Raised when a fast validator cannot vouch for a value"""
+
+
+def validate_str(value: Any) -> str:
+    if type(value) is str:
+        return value
+    raise NotFastValidated
+
+
+def validate_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    raise NotFastValidated
+
+
+def validate_float(value: Any) -> float:
+    if type(value) is float:
+        return value
+    raise NotFastValidated
+
+
+def validate_date(value: Any) -> str:
+    if type(value) is date:
+        return value.isoformat()
+    if type(value) is str and ISO_DATE_PATTERN.match(value):
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            pass
+    raise NotFastValidated
+
+
+TYPE_VALIDATORS: Dict[type, FieldValidator] = {
+    str: validate_str,
+    int: validate_int,
+    float: validate_float,
+    date: validate_date,
+}
+
+
+def compile_enum_validator(enum: Type[Enum]) -> FieldValidator:
+    values = frozenset(member.value for member in enum if type(member.value) is str)
+
+    def validate_enum(value: Any) -> Any:
+        if type(value) is str and value in values:
+            return value
+        if isinstance(value, enum):
+            return value.value
+        raise NotFastValidated
+
+    return validate_enum
+
+
+def compile_field_validator(
+    field: ModelField, check: Optional[Callable[[Any], Any]] = None
+) -> FieldValidator:
+    field_type = field.type_
+    if field.shape != SHAPE_SINGLETON or not isinstance(field_type, type):
+        raise TypeError(f"Field {field.name} has an unsupported type")
+
+    validate: FieldValidator
+    if issubclass(field_type, BaseModel):
+        validate = compile_model_validator(field_type)
+    elif issubclass(field_type, Enum):
+        validate = compile_enum_validator(field_type)
+    elif field_type in TYPE_VALIDATORS:
+        validate = TYPE_VALIDATORS[field_type]
+    else:
+        raise TypeError(f"Field {field.name} has an unsupported type")
+
+    if check is not None:
+        validate_type = validate
+
+        def validate(value: Any) -> Any:
+            value = validate_type(value)
+            if not check(value):
+                raise NotFastValidated
+            return value
+
+    if field.allow_none:
+        validate_not_none = validate
+
+        def validate(value: Any) -> Any:
+            if value is None:
+                return None
+            return validate_not_none(value)
+
+    return validate
+
+
+def compile_model_validator(
+    model: Type[BaseModel],
+    checks: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+) -> FieldValidator:
+    """Compile a validator for dictionaries of a Pydantic model from its fields
+
+    The compiled validator returns the dictionary as JSON compatible
+    primitives, the same as model_to_primitive_dict(model(**value)), for
+    values that need no coercion: fields of their declared type, enum values,
+    ISO formatted dates and nested dictionaries. For anything else it raises
+    NotFastValidated, whether or not Pydantic would accept the value.
+
+    Args:
+        model (Type[BaseModel]): Pydantic model
+        checks (Optional[Mapping[str, Callable[[Any], Any]]]): Checks standing
+            in for the model's validators, by field name. A value is accepted
+            if its check returns a truthy value
+
+    Returns:
+        FieldValidator: Validator for dictionaries of the model
+    """
+    checks = checks or {}
+    if (
+        set(model.__validators__) - set(checks)
+        or model.__pre_root_validators__
+        or model.__post_root_validators__
+        or model.__config__.extra is not Extra.ignore
+    ):
+        raise TypeError(f"{model.__name__} has validation without a fast check")
+
+    fields: List[Tuple[str, str, bool, FieldValidator]] = [
+        (
+            field.name,
+            field.alias,
+            field.required is True,
+            compile_field_validator(field, checks.get(field.name)),
+        )
+        for field in model.__fields__.values()
+    ]
+    for field in model.__fields__.values():
+        if field.required is not True and field.default is not None:
+            raise TypeError(f"Field {field.name} has an unsupported default")
+
+    def validate_model(value: Any) -> dict:
+        if type(value) is not dict:
+            raise NotFastValidated
+        validated = {}
+        for name, alias, required, validate in fields:
+            if alias in value:
+                validated[name] = validate(value[alias])
+            elif required:
+                raise NotFastValidated
+            else:
+                validated[name] = None
+        return validated
+
+    return validate_model
+
+
+fast_validate_vessel_item = compile_model_validator(
+    VesselItem, {"imo_number": IMO_NUMBER_PATTERN.match}
+)
+
+
+def validate_vessel_item(vessel_item: dict) -> dict:
+    """Validate a vessel item and return it as JSON compatible primitives
+
+    Items the fast validator accepts skip building the VesselItem model. All
+    other items are validated by VesselItem, so invalid items raise the same
+    ValidationError as before.
+    """
+    try:
+        return fast_validate_vessel_item(vessel_item)
+    except NotFastValidated:
+        return model_to_primitive_dict(VesselItem(**vessel_item))
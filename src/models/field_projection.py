@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import ModelField
+
+from src.models.pydantic_models import VesselItem, to_primitive
+
+
+class InvalidFieldPath(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def resolve_field_path(path: str) -> Tuple[Type[BaseModel], ModelField]:
+    """Find the field a dotted path of VesselItem field names points to
+
+    Args:
+        path (str): Field names separated by dots, eg.
+            co2_emissions_metrics.all_voyages.total
+
+    Raises:
+        InvalidFieldPath: If the path does not point to a field of VesselItem
+
+    Returns:
+        Tuple[Type[BaseModel], ModelField]: Model declaring the field and the
+        field
+    """
+    model: Type[BaseModel] = VesselItem
+    *parent_names, name = path.split(".")
+    for parent_name in parent_names:
+        parent_field = model.__fields__.get(parent_name)
+        if parent_field is None or not (
+            isinstance(parent_field.type_, type)
+            and issubclass(parent_field.type_, BaseModel)
+        ):
+            raise InvalidFieldPath(path)
+        model = parent_field.type_
+
+    field = model.__fields__.get(name)
+    if field is None:
+        raise InvalidFieldPath(path)
+    return model, field
+
+
+def normalise_field_paths(paths: Iterable[str]) -> List[str]:
+    """Check field paths, dropping duplicates and paths inside other paths
+
+    DynamoDB rejects projection expressions with overlapping paths.
+
+    Raises:
+        InvalidFieldPath: If a path does not point to a field of VesselItem
+    """
+    unique_paths = list(dict.fromkeys(paths))
+    for path in unique_paths:
+        resolve_field_path(path)
+    return [
+        path
+        for path in unique_paths
+        if not any(path.startswith(f"{other_path}.") for other_path in unique_paths)
+    ]
+
+
+def get_path_value(dictionary: dict, names: Sequence[str]) -> Any:
+    value: Any = dictionary
+    for name in names:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def project_vessel_item(vessel_item: dict, paths: Sequence[str]) -> dict:
+    """Validate and export the fields of a vessel item at the given paths
+
+    Only the subtrees at the paths are validated, by the fields of the
+    VesselItem models they point to, so items read with a projection do not
+    need to be complete.
+
+    Args:
+        vessel_item (dict): Vessel item, usually read with a projection
+        paths (Sequence[str]): Dotted paths of VesselItem field names
+
+    Raises:
+        ValidationError: If a subtree is not valid
+
+    Returns:
+        dict: Nested dictionary holding only the validated subtrees, as JSON
+        compatible primitives
+    """
+    projected: dict = {}
+    errors = []
+    for path in paths:
+        model, field = resolve_field_path(path)
+        names = path.split(".")
+        value, error = field.validate(
+            get_path_value(vessel_item, names), {}, loc=tuple(names), cls=model
+        )
+        if error:
+            errors.append(error)
+            continue
+
+        parent = projected
+        for name in names[:-1]:
+            parent = parent.setdefault(name, {})
+        parent[names[-1]] = to_primitive(value)
+
+    if errors:
+        raise ValidationError(errors, VesselItem)
+    return projected
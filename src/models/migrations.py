@@ -0,0 +1,139 @@
+"""Migrations of the items in the shipping-data table
+
+Run from the root directory with AWS credentials for the table, eg.
+
+python -m src.models.migrations backfill-imo-number-index
+python -m src.models.migrations shard-partition-keys
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from pynamodb.exceptions import UpdateError
+
+from src.models.pynamo_models import (
+    LEGACY_PARTITION_KEY,
+    PARTITION_KEY_PREFIX,
+    VesselItemModel,
+    get_imo_number_index_hash_key,
+    get_imo_number_index_range_key,
+    get_partition_key,
+)
+
+LOGGER = logging.getLogger()
+LOGGER.setLevel(logging.INFO)
+
+
+def backfill_imo_number_index(read_rate_limit: Optional[float] = None) -> int:
+    """Add the IMO number index keys to vessel items written before the index
+
+    Items which already have the keys are skipped, so the backfill can be
+    stopped and run again.
+
+    Args:
+        read_rate_limit (Optional[float]): Read capacity units per second
+            the scan may consume
+
+    Returns:
+        int: Number of vessel items updated
+    """
+    updated = 0
+    vessel_items = VesselItemModel.scan(
+        filter_condition=VesselItemModel.pk.startswith(PARTITION_KEY_PREFIX)
+        & VesselItemModel.gsi1pk.does_not_exist(),
+        attributes_to_get=["PK", "SK", "imo_number", "reporting_period"],
+        rate_limit=read_rate_limit,
+    )
+    for vessel_item in vessel_items:
+        try:
+            vessel_item.update(
+                actions=[
+                    VesselItemModel.gsi1pk.set(
+                        get_imo_number_index_hash_key(vessel_item.imo_number)
+                    ),
+                    VesselItemModel.gsi1sk.set(
+                        get_imo_number_index_range_key(vessel_item.reporting_period)
+                    ),
+                ],
+                condition=VesselItemModel.pk.exists(),
+            )
+            updated += 1
+        except UpdateError as error:
+            LOGGER.warning(
+                {
+                    "message": "Vessel item could not be updated",
+                    "content": {"sk": vessel_item.sk, "error": str(error)},
+                }
+            )
+    return updated
+
+
+def shard_partition_keys(read_rate_limit: Optional[float] = None) -> int:
+    """Move vessel items from the single legacy partition key to its shards
+
+    A BatchWriteItem request is not atomic, so all vessel items are first
+    written under their sharded partition keys, and their legacy items are
+    only deleted once every write has succeeded. The migration can be stopped
+    and run again, and the REST API reads the legacy items until it has run,
+    see VesselItemModel.read_vessel_item.
+
+    Args:
+        read_rate_limit (Optional[float]): Read capacity units per second
+            the query may consume
+
+    Raises:
+        PutError: If vessel items are unprocessed after the last attempt, in
+            which case no legacy item has been deleted
+
+    Returns:
+        int: Number of vessel items moved
+    """
+    sort_keys = []
+    vessel_items = VesselItemModel.query(
+        LEGACY_PARTITION_KEY, rate_limit=read_rate_limit
+    )
+    with VesselItemModel.batch_write() as batch:
+        for vessel_item in vessel_items:
+            sort_keys.append(vessel_item.sk)
+            vessel_item.pk = get_partition_key(vessel_item.imo_number)
+            batch.save(vessel_item)
+
+    with VesselItemModel.batch_write() as batch:
+        for sort_key in sort_keys:
+            batch.delete(VesselItemModel(LEGACY_PARTITION_KEY, sort_key))
+    return len(sort_keys)
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrations of the items in the shipping-data table"
+    )
+    subparsers = parser.add_subparsers(dest="migration", required=True)
+    backfill_parser = subparsers.add_parser(
+        "backfill-imo-number-index",
+        help="Add the IMO number index keys to existing vessel items",
+    )
+    shard_parser = subparsers.add_parser(
+        "shard-partition-keys",
+        help="Move vessel items from the legacy partition key to its shards",
+    )
+    for subparser in (backfill_parser, shard_parser):
+        subparser.add_argument(
+            "--read-rate-limit",
+            type=float,
+            help="Read capacity units per second the migration may consume",
+        )
+    parsed_arguments = parser.parse_args(arguments)
+
+    logging.basicConfig()
+    if parsed_arguments.migration == "shard-partition-keys":
+        moved = shard_partition_keys(parsed_arguments.read_rate_limit)
+        LOGGER.info({"message": "Sharded partition keys", "content": moved})
+    else:
+        updated = backfill_imo_number_index(parsed_arguments.read_rate_limit)
+        LOGGER.info({"message": "Backfilled IMO number index", "content": updated})
+
+
+if __name__ == "__main__":
+    main()
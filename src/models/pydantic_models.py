@@ -1,10 +1,12 @@
 import re
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, validator
 
+IMO_NUMBER_PATTERN = re.compile(r"^\d{7}$")
+
 
 class Unit(Enum):
     nautical_mile = "nautical mile"
@@ -146,6 +148,34 @@ class VesselItem(BaseModel):
     @validator("imo_number")
     @classmethod
     def imo_number_7_digits(cls, value: str) -> Optional[str]:
-        if not re.match(r"^\d{7}$", value):
+        if not IMO_NUMBER_PATTERN.match(value):
             raise ValueError("IMO Number must be 7 digits long")
         return value
+
+
+PRIMITIVE_TYPES = (str, int, float, bool)
+
+
+def to_primitive(value: Any) -> Any:
+    """Convert a value held by a model into JSON compatible Python primitives
+
+    Gives the same result as json.loads(model.json()) for the types used by
+    the models in this module, without serialising to a JSON string.
+    """
+    if value is None or type(value) in PRIMITIVE_TYPES:
+        return value
+    if isinstance(value, BaseModel):
+        return {name: to_primitive(field) for name, field in value.__dict__.items()}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: to_primitive(element) for key, element in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_primitive(element) for element in value]
+    return value
+
+
+def model_to_primitive_dict(model: BaseModel) -> dict:
+    return to_primitive(model)
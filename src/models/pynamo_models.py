@@ -1,28 +1,157 @@
+import hashlib
 import json
+import math
 import os
+import random
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Union
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from pynamodb.attributes import MapAttribute, NumberAttribute, UnicodeAttribute
-from pynamodb.exceptions import PutError
+from pynamodb.attributes import (
+    ListAttribute,
+    MapAttribute,
+    NumberAttribute,
+    UnicodeAttribute,
+)
+from pynamodb.connection import TableConnection
+from pynamodb.exceptions import GetError, PutError
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 from pynamodb.models import Model
 
-from src.models.pydantic_models import VesselItem
+from src.models.capacity import (
+    THROTTLING_ERROR_CODES,
+    WriteRateLimiter,
+    estimate_write_units,
+    get_consumed_capacity,
+)
+from src.models.field_projection import project_vessel_item
+from src.models.pydantic_models import VesselItem, model_to_primitive_dict
+
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_ATTEMPTS = 5
+BATCH_WRITE_BASE_BACKOFF_MS = 50
+BATCH_GET_SIZE = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_GET_BASE_BACKOFF_MS = 50
+
+# The lambdas always set AWS_REGION, local tools may not
+DEFAULT_REGION = "eu-west-2"
+
+PARTITION_KEY_PREFIX = "EU_MRV_EMISSIONS_DATA"
+PARTITION_KEY_SHARDS = 10
+# Vessel items were kept under a single partition key before it was sharded,
+# see migrations.shard_partition_keys
+LEGACY_PARTITION_KEY = PARTITION_KEY_PREFIX
+CHECKPOINT_PARTITION_KEY = "INGESTION_CHECKPOINT"
+BYTE_RANGE_PARTITION_KEY = "INGESTION_BYTE_RANGE"
+
+LastEvaluatedKey = Dict[str, Dict[str, Any]]
+
+
+def get_projection(
+    attributes_to_get: Optional[Sequence[str]], key_attributes: Sequence[str] = ()
+) -> Optional[List[str]]:
+    """Attributes to read as a list, the only sequence pynamodb accepts"""
+    if attributes_to_get is None:
+        return None
+    return list(dict.fromkeys([*attributes_to_get, *key_attributes]))
+
+
+def get_shard(imo_number: Any) -> int:
+    return zlib.crc32(str(imo_number).encode("utf-8")) % PARTITION_KEY_SHARDS
+
+
+def get_partition_key(imo_number: Any) -> str:
+    """Partition key of a vessel item, one of PARTITION_KEY_SHARDS shards
+
+    The shard is derived from the IMO number, so writes and reads of the
+    data set are spread over several partition keys.
+    """
+    return f"{PARTITION_KEY_PREFIX}#{get_shard(imo_number)}"
+
+
+def get_partition_keys() -> List[str]:
+    return [f"{PARTITION_KEY_PREFIX}#{shard}" for shard in range(PARTITION_KEY_SHARDS)]
+
+
+def get_sort_key_prefix(reporting_period: Any) -> str:
+    return f"REPORTING_PERIOD#{reporting_period}#"
+
+
+def get_sort_key(reporting_period: Any, imo_number: Any) -> str:
+    return f"{get_sort_key_prefix(reporting_period)}IMO_NUMBER#{imo_number}"
+
+
+def get_imo_number_index_hash_key(imo_number: Any) -> str:
+    return f"IMO_NUMBER#{imo_number}"
+
+
+def get_imo_number_index_range_key(reporting_period: Any) -> str:
+    return f"REPORTING_PERIOD#{reporting_period}"
+
+
+def get_content_hash(item: dict) -> str:
+    """SHA-256 of a validated vessel item, independent of the order of its keys"""
+    content = json.dumps(item, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
 class VesselItemNotFound(Exception):
     pass
 
 
+class VesselItemsUnavailable(Exception):
+    """Raised when keys are still unprocessed after the last BatchGetItem attempt"""
+
+
+class BatchWriteResult(NamedTuple):
+    written: int
+    failed: int
+    skipped: int = 0
+    changed: int = 0
+    superseded: int = 0
+
+
+class ImoNumberIndex(GlobalSecondaryIndex):
+    """
+    Index of the shipping-data table by IMO number, sorted by reporting period
+    """
+
+    class Meta:
+        index_name = "GSI1"
+        read_capacity_units = 50
+        write_capacity_units = 200
+        projection = AllProjection()
+
+    gsi1pk = UnicodeAttribute(hash_key=True, attr_name="GSI1PK")
+    gsi1sk = UnicodeAttribute(range_key=True, attr_name="GSI1SK")
+
+
 class ShippingData(Model):
     class Meta:
         table_name = "shipping-data"
-        region = os.environ["AWS_REGION"]
+        region = os.environ.get("AWS_REGION", DEFAULT_REGION)
+        host: Optional[str] = None
 
     pk = UnicodeAttribute(hash_key=True, attr_name="PK")
     sk = UnicodeAttribute(range_key=True, attr_name="SK")
+    gsi1pk = UnicodeAttribute(null=True, attr_name="GSI1PK")
+    gsi1sk = UnicodeAttribute(null=True, attr_name="GSI1SK")
 
     updated_date = UnicodeAttribute()
+    content_hash = UnicodeAttribute(null=True)
 
     imo_number = UnicodeAttribute()
     name = UnicodeAttribute()
@@ -49,6 +178,8 @@ class VesselItemModel(ShippingData):
     Pynamo model which writes and reads from shipping-data DynamoDB table
     """
 
+    imo_number_index = ImoNumberIndex()
+
     def convert_to_dictionary(self) -> dict:
 
         model_dictionary = self.attribute_values
@@ -58,35 +189,583 @@ class VesselItemModel(ShippingData):
 
         return model_dictionary
 
+    def to_vessel_item(self, field_paths: Optional[Sequence[str]] = None) -> dict:
+        """Convert a read item to a vessel item
+
+        Complete items are validated by VesselItem. Items read with a
+        projection are validated and exported only at the projected field
+        paths.
+        """
+        if field_paths is not None:
+            return project_vessel_item(self.convert_to_dictionary(), field_paths)
+        vessel_item_pydantic_model = VesselItem(**self.convert_to_dictionary())
+        return model_to_primitive_dict(vessel_item_pydantic_model)
+
     @classmethod
     def read_vessel_item(
-        cls, reporting_period: str, imo_number: str
-    ) -> Union[List[dict], None]:
-        try:
-            pk = "EU_MRV_EMISSIONS_DATA"
-            sk = f"REPORTING_PERIOD#{reporting_period}#IMO_NUMBER#{imo_number}"
+        cls,
+        reporting_period: str,
+        imo_number: str,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        legacy_fallback: bool = False,
+    ) -> dict:
+        """Read a vessel item with a GetItem request on its primary key
+
+        Args:
+            reporting_period (str): Reporting period of the vessel item
+            imo_number (str): IMO number of the vessel
+            consistent_read (bool): Use a strongly consistent read
+            attributes_to_get (Optional[Sequence[str]]): Dotted paths of the
+                VesselItem fields to read. Only these fields are validated
+            legacy_fallback (bool): Read the vessel item under the legacy
+                partition key when it is not under its shard, until the
+                shard-partition-keys migration has run
+
+        Raises:
+            VesselItemNotFound: If the vessel item does not exist
+
+        Returns:
+            dict: Vessel item
+        """
+        sort_key = get_sort_key(reporting_period, imo_number)
+        partition_keys = [get_partition_key(imo_number)]
+        if legacy_fallback:
+            partition_keys.append(LEGACY_PARTITION_KEY)
+        for partition_key in partition_keys:
+            try:
+                vessel_item = cls.get(
+                    partition_key,
+                    sort_key,
+                    consistent_read=consistent_read,
+                    attributes_to_get=get_projection(attributes_to_get),
+                )
+            except cls.DoesNotExist:
+                continue
+            return vessel_item.to_vessel_item(attributes_to_get)
+        raise VesselItemNotFound
+
+    @classmethod
+    def read_vessel_items(
+        cls,
+        keys: Sequence[Tuple[Any, Any]],
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        legacy_fallback: bool = False,
+    ) -> List[Optional[dict]]:
+        """Read vessel items with BatchGetItem requests of up to BATCH_GET_SIZE keys
+
+        Unprocessed keys are requested again with exponential backoff and full
+        jitter.
+
+        Args:
+            keys (Sequence[Tuple[Any, Any]]): Reporting periods and IMO numbers
+                of the vessel items
+            consistent_read (bool): Use strongly consistent reads
+            attributes_to_get (Optional[Sequence[str]]): Dotted paths of the
+                VesselItem fields to read. Only these fields are validated
+            legacy_fallback (bool): Read the vessel items which are not under
+                their shard again under the legacy partition key, until the
+                shard-partition-keys migration has run
+
+        Raises:
+            VesselItemsUnavailable: If keys are unprocessed after the last attempt
+
+        Returns:
+            List[Optional[dict]]: Vessel items in the order of the keys, None
+            for vessel items which were not found
+        """
+        sort_keys = [get_sort_key(*key) for key in keys]
+        partition_keys = {
+            sort_key: get_partition_key(imo_number)
+            for sort_key, (_, imo_number) in zip(sort_keys, keys)
+        }
+        vessel_items = cls._read_vessel_items_by_sort_key(
+            partition_keys, consistent_read, attributes_to_get
+        )
+        if legacy_fallback:
+            vessel_items.update(
+                cls._read_vessel_items_by_sort_key(
+                    {
+                        sort_key: LEGACY_PARTITION_KEY
+                        for sort_key in partition_keys
+                        if sort_key not in vessel_items
+                    },
+                    consistent_read,
+                    attributes_to_get,
+                )
+            )
+
+        return [vessel_items.get(sort_key) for sort_key in sort_keys]
+
+    @classmethod
+    def list_vessel_items(
+        cls,
+        reporting_period: Any,
+        limit: int,
+        cursor: Optional[Dict[str, Optional[LastEvaluatedKey]]] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[dict], Optional[Dict[str, Optional[LastEvaluatedKey]]]]:
+        """Read one page of the vessel items of a reporting period, by sort key
 
-            vessel_item = list(VesselItemModel.query(pk, VesselItemModel.sk == sk))[0]
+        Every partition key shard is queried in parallel on the sort key prefix
+        of the reporting period, for twice its even share of the page. The
+        results are merged by sort key, up to the smallest sort key a shard
+        with more items stopped at, so pages are in sort key order and may
+        hold fewer than `limit` vessel items before the last page.
+
+        Args:
+            reporting_period (Any): Reporting period of the vessel items
+            limit (int): Maximum number of vessel items in the page
+            cursor (Optional[Dict[str, Optional[LastEvaluatedKey]]]): Cursor
+                returned with the previous page
+            attributes_to_get (Optional[Sequence[str]]): Dotted paths of the
+                VesselItem fields to read. Only these fields are validated
+
+        Returns:
+            Tuple[List[dict], Optional[Dict[str, Optional[LastEvaluatedKey]]]]:
+            Vessel items and the cursor to read the next page from, None after
+            the last page. The cursor holds the key each shard was read up to,
+            None for shards which have been read completely
+        """
+        cursor = cursor or {}
+        shards = [
+            str(shard)
+            for shard in range(PARTITION_KEY_SHARDS)
+            if cursor.get(str(shard), {}) is not None
+        ]
+        shard_limit = 2 * math.ceil(limit / PARTITION_KEY_SHARDS)
+        projection = get_projection(attributes_to_get, ("PK", "SK"))
+
+        def query_shard(
+            shard: str,
+        ) -> Tuple[List[VesselItemModel], Optional[LastEvaluatedKey]]:
+            results = cls.query(
+                f"{PARTITION_KEY_PREFIX}#{shard}",
+                cls.sk.startswith(get_sort_key_prefix(reporting_period)),
+                limit=shard_limit,
+                page_size=shard_limit,
+                last_evaluated_key=cursor.get(shard),
+                attributes_to_get=projection,
+            )
+            return list(results), results.last_evaluated_key
+
+        with ThreadPoolExecutor(max_workers=len(shards) or 1) as executor:
+            shard_pages = dict(zip(shards, executor.map(query_shard, shards)))
+
+        frontier = min(
+            (
+                last_evaluated_key["SK"]["S"]
+                for _, last_evaluated_key in shard_pages.values()
+                if last_evaluated_key is not None
+            ),
+            default=None,
+        )
+        page = sorted(
+            (
+                (shard, vessel_item)
+                for shard, (vessel_items, _) in shard_pages.items()
+                for vessel_item in vessel_items
+                if frontier is None or vessel_item.sk <= frontier
+            ),
+            key=lambda shard_item: shard_item[1].sk,
+        )[:limit]
+
+        next_cursor = dict(cursor)
+        for shard, (vessel_items, last_evaluated_key) in shard_pages.items():
+            shard_page = [
+                vessel_item for page_shard, vessel_item in page if page_shard == shard
+            ]
+            if len(shard_page) == len(vessel_items):
+                next_cursor[shard] = last_evaluated_key
+            elif shard_page:
+                next_cursor[shard] = {
+                    "PK": {"S": shard_page[-1].pk},
+                    "SK": {"S": shard_page[-1].sk},
+                }
+
+        page_items = [
+            vessel_item.to_vessel_item(attributes_to_get) for _, vessel_item in page
+        ]
+        if all(
+            str(shard) in next_cursor and next_cursor[str(shard)] is None
+            for shard in range(PARTITION_KEY_SHARDS)
+        ):
+            return page_items, None
+        return page_items, next_cursor
+
+    @classmethod
+    def read_vessel_history(
+        cls, imo_number: str, attributes_to_get: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        """Read the vessel items of all reporting periods of a vessel
+
+        The items are read with a Query on the IMO number index.
+
+        Args:
+            imo_number (str): IMO number of the vessel
+            attributes_to_get (Optional[Sequence[str]]): Dotted paths of the
+                VesselItem fields to read. Only these fields are validated
+
+        Returns:
+            List[dict]: Vessel items, oldest reporting period first
+        """
+        results = cls.imo_number_index.query(
+            get_imo_number_index_hash_key(imo_number),
+            attributes_to_get=get_projection(attributes_to_get),
+        )
+        return [
+            vessel_item.to_vessel_item(attributes_to_get) for vessel_item in results
+        ]
+
+    @classmethod
+    def _read_vessel_items_by_sort_key(
+        cls,
+        partition_keys: Dict[str, str],
+        consistent_read: bool,
+        attributes_to_get: Optional[Sequence[str]],
+    ) -> Dict[str, dict]:
+        """Vessel items by sort key, read under the partition key of each sort key"""
+        projection = get_projection(attributes_to_get, ("SK",))
+        vessel_items: Dict[str, dict] = {}
+        sort_keys = list(partition_keys)
+        for start in range(0, len(sort_keys), BATCH_GET_SIZE):
+            keys_to_get = [
+                {"PK": partition_keys[sort_key], "SK": sort_key}
+                for sort_key in sort_keys[start : start + BATCH_GET_SIZE]
+            ]
+            for vessel_item in cls._batch_get_vessel_items(
+                keys_to_get, consistent_read, projection, cls._get_connection()
+            ):
+                vessel_items[vessel_item.sk] = vessel_item.to_vessel_item(
+                    attributes_to_get
+                )
+        return vessel_items
+
+    @classmethod
+    def _batch_get_vessel_items(
+        cls,
+        keys_to_get: List[dict],
+        consistent_read: bool,
+        attributes_to_get: Optional[Sequence[str]],
+        connection: TableConnection,
+    ) -> List["VesselItemModel"]:
+        vessel_items: List[VesselItemModel] = []
+        attempt = 0
+        while keys_to_get:
+            if attempt == BATCH_GET_MAX_ATTEMPTS:
+                raise VesselItemsUnavailable
+            if attempt:
+                time.sleep(
+                    random.uniform(0, BATCH_GET_BASE_BACKOFF_MS * 2**attempt) / 1000
+                )
+            attempt += 1
 
-            vessel_item_pydantic_model = VesselItem(
-                **vessel_item.convert_to_dictionary()
+            data = connection.batch_get_item(
+                keys_to_get,  # type: ignore[arg-type]
+                consistent_read=consistent_read,
+                attributes_to_get=attributes_to_get,
             )
+            vessel_items.extend(
+                cls.from_raw_data(item)
+                for item in data.get("Responses", {}).get(cls.Meta.table_name, [])
+            )
+            keys_to_get = (
+                data.get("UnprocessedKeys", {})
+                .get(cls.Meta.table_name, {})
+                .get("Keys", [])
+            )
+        return vessel_items
 
-            return json.loads(vessel_item_pydantic_model.json())
-        except IndexError:
-            raise VesselItemNotFound
+    @classmethod
+    def from_vessel_item(cls, item: dict) -> "VesselItemModel":
+        return cls(
+            pk=get_partition_key(item["imo_number"]),
+            sk=get_sort_key(item["reporting_period"], item["imo_number"]),
+            gsi1pk=get_imo_number_index_hash_key(item["imo_number"]),
+            gsi1sk=get_imo_number_index_range_key(item["reporting_period"]),
+            updated_date=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            content_hash=get_content_hash(item),
+            **item,
+        )
 
     @classmethod
     def write_vessel_item(cls, item: dict) -> Union[dict, None]:
         try:
-            obj = cls(
-                pk="EU_MRV_EMISSIONS_DATA",
-                sk=f"REPORTING_PERIOD#{item['reporting_period']}#IMO_NUMBER#{item['imo_number']}",
-                updated_date=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                **item,
-            )
+            obj = cls.from_vessel_item(item)
             obj.save()
 
             return obj.convert_to_dictionary()
         except PutError:
             return None
+
+    @classmethod
+    def create_connection(cls) -> TableConnection:
+        """Create a table connection which is not shared with the model class
+
+        Each connection has its own botocore client, so it can be owned by a
+        single worker thread.
+        """
+        connection = TableConnection(
+            cls.Meta.table_name, region=cls.Meta.region, host=cls.Meta.host
+        )
+        # Seed the description of the table kept by the model's connection, so
+        # the new connection does not describe the table again. TableConnection
+        # only takes a meta_table from pynamodb 5.3
+        connection.connection._tables[cls.Meta.table_name] = (
+            cls._get_connection().get_meta_table()
+        )
+        return connection
+
+    @classmethod
+    def read_content_hashes(
+        cls, vessel_items: Sequence["VesselItemModel"], connection: TableConnection
+    ) -> Dict[str, Optional[str]]:
+        """Read the content hashes stored for vessel items with one BatchGetItem
+
+        Each key is requested once, as BatchGetItem rejects duplicate keys.
+
+        Raises:
+            VesselItemsUnavailable: If keys are unprocessed after the last attempt
+            GetError: If a BatchGetItem request fails
+
+        Returns:
+            Dict[str, Optional[str]]: Stored content hashes by sort key, None
+            for items written before content hashes. Items which are not
+            stored are left out
+        """
+        keys = dict.fromkeys((item.pk, item.sk) for item in vessel_items)
+        stored_items = cls._batch_get_vessel_items(
+            [{"PK": pk, "SK": sk} for pk, sk in keys],
+            False,
+            ["SK", "content_hash"],
+            connection,
+        )
+        return {item.sk: item.content_hash for item in stored_items}
+
+    @classmethod
+    def write_vessel_items(
+        cls,
+        items: Sequence[dict],
+        connection: Optional[TableConnection] = None,
+        rate_limiter: Optional[WriteRateLimiter] = None,
+        skip_unchanged: bool = False,
+    ) -> BatchWriteResult:
+        """Write a batch of vessel items using BatchWriteItem
+
+        Items with the same key as a later item in the batch are superseded
+        by it and not sent, as BatchWriteItem rejects duplicate keys.
+        Unprocessed items and throttled requests are resent with exponential
+        backoff and full jitter. Items still unprocessed after the last
+        attempt, or pending when a request fails for another reason, are
+        counted as failed.
+
+        Args:
+            items (Sequence[dict]): At most BATCH_WRITE_SIZE vessel items
+            connection (Optional[TableConnection]): Connection to write with,
+                defaults to the connection shared by the model class
+            rate_limiter (Optional[WriteRateLimiter]): Limiter to acquire the
+                estimated write capacity units from before each request
+            skip_unchanged (bool): Read the stored content hashes first and
+                only write items which are new or have changed. All items are
+                written when the hashes cannot be read
+
+        Returns:
+            BatchWriteResult: Number of items written, failed and skipped as
+            unchanged, how many of the items sent were stored with another
+            content hash, and how many were superseded by a later item
+        """
+        if len(items) > BATCH_WRITE_SIZE:
+            raise ValueError(
+                f"A batch can contain at most {BATCH_WRITE_SIZE} items, got {len(items)}"
+            )
+
+        # BatchWriteItem rejects requests with duplicate keys, so like
+        # successive puts the last item with a key wins
+        vessel_items = list(
+            {
+                (vessel_item.pk, vessel_item.sk): vessel_item
+                for vessel_item in map(cls.from_vessel_item, items)
+            }.values()
+        )
+        superseded = len(items) - len(vessel_items)
+        connection = connection or cls._get_connection()
+
+        stored_hashes: Dict[str, Optional[str]] = {}
+        if skip_unchanged and vessel_items:
+            try:
+                stored_hashes = cls.read_content_hashes(vessel_items, connection)
+            except (VesselItemsUnavailable, GetError):
+                pass
+            vessel_items = [
+                item
+                for item in vessel_items
+                if stored_hashes.get(item.sk) != item.content_hash
+            ]
+        skipped = len(items) - superseded - len(vessel_items)
+        changed = sum(item.sk in stored_hashes for item in vessel_items)
+
+        put_items = [item.serialize() for item in vessel_items]
+        attempt = 0
+
+        while put_items and attempt < BATCH_WRITE_MAX_ATTEMPTS:
+            if attempt:
+                time.sleep(
+                    random.uniform(0, BATCH_WRITE_BASE_BACKOFF_MS * 2**attempt) / 1000
+                )
+            attempt += 1
+
+            write_units = sum(estimate_write_units(item) for item in put_items)
+            if rate_limiter:
+                rate_limiter.acquire(write_units)
+
+            try:
+                data = connection.batch_write_item(
+                    put_items=put_items, return_consumed_capacity="INDEXES"
+                )
+            except PutError as error:
+                if error.cause_response_code not in THROTTLING_ERROR_CODES:
+                    break
+                if rate_limiter:
+                    rate_limiter.record_throttle()
+                continue
+
+            unprocessed_items = data.get("UnprocessedItems", {}).get(
+                cls.Meta.table_name, []
+            )
+            put_items = [request["PutRequest"]["Item"] for request in unprocessed_items]
+            if rate_limiter:
+                rate_limiter.record_write(
+                    write_units,
+                    get_consumed_capacity(data, cls.Meta.table_name),
+                    throttled=bool(put_items),
+                )
+
+        return BatchWriteResult(
+            written=len(vessel_items) - len(put_items),
+            failed=len(put_items),
+            skipped=skipped,
+            superseded=superseded,
+            changed=changed,
+        )
+
+
+class IngestionCheckpointModel(Model):
+    """
+    Progress of the ingestion of a CSV file, kept in the shipping-data table
+
+    `offset` is the byte offset in the file just after the last row whose
+    vessel item has been written, and `rows` the number of data rows up to
+    it. The raw header row is kept so the file can be read again from the
+    offset with a ranged GET.
+    """
+
+    class Meta:
+        table_name = "shipping-data"
+        region = os.environ.get("AWS_REGION", DEFAULT_REGION)
+
+    pk = UnicodeAttribute(hash_key=True, attr_name="PK")
+    sk = UnicodeAttribute(range_key=True, attr_name="SK")
+
+    updated_date = UnicodeAttribute()
+
+    offset = NumberAttribute()
+    rows = NumberAttribute()
+    header = ListAttribute(of=UnicodeAttribute)
+    continuations = NumberAttribute(default=0)
+
+    @staticmethod
+    def get_sort_key(bucket: str, key: str, etag: str) -> str:
+        return f"S3_OBJECT#{bucket}/{key}#ETAG#{etag}"
+
+    @classmethod
+    def read_checkpoint(
+        cls, bucket: str, key: str, etag: str
+    ) -> Optional["IngestionCheckpointModel"]:
+        try:
+            return cls.get(
+                CHECKPOINT_PARTITION_KEY,
+                cls.get_sort_key(bucket, key, etag),
+                consistent_read=True,
+            )
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def write_checkpoint(
+        cls,
+        bucket: str,
+        key: str,
+        etag: str,
+        offset: int,
+        rows: int,
+        header: List[str],
+        continuations: int,
+    ) -> "IngestionCheckpointModel":
+        checkpoint = cls(
+            CHECKPOINT_PARTITION_KEY,
+            cls.get_sort_key(bucket, key, etag),
+            updated_date=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            offset=offset,
+            rows=rows,
+            header=header,
+            continuations=continuations,
+        )
+        checkpoint.save()
+        return checkpoint
+
+
+class ByteRangeCompletionModel(Model):
+    """
+    Completion record of a byte range of a CSV file ingested by a fan-out worker
+
+    Workers record their byte range once all its vessel items have been
+    written, with a summary of the rows they ingested, so a coordinator which
+    is retried only hands out the ranges which are not complete.
+    """
+
+    class Meta:
+        table_name = "shipping-data"
+        region = os.environ.get("AWS_REGION", DEFAULT_REGION)
+
+    pk = UnicodeAttribute(hash_key=True, attr_name="PK")
+    sk = UnicodeAttribute(range_key=True, attr_name="SK")
+
+    updated_date = UnicodeAttribute()
+
+    start = NumberAttribute()
+    end = NumberAttribute()
+    summary: MapAttribute = MapAttribute()
+
+    @staticmethod
+    def get_sort_key_prefix(bucket: str, key: str, etag: str) -> str:
+        return f"S3_OBJECT#{bucket}/{key}#ETAG#{etag}#RANGE#"
+
+    @classmethod
+    def read_completed_ranges(
+        cls, bucket: str, key: str, etag: str
+    ) -> Set[Tuple[int, int]]:
+        """Start and end byte offsets of the completed ranges of a file"""
+        return {
+            (int(completion.start), int(completion.end))
+            for completion in cls.query(
+                BYTE_RANGE_PARTITION_KEY,
+                cls.sk.startswith(cls.get_sort_key_prefix(bucket, key, etag)),
+                consistent_read=True,
+            )
+        }
+
+    @classmethod
+    def write_completion(
+        cls, bucket: str, key: str, etag: str, start: int, end: int, summary: dict
+    ) -> "ByteRangeCompletionModel":
+        completion = cls(
+            BYTE_RANGE_PARTITION_KEY,
+            f"{cls.get_sort_key_prefix(bucket, key, etag)}{start}-{end}",
+            updated_date=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            start=start,
+            end=end,
+            summary=summary,
+        )
+        completion.save()
+        return completion
@@ -0,0 +1,89 @@
+import cProfile
+import functools
+import logging
+import os
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import botocore.session
+
+LOGGER = logging.getLogger()
+
+PROFILE_EVENT_FLAG = "profile"
+PROFILE_PREFIX = "profiles"
+
+Handler = Callable[[dict, Any], dict]
+
+
+@lru_cache(maxsize=None)
+def get_s3_client() -> Any:
+    return botocore.session.get_session().create_client("s3")
+
+
+def should_profile(event: Any) -> bool:
+    """Whether to profile an invocation, see profile_handler"""
+    if os.environ.get("PROFILE_HANDLER", "false").lower() == "true":
+        return True
+    return isinstance(event, dict) and event.get(PROFILE_EVENT_FLAG) is True
+
+
+def get_profile_name(function_name: str, context: Any) -> str:
+    request_id = getattr(context, "aws_request_id", None) or uuid.uuid4().hex
+    return f"{function_name}-{time.strftime('%Y%m%dT%H%M%S')}-{request_id}.prof"
+
+
+def save_profile(
+    profiler: cProfile.Profile, function_name: str, context: Any
+) -> Optional[str]:
+    """Write a profile to PROFILE_DIR and upload it to PROFILE_BUCKET, if set
+
+    Errors are logged rather than raised, so profiling never fails an
+    invocation.
+
+    Returns:
+        Optional[str]: Path of the profile, None if it could not be written
+    """
+    name = get_profile_name(function_name, context)
+    path = os.path.join(os.environ.get("PROFILE_DIR", "/tmp/profiles"), name)
+    key = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+        bucket = os.environ.get("PROFILE_BUCKET")
+        if bucket:
+            key = f"{PROFILE_PREFIX}/{function_name}/{name}"
+            with open(path, "rb") as profile_file:
+                get_s3_client().put_object(Bucket=bucket, Key=key, Body=profile_file)
+    except Exception as error:
+        LOGGER.error({"message": "Profile could not be saved", "content": error})
+        return path if os.path.exists(path) else None
+    LOGGER.info({"message": "Saved profile", "content": {"path": path, "key": key}})
+    return path
+
+
+def profile_handler(function_name: str) -> Callable[[Handler], Handler]:
+    """Profile invocations of a lambda handler with cProfile when asked to
+
+    Invocations are profiled when the PROFILE_HANDLER environment variable
+    is "true", or their event has "profile": true. Only the thread running
+    the handler is profiled, work handed to other threads shows up as time
+    spent waiting for them. The profile is written to /tmp and uploaded
+    under the profiles/ prefix of PROFILE_BUCKET, see save_profile.
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        def wrapper(event: dict, context: Any) -> dict:
+            if not should_profile(event):
+                return handler(event, context)
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(handler, event, context)
+            finally:
+                save_profile(profiler, function_name, context)
+
+        return wrapper
+
+    return decorator
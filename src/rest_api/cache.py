@@ -0,0 +1,97 @@
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Tuple, Type
+
+from src.models.pynamo_models import VesselItemNotFound
+
+
+class ReadThroughCache:
+    """
+    Bounded least recently used cache whose entries expire after a TTL
+
+    Values are loaded on a miss and kept for `ttl` seconds. When loading
+    raises `not_found`, a negative entry is kept for `not_found_ttl` seconds
+    and the exception is raised again on hits. Cached values are shared
+    between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        ttl: float,
+        not_found_ttl: float,
+        not_found: Type[Exception] = VesselItemNotFound,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_items = max_items
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.not_found = not_found
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, bool, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Get the value cached for a key, loading it on a miss
+
+        Args:
+            key (Hashable): Cache key
+            load (Callable[[], Any]): Loads the value of the key
+
+        Returns:
+            Any: Cached or loaded value
+        """
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            _, found, value = entry
+            if not found:
+                raise self.not_found
+            return value
+
+        self.misses += 1
+        try:
+            value = load()
+        except self.not_found:
+            self._store(key, now + self.not_found_ttl, False, None)
+            raise
+        self._store(key, now + self.ttl, True, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def statistics(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def _store(self, key: Hashable, expires: float, found: bool, value: Any) -> None:
+        self._entries[key] = (expires, found, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+@lru_cache(maxsize=None)
+def get_vessel_item_cache() -> ReadThroughCache:
+    """Vessel item cache of the Lambda container, kept across warm invocations"""
+    return ReadThroughCache(
+        max_items=int(os.environ.get("VESSEL_CACHE_MAX_ITEMS", "1024")),
+        ttl=float(os.environ.get("VESSEL_CACHE_TTL_SECONDS", "300")),
+        not_found_ttl=float(os.environ.get("VESSEL_CACHE_NOT_FOUND_TTL_SECONDS", "30")),
+    )
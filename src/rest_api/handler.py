@@ -1,23 +1,93 @@
 import json
 import logging
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-from aws_lambda_powertools.utilities.typing import LambdaContext
+from src.models.field_projection import InvalidFieldPath, normalise_field_paths
+from src.models.pynamo_models import (
+    VesselItemModel,
+    VesselItemNotFound,
+    VesselItemsUnavailable,
+)
+from src.profiling.profiler import profile_handler
+from src.rest_api.cache import get_vessel_item_cache
+from src.rest_api.pagination import (
+    InvalidNextToken,
+    decode_next_token,
+    encode_next_token,
+    get_next_token_secret,
+)
 
-from src.models.pynamo_models import VesselItemModel, VesselItemNotFound
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.typing import LambdaContext
 
 LOGGER = logging.getLogger()
 LOGGER.setLevel(logging.INFO)
 
+MAX_BATCH_KEYS = 500
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SUMMARY_ATTRIBUTES = ("imo_number", "name", "ship_type", "reporting_period")
 
-def handler(event: dict, context: LambdaContext) -> dict:
 
-    LOGGER.info({"message": "Incoming API Gateway event", "content": json.dumps(event)})
+def split_query_list(value: object) -> List[str]:
+    return [element.strip() for element in str(value).split(",") if element.strip()]
+
+
+def get_field_paths(query: dict) -> Optional[List[str]]:
+    """Field paths requested with the fields parameter, None for all fields
+
+    Raises:
+        InvalidFieldPath: If a path does not point to a field of VesselItem
+    """
+    if not query.get("fields"):
+        return None
+    return normalise_field_paths(split_query_list(query["fields"]))
+
+
+def get_legacy_fallback() -> bool:
+    """Whether vessel items not under their shard are read under the legacy key
+
+    On until the shard-partition-keys migration has run, see DOCS.md.
+    """
+    return os.environ.get("LEGACY_PARTITION_KEY_FALLBACK", "true").lower() == "true"
+
+
+def bad_request(message: str) -> dict:
+    return {
+        "status_code": 400,
+        "headers": {"content-type": "application/json"},
+        "body": {"message": message},
+    }
+
+
+def get_vessel(query: dict) -> dict:
+    """Get a single vessel item by reporting period and IMO number"""
+    try:
+        field_paths = get_field_paths(query)
+    except InvalidFieldPath as error:
+        return bad_request(f"Unknown field: {error}")
 
+    vessel_item_cache = get_vessel_item_cache()
     try:
-        reporting_period = str(event["query"].get("reporting_period", ""))
-        imo_number = event["query"].get("imo_number", "")
+        reporting_period = str(query.get("reporting_period", ""))
+        imo_number = query.get("imo_number", "")
 
-        vessel_item = VesselItemModel.read_vessel_item(reporting_period, imo_number)
+        vessel_item = vessel_item_cache.get(
+            (
+                reporting_period,
+                imo_number,
+                None if field_paths is None else tuple(field_paths),
+            ),
+            partial(
+                VesselItemModel.read_vessel_item,
+                reporting_period,
+                imo_number,
+                attributes_to_get=field_paths,
+                legacy_fallback=get_legacy_fallback(),
+            ),
+        )
 
         response = {
             "status_code": 200,
@@ -27,4 +97,150 @@ def handler(event: dict, context: LambdaContext) -> dict:
     except VesselItemNotFound:
         response = {"status_code": 404}
 
+    LOGGER.info(
+        {
+            "message": "Vessel item cache statistics",
+            "content": vessel_item_cache.statistics(),
+        }
+    )
     return response
+
+
+def get_vessels_batch(query: dict) -> dict:
+    """Get the vessel items of many IMO numbers in one request
+
+    IMO numbers and reporting periods are comma separated lists. Every IMO
+    number is looked up for every reporting period, and the results are
+    returned in the order of the IMO numbers, then of the reporting periods,
+    each with its own status code.
+    """
+    imo_numbers = split_query_list(query.get("imo_numbers", ""))
+    reporting_periods = split_query_list(query.get("reporting_period", ""))
+    keys = [
+        (reporting_period, imo_number)
+        for imo_number in imo_numbers
+        for reporting_period in reporting_periods
+    ]
+    if not keys:
+        return bad_request("imo_numbers and reporting_period are required")
+    if len(keys) > MAX_BATCH_KEYS:
+        return bad_request(f"At most {MAX_BATCH_KEYS} vessel items can be requested")
+    try:
+        field_paths = get_field_paths(query)
+    except InvalidFieldPath as error:
+        return bad_request(f"Unknown field: {error}")
+
+    try:
+        vessel_items = VesselItemModel.read_vessel_items(
+            keys, attributes_to_get=field_paths, legacy_fallback=get_legacy_fallback()
+        )
+    except VesselItemsUnavailable:
+        return {"status_code": 503}
+
+    results = []
+    for (reporting_period, imo_number), vessel_item in zip(keys, vessel_items):
+        result: dict = {
+            "reporting_period": reporting_period,
+            "imo_number": imo_number,
+            "status_code": 404 if vessel_item is None else 200,
+        }
+        if vessel_item is not None:
+            result["body"] = vessel_item
+        results.append(result)
+
+    return {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": {"vessels": results},
+    }
+
+
+def list_vessels(query: dict) -> dict:
+    """List the vessel items of a reporting period one page at a time
+
+    Pages hold up to `limit` vessel items and come with a `next_token` to
+    request the next page with, which is None after the last page. With
+    `summary=true` only the summary attributes of each vessel are returned,
+    which takes precedence over `fields`.
+    """
+    reporting_period = str(query.get("reporting_period", ""))
+    if not reporting_period:
+        return bad_request("reporting_period is required")
+    try:
+        limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return bad_request("limit must be a number")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return bad_request(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    secret = get_next_token_secret()
+    cursor = None
+    if query.get("next_token"):
+        try:
+            cursor = decode_next_token(
+                str(query["next_token"]), reporting_period, secret
+            )
+        except InvalidNextToken:
+            return bad_request("next_token is invalid")
+
+    try:
+        field_paths = get_field_paths(query)
+    except InvalidFieldPath as error:
+        return bad_request(f"Unknown field: {error}")
+    if str(query.get("summary", "")).lower() == "true":
+        field_paths = list(SUMMARY_ATTRIBUTES)
+
+    vessel_items, cursor = VesselItemModel.list_vessel_items(
+        reporting_period,
+        limit,
+        cursor=cursor,
+        attributes_to_get=field_paths,
+    )
+
+    return {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": {
+            "vessels": vessel_items,
+            "next_token": encode_next_token(cursor, reporting_period, secret),
+        },
+    }
+
+
+def get_vessel_history(query: dict) -> dict:
+    """Get the vessel items of all reporting periods of a vessel"""
+    try:
+        field_paths = get_field_paths(query)
+    except InvalidFieldPath as error:
+        return bad_request(f"Unknown field: {error}")
+
+    vessel_items = VesselItemModel.read_vessel_history(
+        str(query.get("imo_number", "")), attributes_to_get=field_paths
+    )
+    if not vessel_items:
+        return {"status_code": 404}
+
+    return {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": {"vessels": vessel_items},
+    }
+
+
+ROUTES: Dict[str, Callable[[dict], dict]] = {
+    "/vessels": get_vessel,
+    "/vessels/batch": get_vessels_batch,
+    "/vessels/list": list_vessels,
+    "/vessels/history": get_vessel_history,
+}
+
+
+@profile_handler("rest-api")
+def handler(event: dict, context: "LambdaContext") -> dict:
+
+    LOGGER.info({"message": "Incoming API Gateway event", "content": json.dumps(event)})
+
+    route = ROUTES.get(event.get("requestPath") or "/vessels")
+    if route is None:
+        return {"status_code": 404}
+    return route(event["query"])
@@ -0,0 +1,91 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+import botocore.session
+
+
+class InvalidNextToken(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_next_token_secret() -> bytes:
+    """Secret next tokens are signed with, read once per lambda container
+
+    The secret is read from the SecureString SSM parameter named by
+    NEXT_TOKEN_SECRET_PARAMETER, so it is not kept in the function
+    configuration. NEXT_TOKEN_SECRET sets the secret itself for local runs.
+    """
+    if "NEXT_TOKEN_SECRET" in os.environ:
+        return os.environ["NEXT_TOKEN_SECRET"].encode("utf-8")
+    ssm_client = botocore.session.get_session().create_client("ssm")
+    response = ssm_client.get_parameter(
+        Name=os.environ["NEXT_TOKEN_SECRET_PARAMETER"], WithDecryption=True
+    )
+    return response["Parameter"]["Value"].encode("utf-8")
+
+
+def encode_base64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_base64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign(payload: bytes, secret: bytes) -> str:
+    return encode_base64(hmac.new(secret, payload, hashlib.sha256).digest())
+
+
+def encode_next_token(
+    cursor: Optional[dict], scope: Any, secret: bytes
+) -> Optional[str]:
+    """Wrap a pagination cursor in an opaque token signed with HMAC-SHA256
+
+    Args:
+        cursor (Optional[dict]): JSON serialisable cursor of the next page,
+            eg. the LastEvaluatedKeys of a Query
+        scope (Any): JSON serialisable parameters of the request the token
+            belongs to, e.g. the reporting period
+        secret (bytes): Signing key
+
+    Returns:
+        Optional[str]: Token, None if there is no next page
+    """
+    if cursor is None:
+        return None
+    payload = json.dumps(
+        {"scope": scope, "key": cursor},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return f"{encode_base64(payload)}.{sign(payload, secret)}"
+
+
+def decode_next_token(next_token: str, scope: Any, secret: bytes) -> dict:
+    """Verify a token made by encode_next_token and return its cursor
+
+    Raises:
+        InvalidNextToken: If the token is malformed, its signature does not
+            match or it was issued for a request with a different scope
+    """
+    try:
+        encoded_payload, signature = next_token.split(".")
+        payload = decode_base64(encoded_payload)
+        if not hmac.compare_digest(sign(payload, secret), signature):
+            raise InvalidNextToken
+        token = json.loads(payload)
+    except (ValueError, TypeError):
+        raise InvalidNextToken
+    if (
+        not isinstance(token, dict)
+        or token.get("scope") != scope
+        or not isinstance(token.get("key"), dict)
+    ):
+        raise InvalidNextToken
+    return token["key"]
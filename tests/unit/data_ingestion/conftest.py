@@ -1,10 +1,23 @@
+import csv
+import io
+import os
 from copy import deepcopy
 
+import boto3
 import pytest
+from moto import mock_dynamodb, mock_s3
 
+from src.data_ingestion.runtime_context import reset_runtime_context
 from tests.resources.csv_content import CSV_CONTENT
 
 
+@pytest.fixture(autouse=True)
+def runtime_context():
+    reset_runtime_context()
+    yield
+    reset_runtime_context()
+
+
 @pytest.fixture()
 def read_csv_from_s3(mocker):
 
@@ -12,3 +25,73 @@ def read_csv_from_s3(mocker):
     mocker.patch(
         "src.data_ingestion.handler.read_csv_from_s3", return_value=csv_content
     )
+
+
+@pytest.fixture()
+def aws_credentials(mocker):
+    """Mocked AWS Credentials for moto."""
+    mocker.patch.dict(
+        os.environ,
+        {
+            "AWS_REGION": "eu-west-2",
+            "AWS_DEFAULT_REGION": "eu-west-2",
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_SECURITY_TOKEN": "testing",
+            "AWS_SESSION_TOKEN": "testing",
+        },
+    )
+
+
+@pytest.fixture()
+def csv_s3_event(aws_credentials):
+    with mock_s3():
+
+        s3_client = boto3.client("s3", "eu-west-2")
+        s3_client.create_bucket(
+            Bucket="shipping-api-test",
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+        csv_file = io.StringIO(newline="")
+        csv.writer(csv_file).writerows(CSV_CONTENT)
+        s3_client.put_object(
+            Bucket="shipping-api-test",
+            Key="raw/2018 EU MRV.csv",
+            Body=csv_file.getvalue().encode("utf-8"),
+        )
+
+        yield {
+            "Records": [
+                {
+                    "s3": {
+                        "bucket": {"name": "shipping-api-test"},
+                        "object": {"key": "raw/2018+EU+MRV.csv"},
+                    }
+                }
+            ]
+        }
+
+
+@pytest.fixture()
+def shipping_data_table(aws_credentials):
+    with mock_dynamodb():
+
+        dynamodb = boto3.resource("dynamodb", "eu-west-2")
+
+        table = dynamodb.create_table(
+            TableName="shipping-data",
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            ProvisionedThroughput={"ReadCapacityUnits": 25, "WriteCapacityUnits": 25},
+        )
+
+        yield table
+
+        table.delete()
@@ -0,0 +1,181 @@
+import csv
+import io
+from itertools import count
+
+import boto3
+
+from src.data_ingestion.checkpoint import (
+    MAX_CONTINUATIONS,
+    CheckpointedCsvRows,
+    continue_ingestion,
+    get_deadline,
+)
+from src.data_ingestion.data_processing import ByteOffsetLines
+from src.data_ingestion.handler import handler
+from src.data_ingestion.runtime_context import RuntimeContext
+from src.models.pynamo_models import (
+    BatchWriteResult,
+    IngestionCheckpointModel,
+    VesselItemModel,
+    get_partition_keys,
+)
+from tests.resources.csv_content import CSV_CONTENT
+
+LOCATION = ("shipping-api-test", "raw/2018 EU MRV.csv", "")
+
+
+class LambdaContext:
+    invoked_function_arn = "arn:aws:lambda:eu-west-2:123456789012:function:ingest"
+
+    def __init__(self, remaining_times):
+        self.remaining_times = iter(remaining_times)
+
+    def get_remaining_time_in_millis(self):
+        return next(self.remaining_times)
+
+
+def get_content():
+    csv_file = io.StringIO(newline="")
+    csv.writer(csv_file).writerows(CSV_CONTENT)
+    return csv_file.getvalue().encode("utf-8")
+
+
+def test_checkpointed_csv_rows_resume_from_offset():
+
+    content = get_content()
+    calls = count()
+    csv_rows = CheckpointedCsvRows(
+        ByteOffsetLines([content]), should_stop=lambda: next(calls) == 2
+    )
+
+    assert list(csv_rows) == CSV_CONTENT[:3]
+    assert csv_rows.stopped
+    assert csv_rows.rows == 2
+
+    resumed_rows = CheckpointedCsvRows(
+        ByteOffsetLines([content[csv_rows.offset :]], offset=csv_rows.offset),
+        header=csv_rows.header,
+        rows=csv_rows.rows,
+    )
+
+    assert list(resumed_rows) == CSV_CONTENT[:1] + CSV_CONTENT[3:]
+    assert not resumed_rows.stopped
+    assert resumed_rows.rows == 5
+    assert resumed_rows.offset == len(content)
+
+
+def test_checkpointed_csv_rows_rewind():
+
+    content = get_content()
+    csv_rows = CheckpointedCsvRows(ByteOffsetLines([content]))
+    header_end = content.index(b"\r\n") + 2
+
+    assert list(csv_rows) == CSV_CONTENT
+    csv_rows.rewind(5)
+    assert (csv_rows.rows, csv_rows.offset) == (5, len(content))
+
+    csv_rows.rewind(0)
+    assert (csv_rows.rows, csv_rows.offset) == (0, header_end)
+
+
+def test_get_deadline():
+
+    deadline = get_deadline(LambdaContext([9000, 7000]), reserve_ms=8000)
+
+    assert [deadline(), deadline()] == [False, True]
+    assert not get_deadline(None, reserve_ms=8000)()
+
+
+def test_get_deadline_leaves_time_to_write_the_batches_in_flight():
+
+    deadline = get_deadline(
+        LambdaContext([9500, 9500]),
+        reserve_ms=8000,
+        get_drain_ms=iter([1000, 2000]).__next__,
+    )
+
+    assert [deadline(), deadline()] == [False, True]
+
+
+def test_continue_ingestion_stops_without_progress(shipping_data_table, mocker, caplog):
+
+    lambda_client = mocker.patch.object(RuntimeContext, "lambda_client")
+    csv_rows = CheckpointedCsvRows(ByteOffsetLines([]), header=["IMO Number"])
+    checkpoint = IngestionCheckpointModel.write_checkpoint(
+        *LOCATION, offset=0, rows=0, header=["IMO Number"], continuations=1
+    )
+
+    assert not continue_ingestion({}, None, LOCATION, csv_rows, checkpoint)
+    assert IngestionCheckpointModel.read_checkpoint(*LOCATION).continuations == 2
+    assert "no progress" in caplog.records[-1].message
+
+    csv_rows.lines.offset = 10
+    checkpoint.continuations = MAX_CONTINUATIONS
+
+    assert not continue_ingestion({}, None, LOCATION, csv_rows, checkpoint)
+    assert "too many continuations" in caplog.records[-1].message
+    lambda_client.invoke.assert_not_called()
+
+
+def test_handler_resumes_from_checkpoint(
+    csv_s3_event, shipping_data_table, mocker, caplog
+):
+
+    lambda_client = mocker.patch.object(RuntimeContext, "lambda_client")
+    s3_client = boto3.client("s3", "eu-west-2")
+    get_object = mocker.spy(s3_client, "get_object")
+    mocker.patch.object(RuntimeContext, "s3_client", s3_client)
+
+    assert handler(csv_s3_event, LambdaContext([30000, 30000, 1000])) == {
+        "body": "Success!"
+    }
+
+    checkpoint = IngestionCheckpointModel.read_checkpoint(*LOCATION)
+    assert (checkpoint.rows, checkpoint.header) == (2, CSV_CONTENT[0])
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 2
+    lambda_client.invoke.assert_called_once()
+    assert lambda_client.invoke.call_args.kwargs["InvocationType"] == "Event"
+
+    assert handler(csv_s3_event, LambdaContext([30000] * 10)) == {"body": "Success!"}
+
+    assert get_object.call_args.kwargs["Range"] == f"bytes={checkpoint.offset}-"
+    assert IngestionCheckpointModel.read_checkpoint(*LOCATION) is None
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
+    assert caplog.records[-1].msg["content"]["file_rows"] == 5
+    assert caplog.records[-1].msg["content"]["rows"] == 3
+    assert caplog.records[-1].msg["content"]["resumed"]
+    lambda_client.invoke.assert_called_once()
+
+
+def test_handler_retries_failed_batches_on_resume(
+    csv_s3_event, shipping_data_table, mocker
+):
+
+    lambda_client = mocker.patch.object(RuntimeContext, "lambda_client")
+    s3_client = boto3.client("s3", "eu-west-2")
+    get_object = mocker.spy(s3_client, "get_object")
+    mocker.patch.object(RuntimeContext, "s3_client", s3_client)
+    write_vessel_items = VesselItemModel.write_vessel_items
+    calls = count()
+    mocker.patch.object(
+        VesselItemModel,
+        "write_vessel_items",
+        side_effect=lambda *args, **kwargs: (
+            BatchWriteResult(written=0, failed=5)
+            if next(calls) == 0
+            else write_vessel_items(*args, **kwargs)
+        ),
+    )
+
+    assert handler(csv_s3_event, LambdaContext([30000] * 10)) == {"body": "Success!"}
+
+    checkpoint = IngestionCheckpointModel.read_checkpoint(*LOCATION)
+    assert checkpoint.rows == 0
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 0
+    lambda_client.invoke.assert_called_once()
+
+    assert handler(csv_s3_event, LambdaContext([30000] * 10)) == {"body": "Success!"}
+
+    assert get_object.call_args.kwargs["Range"] == f"bytes={checkpoint.offset}-"
+    assert IngestionCheckpointModel.read_checkpoint(*LOCATION) is None
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
@@ -0,0 +1,101 @@
+from copy import deepcopy
+
+import pytest
+
+from src.data_ingestion.columnar import ColumnarCleaner, clean_column_values
+from src.data_ingestion.data_processing import (
+    CleaningPlan,
+    clean_column,
+    load_column_type_mappings,
+)
+from src.data_ingestion.handler import get_vessel_generator
+from src.data_ingestion.runtime_context import reset_runtime_context
+from tests.resources.csv_content import CSV_CONTENT
+
+COLUMN_TYPE_MAPPINGS = load_column_type_mappings()
+
+
+def run_vessel_generator(mocker, monkeypatch, caplog, cleaning_engine, csv_content):
+    monkeypatch.setenv("CLEANING_ENGINE", cleaning_engine)
+    reset_runtime_context()
+    caplog.clear()
+    mocker.patch(
+        "src.data_ingestion.handler.read_csv_from_s3",
+        return_value=deepcopy(csv_content),
+    )
+
+    vessel_items = list(get_vessel_generator({}))
+    messages = [record.message for record in caplog.records]
+    return vessel_items, messages
+
+
+def test_clean_column_values():
+
+    calls = []
+
+    def cleaning_function(value):
+        calls.append(value)
+        return value.upper()
+
+    assert clean_column_values(["a", "b", "a", "a"], cleaning_function) == [
+        "A",
+        "B",
+        "A",
+        "A",
+    ]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_columnar_cleaner_matches_cleaning_plan():
+
+    columns = [clean_column(column) for column in CSV_CONTENT[0]]
+    cleaning_plan = CleaningPlan(columns, COLUMN_TYPE_MAPPINGS)
+    rows = deepcopy(CSV_CONTENT[1:]) + [CSV_CONTENT[1][:10]]
+
+    columnar_cleaner = ColumnarCleaner(columns, cleaning_plan)
+    cleaned_rows = columnar_cleaner.clean_block(rows)
+
+    assert cleaned_rows[-1] is None
+    assert [dict(zip(columnar_cleaner.names, row)) for row in cleaned_rows[:-1]] == [
+        cleaning_plan.clean(dict(zip(columns, row))) for row in rows[:-1]
+    ]
+
+
+def test_columnar_engine_matches_row_engine(mocker, monkeypatch, caplog):
+
+    csv_content = deepcopy(CSV_CONTENT)
+    invalid_imo_number = list(csv_content[1])
+    invalid_imo_number[0] = "12345678"
+    not_applicable = [
+        "N/A" if index % 3 else value for index, value in enumerate(csv_content[2])
+    ]
+    csv_content += [invalid_imo_number, not_applicable, csv_content[3][:20]]
+
+    row_engine = run_vessel_generator(mocker, monkeypatch, caplog, "row", csv_content)
+    columnar_engine = run_vessel_generator(
+        mocker, monkeypatch, caplog, "columnar", csv_content
+    )
+
+    assert columnar_engine == row_engine
+    assert row_engine[0][:5] == [item for item in row_engine[0][:5] if item is not None]
+    assert len(row_engine[1]) == 3
+
+
+def test_columnar_engine_raises_on_same_row(mocker, monkeypatch, caplog):
+
+    csv_content = deepcopy(CSV_CONTENT)
+    csv_content[3][3] = "Twenty eighteen"
+
+    for cleaning_engine in ["row", "columnar"]:
+        monkeypatch.setenv("CLEANING_ENGINE", cleaning_engine)
+        reset_runtime_context()
+        mocker.patch(
+            "src.data_ingestion.handler.read_csv_from_s3",
+            return_value=deepcopy(csv_content),
+        )
+        vessel_generator = get_vessel_generator({})
+
+        assert next(vessel_generator) is not None
+        assert next(vessel_generator) is not None
+        with pytest.raises(ValueError):
+            next(vessel_generator)
@@ -1,3 +1,5 @@
+import csv
+import io
 import json
 import os
 from copy import deepcopy
@@ -6,6 +8,8 @@ from pathlib import Path
 import pytest
 
 from src.data_ingestion.data_processing import (
+    ByteOffsetLines,
+    CleaningPlan,
     clean_column,
     clean_monitoring_methods,
     clean_null_values,
@@ -14,7 +18,9 @@ from src.data_ingestion.data_processing import (
     convert_csv_to_dictionaries,
     convert_date,
     create_vessel_item,
+    decode_lines,
     extract_technical_efficiency,
+    generate_csv_dictionaries,
     load_column_type_mappings,
 )
 from tests.resources.vessel_data import VESSEL_DATA_CLEAN, VESSEL_DATA_RAW
@@ -88,6 +94,48 @@ def test_convert_csv_to_dictionaries():
     ]
 
 
+def test_decode_lines():
+
+    text = 'Name,CO₂ [m tonnes]\r\n"55 FILONOS STR.\n185 35 PIRAEUS",1.5\r\nASTORIA,'
+    content = text.encode("utf-8")
+    expected_rows = list(csv.reader(io.StringIO(text, newline="")))
+
+    for chunk_size in range(1, len(content) + 1):
+        chunks = [
+            content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+        ]
+        assert list(csv.reader(decode_lines(chunks))) == expected_rows
+
+
+def test_byte_offset_lines():
+
+    text = 'Name,CO₂ [m tonnes]\r\n"55 FILONOS STR.\n185 35 PIRAEUS",1.5\r\nASTORIA,'
+    content = text.encode("utf-8")
+    lines = ByteOffsetLines(
+        [content[i : i + 4] for i in range(0, len(content), 4)], offset=100
+    )
+
+    offsets = [lines.offset for _ in lines]
+
+    assert lines.offset == 100 + len(content)
+    assert [content[offset - 100 :] for offset in offsets] == [
+        '"55 FILONOS STR.\n185 35 PIRAEUS",1.5\r\nASTORIA,'.encode("utf-8"),
+        '185 35 PIRAEUS",1.5\r\nASTORIA,'.encode("utf-8"),
+        b"ASTORIA,",
+        b"",
+    ]
+
+
+def test_generate_csv_dictionaries():
+
+    csv_rows = iter([["Column Name 1one", "Column%Name two2"], ["test1", "2"]])
+
+    assert list(generate_csv_dictionaries(csv_rows)) == [
+        {"column_name_one": "test1", "column_name_two": "2"}
+    ]
+    assert list(generate_csv_dictionaries(iter([]))) == []
+
+
 @pytest.mark.parametrize(
     "vessel_data_raw, vessel_data_clean",
     list(zip(deepcopy(VESSEL_DATA_RAW), deepcopy(VESSEL_DATA_CLEAN))),
@@ -98,6 +146,39 @@ def test_clean_raw_vessel_data(vessel_data_raw, vessel_data_clean):
     )
 
 
+@pytest.mark.parametrize("vessel_data_raw", deepcopy(VESSEL_DATA_RAW))
+def test_cleaning_plan(vessel_data_raw):
+
+    cleaning_plan = CleaningPlan(list(vessel_data_raw), COLUMN_TYPE_MAPPINGS)
+
+    for column in vessel_data_raw:
+        for value in ["", " N/A ", "Not Applicable", "Yes", "1.234", "01/02/2020", "x"]:
+            row = dict(vessel_data_raw, **{column: value})
+            try:
+                expected = clean_raw_vessel_data(deepcopy(row), COLUMN_TYPE_MAPPINGS)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    cleaning_plan.clean(row)
+            else:
+                assert cleaning_plan.clean(row) == expected
+
+
+def test_cleaning_plan_missing_columns():
+
+    vessel_data_raw = deepcopy(VESSEL_DATA_RAW[0])
+    cleaning_plan = CleaningPlan(list(vessel_data_raw), COLUMN_TYPE_MAPPINGS)
+    del vessel_data_raw["b"]
+
+    with pytest.raises(KeyError, match="'b'"):
+        cleaning_plan.clean(vessel_data_raw)
+
+    cleaning_plan = CleaningPlan(list(vessel_data_raw), COLUMN_TYPE_MAPPINGS)
+    assert not cleaning_plan.complete
+
+    with pytest.raises(KeyError, match="'b'"):
+        cleaning_plan.clean(vessel_data_raw)
+
+
 def test_create_vessel_item():
 
     vessel_data = deepcopy(VESSEL_DATA_CLEAN[0])
@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+from itertools import count
+
+import pytest
+
+from src.data_ingestion.fan_out import (
+    ByteRange,
+    IngestionSummary,
+    find_record_boundaries,
+    merge_summaries,
+    split_byte_ranges,
+)
+from src.data_ingestion.handler import handler, ingest_byte_range
+from src.data_ingestion.runtime_context import RuntimeContext, get_runtime_context
+from src.models.pynamo_models import (
+    BatchWriteResult,
+    ByteRangeCompletionModel,
+    VesselItemModel,
+    get_partition_keys,
+)
+from tests.resources.csv_content import CSV_CONTENT
+
+ROWS = [
+    ["IMO Number", "Additional information"],
+    ["5383304", 'Two lines,\nwith "quotes"\r\n'],
+    ["6417097", ""],
+    ["6511128", "\n"],
+    ["6602898", '"'],
+]
+
+
+def get_fan_out_summary(caplog):
+    return next(
+        record.msg["content"]
+        for record in reversed(caplog.records)
+        if isinstance(record.msg, dict)
+        and record.msg["message"] == "Finished fanning out vessel items to DynamoDB"
+    )
+
+
+def get_content(rows):
+    csv_file = io.StringIO(newline="")
+    csv.writer(csv_file).writerows(rows)
+    return csv_file.getvalue().encode("utf-8")
+
+
+def split_into_chunks(content, chunk_size):
+    return [
+        content[start : start + chunk_size]
+        for start in range(0, len(content), chunk_size)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1024])
+def test_find_record_boundaries(chunk_size):
+
+    content = get_content(ROWS)
+    record_ends = [len(get_content(ROWS[: index + 1])) for index in range(len(ROWS))]
+
+    boundaries = find_record_boundaries(
+        split_into_chunks(content, chunk_size), range(len(content) + 1)
+    )
+
+    assert boundaries == record_ends
+
+
+@pytest.mark.parametrize("rows", [ROWS, CSV_CONTENT])
+@pytest.mark.parametrize("count", [1, 2, 3, 10])
+def test_split_byte_ranges(rows, count):
+
+    content = get_content(rows)
+
+    header_end, byte_ranges = split_byte_ranges(
+        split_into_chunks(content, 7), len(content), count
+    )
+
+    assert list(csv.reader(io.StringIO(content[:header_end].decode(), newline=""))) == [
+        rows[0]
+    ]
+    assert 1 <= len(byte_ranges) <= count
+    assert byte_ranges[0].start == header_end
+    assert byte_ranges[-1].end == len(content)
+    assert [
+        row
+        for start, end in byte_ranges
+        for row in csv.reader(io.StringIO(content[start:end].decode(), newline=""))
+    ] == rows[1:]
+
+
+def test_split_byte_ranges_without_data_rows():
+
+    content = get_content(ROWS[:1])
+
+    assert split_byte_ranges([content], len(content), 4) == (len(content), [])
+    assert split_byte_ranges([], 0, 4) == (0, [])
+
+
+def test_merge_summaries():
+
+    assert merge_summaries(
+        [IngestionSummary(rows=2, cleaned=1, rejected=1), IngestionSummary(rows=3)]
+    ) == IngestionSummary(rows=5, cleaned=1, rejected=1)
+    assert merge_summaries([]) == IngestionSummary()
+    assert ByteRange(5) == (5, None)
+
+
+@pytest.fixture()
+def lambda_client(mocker):
+    def invoke(FunctionName, InvocationType, Payload):
+        # Asynchronous invocations run to completion, failures are only logged
+        try:
+            handler(json.loads(Payload), None)
+        except RuntimeError:
+            pass
+        return {"StatusCode": 202}
+
+    lambda_client = mocker.patch.object(RuntimeContext, "lambda_client")
+    lambda_client.invoke.side_effect = invoke
+    return lambda_client
+
+
+def test_handler_fans_out_byte_ranges(
+    csv_s3_event, shipping_data_table, lambda_client, monkeypatch, mocker, caplog
+):
+
+    monkeypatch.setenv("INGESTION_MODE", "fan_out")
+    monkeypatch.setenv("FAN_OUT_RANGES", "3")
+    context = mocker.Mock(invoked_function_arn="arn:aws:lambda:function:ingest")
+
+    assert handler(csv_s3_event, context) == {"body": "Success!"}
+
+    payloads = [
+        json.loads(call.kwargs["Payload"])["byte_range"]
+        for call in lambda_client.invoke.call_args_list
+    ]
+    assert len(payloads) >= 2
+    assert all(
+        call.kwargs["InvocationType"] == "Event"
+        for call in lambda_client.invoke.call_args_list
+    )
+    assert {payload["write_capacity_units"] for payload in payloads} == {
+        200 / len(payloads)
+    }
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
+    summary = get_fan_out_summary(caplog)
+    assert (summary["ranges"], summary["dispatched_ranges"]) == (len(payloads),) * 2
+    assert summary["failed_ranges"] == 0
+
+    assert handler(csv_s3_event, context) == {"body": "Success!"}
+
+    assert lambda_client.invoke.call_count == len(payloads)
+    summary = get_fan_out_summary(caplog)
+    assert (summary["completed_ranges"], summary["dispatched_ranges"]) == (
+        len(payloads),
+        0,
+    )
+
+
+def test_handler_fans_out_incomplete_byte_ranges_again(
+    csv_s3_event, shipping_data_table, lambda_client, monkeypatch, mocker, caplog
+):
+
+    monkeypatch.setenv("INGESTION_MODE", "fan_out")
+    monkeypatch.setenv("FAN_OUT_RANGES", "3")
+    context = mocker.Mock(invoked_function_arn="arn:aws:lambda:function:ingest")
+    write_vessel_items = VesselItemModel.write_vessel_items
+    calls = count()
+    mocker.patch.object(
+        VesselItemModel,
+        "write_vessel_items",
+        side_effect=lambda items, *args, **kwargs: (
+            BatchWriteResult(written=0, failed=len(items))
+            if next(calls) == 0
+            else write_vessel_items(items, *args, **kwargs)
+        ),
+    )
+
+    assert handler(csv_s3_event, context) == {"body": "Success!"}
+    assert handler(csv_s3_event, context) == {"body": "Success!"}
+
+    summary = get_fan_out_summary(caplog)
+    assert (summary["ranges"], summary["completed_ranges"]) == (2, 1)
+    assert summary["dispatched_ranges"] == 1
+    assert lambda_client.invoke.call_count == 3
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
+
+
+def test_ingest_byte_range_uses_its_share_of_write_capacity(
+    csv_s3_event, shipping_data_table
+):
+
+    content = get_content(CSV_CONTENT)
+    header_end = content.index(b"\r\n") + 2
+
+    ingest_byte_range(
+        "shipping-api-test",
+        "raw/2018 EU MRV.csv",
+        "",
+        CSV_CONTENT[0],
+        header_end,
+        len(content),
+        write_capacity_units=50,
+    )
+
+    assert get_runtime_context().write_rate_limiter.max_rate == 50
+    assert ByteRangeCompletionModel.read_completed_ranges(
+        "shipping-api-test", "raw/2018 EU MRV.csv", ""
+    ) == {(header_end, len(content))}
+
+
+def test_handler_fans_out_byte_ranges_to_processes(
+    csv_s3_event, shipping_data_table, monkeypatch, caplog
+):
+
+    monkeypatch.setenv("INGESTION_MODE", "fan_out")
+    monkeypatch.setenv("FAN_OUT_EXECUTOR", "process")
+
+    assert handler(csv_s3_event, None) == {"body": "Success!"}
+
+    summary = get_fan_out_summary(caplog)
+    assert (summary["rows"], summary["written"], summary["failed_ranges"]) == (
+        5,
+        5,
+        0,
+    )
@@ -1,9 +1,24 @@
+import subprocess
+import sys
 from copy import deepcopy
 
 import pytest
 
-from src.data_ingestion.data_processing import load_column_type_mappings
-from src.data_ingestion.handler import get_vessel_generator, process_raw_vessel_data
+from src.data_ingestion.checkpoint import CheckpointedCsvRows
+from src.data_ingestion.data_processing import (
+    ByteOffsetLines,
+    load_column_type_mappings,
+)
+from src.data_ingestion.handler import (
+    get_vessel_generator,
+    handler,
+    process_raw_vessel_data,
+    read_csv_from_s3,
+    write_vessel_generator,
+)
+from src.data_ingestion.runtime_context import reset_runtime_context
+from src.models.pynamo_models import BatchWriteResult
+from tests.resources.csv_content import CSV_CONTENT
 from tests.resources.vessel_data import VESSEL_DATA_RAW, VESSEL_ITEMS
 
 COLUMN_TYPE_MAPPINGS = load_column_type_mappings()
@@ -20,6 +35,11 @@ def test_process_raw_vessel_data_happy_path(vessel_data_raw, vessel_items):
     )
 
 
+def test_read_csv_from_s3(csv_s3_event):
+
+    assert list(read_csv_from_s3(csv_s3_event)) == CSV_CONTENT
+
+
 def test_process_raw_vessel_data_validation_error(caplog):
 
     vessel_data_raw = deepcopy(VESSEL_DATA_RAW[0])
@@ -62,9 +82,104 @@ def test_get_vessel_generator(read_csv_from_s3):
     ]
 
 
+@pytest.mark.parametrize("validation_engine", ["pydantic", "fast"])
+def test_get_vessel_generator_validation_engines(
+    read_csv_from_s3, monkeypatch, validation_engine
+):
+
+    monkeypatch.setenv("VALIDATION_ENGINE", validation_engine)
+    reset_runtime_context()
+
+    assert list(get_vessel_generator({})) == deepcopy(VESSEL_ITEMS[:5])
+
+
 def test_get_vessel_generator_unhappy_path(mocker):
 
     event = {"test-event-key": "test-event-value"}
     mocker.patch("src.data_ingestion.handler.read_csv_from_s3", return_value=None)
 
     assert get_vessel_generator(event) is None
+
+
+def test_handler_writes_vessel_items_in_batches(mocker, caplog):
+
+    event = {
+        "Records": [
+            {
+                "s3": {
+                    "bucket": {"name": "shipping-api-test"},
+                    "object": {"key": "raw/2018+EU+MRV.csv"},
+                }
+            }
+        ]
+    }
+    vessel_items = [deepcopy(VESSEL_ITEMS[0]), None] * 30
+    mocker.patch(
+        "src.data_ingestion.handler.get_vessel_generator",
+        return_value=(vessel_item for vessel_item in vessel_items),
+    )
+    mocker.patch(
+        "src.data_ingestion.handler.IngestionCheckpointModel.read_checkpoint",
+        return_value=None,
+    )
+    mocker.patch(
+        "src.data_ingestion.handler.read_csv_from_s3",
+        return_value=CheckpointedCsvRows(ByteOffsetLines([])),
+    )
+    mocker.patch("src.data_ingestion.writer_pool.VesselItemModel.create_connection")
+    write_vessel_items = mocker.patch(
+        "src.data_ingestion.handler.VesselItemModel.write_vessel_items",
+        side_effect=lambda items, *args, **kwargs: BatchWriteResult(
+            written=len(items) - 2, failed=0, skipped=2, changed=1
+        ),
+    )
+
+    assert handler(event, None) == {"body": "Success!"}
+    assert sorted(len(call.args[0]) for call in write_vessel_items.call_args_list) == [
+        5,
+        25,
+    ]
+    assert all(
+        call.kwargs["skip_unchanged"] for call in write_vessel_items.call_args_list
+    )
+    summary = next(
+        record.msg["content"]
+        for record in caplog.records
+        if isinstance(record.msg, dict)
+        and record.msg["message"] == "Finished writing vessel items to DynamoDB"
+    )
+    assert summary["file"] == "raw/2018 EU MRV.csv"
+    assert (summary["written"], summary["skipped"], summary["changed"]) == (26, 4, 2)
+
+
+def test_write_vessel_generator_counts_rows_before_the_first_failed_batch(mocker):
+
+    mocker.patch("src.data_ingestion.writer_pool.VesselItemModel.create_connection")
+    vessel_items = [{"batch": 0}, None, {"batch": 0}, {"batch": 1}, None, {"batch": 1}]
+
+    def write_batch(batch, connection):
+        if batch[0]["batch"]:
+            return BatchWriteResult(written=1, failed=1)
+        return BatchWriteResult(written=2, failed=0)
+
+    summary = write_vessel_generator(vessel_items, write_batch, batch_size=2)
+
+    assert (summary.rows, summary.failed, summary.durable_rows) == (6, 1, 3)
+    assert write_vessel_generator(vessel_items[:3], write_batch, 2).durable_rows == 3
+
+
+def test_handler_import_leaves_out_lazy_dependencies():
+
+    modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, src.data_ingestion.handler; print(*sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    for package in ("aws_lambda_powertools", "boto3", "multiprocessing"):
+        assert package not in modules
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from itertools import count
+
+import pytest
+
+from src.data_ingestion.handler import handler
+from src.data_ingestion.instrumentation import NullPipelineMetrics, PipelineMetrics
+from tests.resources.csv_content import CSV_CONTENT
+
+
+@pytest.fixture()
+def clock(mocker):
+    ticks = count()
+    mocker.patch(
+        "src.data_ingestion.instrumentation.time.perf_counter",
+        side_effect=lambda: next(ticks),
+    )
+    mocker.patch(
+        "src.data_ingestion.instrumentation.time.thread_time", return_value=0.0
+    )
+
+
+def get_embedded_metrics(capsys):
+    return [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("{") and "_aws" in line
+    ]
+
+
+def test_nested_stages_are_timed_exclusively(clock):
+
+    metrics = PipelineMetrics()
+
+    with metrics.stage("parse"):
+        with metrics.stage("s3_read"):
+            pass
+    with metrics.stage("parse"):
+        pass
+
+    assert metrics.stages["s3_read"].wall_s == 1
+    assert metrics.stages["parse"].wall_s == 3 + 1 - 1
+    assert metrics.stages["parse"].calls == 2
+
+
+def test_time_iterator():
+
+    metrics = PipelineMetrics()
+
+    assert list(metrics.time_iterator("parse", "abc")) == ["a", "b", "c"]
+    assert metrics.stages["parse"].calls == 4
+
+
+def test_get_summary_write_latency_percentiles():
+
+    metrics = PipelineMetrics()
+    for latency_ms in range(100, 0, -1):
+        metrics.record_write(25, latency_ms)
+
+    summary = metrics.get_summary(rows=2500, bytes_read=1000)
+
+    assert (summary["rows"], summary["bytes_read"]) == (2500, 1000)
+    assert (summary["write_batches"], summary["write_items"]) == (100, 2500)
+    assert summary["write_latency_p50_ms"] == 51
+    assert summary["write_latency_p99_ms"] == 100
+    assert summary["write_latency_max_ms"] == 100
+
+
+def test_null_pipeline_metrics_record_nothing():
+
+    metrics = NullPipelineMetrics()
+
+    with metrics.stage("parse"):
+        pass
+    metrics.record_write(25, 10.0)
+
+    assert list(metrics.time_iterator("parse", "abc")) == ["a", "b", "c"]
+    assert metrics.stages == {}
+    assert metrics.write_latencies_ms == []
+
+
+def test_handler_emits_pipeline_metrics(
+    csv_s3_event, shipping_data_table, monkeypatch, capsys
+):
+
+    monkeypatch.setenv("PIPELINE_METRICS", "true")
+    csv_file = io.StringIO(newline="")
+    csv.writer(csv_file).writerows(CSV_CONTENT)
+
+    assert handler(csv_s3_event, None) == {"body": "Success!"}
+
+    [embedded_metrics] = get_embedded_metrics(capsys)
+    assert embedded_metrics["file"] == "raw/2018 EU MRV.csv"
+    assert embedded_metrics["rows"] == [5]
+    assert embedded_metrics["bytes_read"] == [len(csv_file.getvalue().encode())]
+    assert embedded_metrics["write_items"] == [5]
+    for stage in ["s3_read", "parse", "clean", "build", "validate", "write_wait"]:
+        assert embedded_metrics[f"{stage}_wall_ms"][0] >= 0
+    assert embedded_metrics["parse_calls"] == [len(CSV_CONTENT) + 1]
+    assert embedded_metrics["write_latency_p50_ms"][0] > 0
+
+
+def test_handler_does_not_emit_pipeline_metrics_by_default(
+    csv_s3_event, shipping_data_table, capsys
+):
+
+    assert handler(csv_s3_event, None) == {"body": "Success!"}
+
+    assert get_embedded_metrics(capsys) == []
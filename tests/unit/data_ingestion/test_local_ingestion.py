@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import sqlite3
+from copy import deepcopy
+
+import pytest
+
+from src.data_ingestion.handler import get_vessel_generator, write_vessel_generator
+from src.data_ingestion.local_ingestion import (
+    DynamoDBSink,
+    expand_paths,
+    generate_vessel_items_in_processes,
+    main,
+)
+from src.data_ingestion.runtime_context import (
+    get_runtime_context,
+    reset_runtime_context,
+)
+from src.models.pynamo_models import VesselItemModel, get_partition_key
+from tests.resources.csv_content import CSV_CONTENT
+
+
+def get_content(rows):
+    csv_file = io.StringIO(newline="")
+    csv.writer(csv_file).writerows(rows)
+    return csv_file.getvalue().encode("utf-8")
+
+
+@pytest.fixture()
+def csv_path(tmp_path):
+    path = tmp_path / "2018 EU MRV.csv"
+    path.write_bytes(get_content(CSV_CONTENT))
+    return path
+
+
+def get_ingested_files(caplog):
+    return [
+        record.msg["content"]
+        for record in caplog.records
+        if isinstance(record.msg, dict)
+        and record.msg["message"] == "Ingested local file"
+    ]
+
+
+def test_main_writes_ndjson(csv_path, tmp_path, caplog, mocker):
+
+    create_connection = mocker.spy(VesselItemModel, "create_connection")
+    output = tmp_path / "items.ndjson"
+
+    main([str(csv_path), "--output", str(output), "--batch-size", "2"])
+
+    items = [json.loads(line) for line in output.read_text().splitlines()]
+    # Batches are written by several writer threads, in any order
+    assert sorted(item["imo_number"] for item in items) == sorted(
+        row[0] for row in CSV_CONTENT[1:]
+    )
+    assert create_connection.call_count == 0
+    [summary] = get_ingested_files(caplog)
+    assert (summary["rows"], summary["written"], summary["batches"]) == (5, 5, 3)
+
+
+def test_main_writes_sqlite(csv_path, tmp_path):
+
+    output = tmp_path / "items.db"
+
+    main([str(csv_path), "--sink", "sqlite", "--output", str(output)])
+    main([str(csv_path), "--sink", "sqlite", "--output", str(output)])
+
+    rows = sqlite3.connect(output).execute("SELECT pk, sk, item FROM vessel_items")
+    items = {(pk, sk): json.loads(item) for pk, sk, item in rows}
+    assert len(items) == 5
+    assert all(sk.endswith(item["imo_number"]) for (_, sk), item in items.items())
+
+
+def test_main_reads_globs_and_stdin(csv_path, tmp_path, monkeypatch, caplog):
+
+    (tmp_path / "2019 EU MRV.csv").write_bytes(get_content(CSV_CONTENT[:3]))
+    monkeypatch.setattr(
+        "sys.stdin", io.TextIOWrapper(io.BytesIO(get_content(CSV_CONTENT[:2])))
+    )
+
+    main([str(tmp_path / "*.csv"), "-", "--output", str(tmp_path / "items.ndjson")])
+
+    assert [
+        (summary["file"], summary["written"]) for summary in get_ingested_files(caplog)
+    ] == [(str(csv_path), 5), (str(tmp_path / "2019 EU MRV.csv"), 2), ("-", 1)]
+
+
+def test_main_needs_file_paths_for_processes(tmp_path):
+
+    with pytest.raises(SystemExit):
+        main(["-", "--processes", "2", "--output", str(tmp_path / "items.ndjson")])
+
+
+def test_main_needs_an_output_path_for_file_sinks(csv_path):
+
+    with pytest.raises(SystemExit):
+        main([str(csv_path), "--sink", "sqlite"])
+
+
+def test_main_sets_write_capacity(csv_path, tmp_path):
+
+    try:
+        main(
+            [
+                str(csv_path),
+                "--output",
+                str(tmp_path / "items.ndjson"),
+                "--write-capacity",
+                "1000",
+            ]
+        )
+
+        assert get_runtime_context().write_rate_limiter.max_rate == 1000
+    finally:
+        reset_runtime_context()
+
+
+def test_expand_paths_raises_when_nothing_matches(tmp_path):
+
+    with pytest.raises(FileNotFoundError):
+        expand_paths([str(tmp_path / "*.csv")])
+
+
+def test_generate_vessel_items_in_processes(tmp_path):
+
+    rows = CSV_CONTENT + [[str(int(row[0]) + 1), *row[1:]] for row in CSV_CONTENT[1:]]
+    path = tmp_path / "2018 EU MRV.csv"
+    path.write_bytes(get_content(rows))
+
+    items = list(generate_vessel_items_in_processes(str(path), 2, 1000))
+
+    assert [item["imo_number"] for item in items] == [row[0] for row in rows[1:]]
+
+
+def test_dynamodb_sink_creates_table_and_writes(aws_credentials):
+
+    sink = DynamoDBSink()
+    try:
+        summary = write_vessel_generator(
+            get_vessel_generator({}, deepcopy(CSV_CONTENT)), sink.write_batch
+        )
+
+        assert (summary.written, summary.failed) == (5, 0)
+        assert VesselItemModel.count(get_partition_key("5383304")) == 1
+    finally:
+        sink.close()
+
+
+def test_dynamodb_sink_restores_the_model_connection(mocker, aws_credentials):
+
+    mocker.patch.object(VesselItemModel, "exists", return_value=True)
+    host, connection = VesselItemModel.Meta.host, VesselItemModel._connection
+
+    sink = DynamoDBSink("http://localhost:8000")
+    assert VesselItemModel.Meta.host == "http://localhost:8000"
+    sink.close()
+
+    assert VesselItemModel.Meta.host == host
+    assert VesselItemModel._connection is connection
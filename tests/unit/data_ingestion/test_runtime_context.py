@@ -0,0 +1,45 @@
+from src.data_ingestion.handler import handler
+from src.data_ingestion.runtime_context import (
+    get_runtime_context,
+    reset_runtime_context,
+)
+
+
+def test_get_runtime_context_is_cached(mocker, aws_credentials):
+
+    load_column_type_mappings = mocker.patch(
+        "src.data_ingestion.runtime_context.load_column_type_mappings",
+        return_value={
+            "float_columns": ["total_co_emissions_m_tonnes"],
+            "upper_case_columns": ["name"],
+            "date_columns": ["doc_issue_date"],
+        },
+    )
+
+    runtime_context = get_runtime_context()
+
+    assert get_runtime_context() is runtime_context
+    assert runtime_context.s3_client is runtime_context.s3_client
+    assert runtime_context.column_type_mappings["upper_case_columns"] == ["name"]
+    assert load_column_type_mappings.call_count == 1
+
+    reset_runtime_context()
+
+    assert get_runtime_context() is not runtime_context
+    assert load_column_type_mappings.call_count == 2
+
+
+def test_handler_records_cold_and_warm_starts(mocker, caplog):
+
+    mocker.patch("src.data_ingestion.handler.get_vessel_generator", return_value=None)
+
+    handler({}, None)
+    handler({}, None)
+
+    starts = [
+        record.msg["content"]["start"]
+        for record in caplog.records
+        if record.msg["message"] == "Runtime context ready"
+    ]
+    assert starts == ["cold", "warm"]
+    assert get_runtime_context().invocations == 2
@@ -0,0 +1,53 @@
+from copy import deepcopy
+
+import pytest
+
+from src.data_ingestion.vessel_item_builder import (
+    METRIC_TONNE,
+    VESSEL_ITEM_FIELDS,
+    VesselItemField,
+    compile_vessel_item_builder,
+)
+from tests.resources.vessel_data import VESSEL_DATA_CLEAN
+
+
+@pytest.mark.parametrize("vessel_data", deepcopy(VESSEL_DATA_CLEAN))
+def test_compile_vessel_item_builder_by_position(vessel_data):
+
+    columns = list(vessel_data)
+    build_by_name = compile_vessel_item_builder()
+    build_by_position = compile_vessel_item_builder(columns)
+
+    assert build_by_position(list(vessel_data.values())) == build_by_name(vessel_data)
+
+
+def test_compile_vessel_item_builder_missing_column():
+
+    vessel_data = deepcopy(VESSEL_DATA_CLEAN[0])
+    del vessel_data["verifier_city"]
+
+    with pytest.raises(KeyError, match="verifier_city"):
+        compile_vessel_item_builder(list(vessel_data))
+
+    with pytest.raises(KeyError, match="verifier_city"):
+        compile_vessel_item_builder()(vessel_data)
+
+
+def test_compile_vessel_item_builder_custom_fields():
+
+    fields = VESSEL_ITEM_FIELDS[:2] + [
+        VesselItemField("metrics.total", "total", METRIC_TONNE, description="Total"),
+        VesselItemField("monitoring.a", "a", description="Method A"),
+    ]
+    build_vessel_item = compile_vessel_item_builder(fields=fields)
+
+    assert build_vessel_item(
+        {"imo_number": "1234567", "name": "ASTORIA", "total": 1.5, "a": "Yes"}
+    ) == {
+        "imo_number": "1234567",
+        "name": "ASTORIA",
+        "metrics": {
+            "total": {"value": 1.5, "unit": "metric tonne", "description": "Total"}
+        },
+        "monitoring": {"a": {"value": "Yes", "description": "Method A"}},
+    }
@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from src.data_ingestion.writer_pool import VesselWriterPool
+from src.models.capacity import WriteRateLimiter
+from src.models.pynamo_models import BatchWriteResult
+
+
+@pytest.fixture(autouse=True)
+def create_connection(mocker):
+    return mocker.patch(
+        "src.data_ingestion.writer_pool.VesselItemModel.create_connection",
+        side_effect=object,
+    )
+
+
+def test_vessel_writer_pool_totals(create_connection):
+
+    connections = set()
+    lock = threading.Lock()
+
+    def write_batch(batch, connection):
+        with lock:
+            connections.add(connection)
+        return BatchWriteResult(written=len(batch) - 4, failed=1, skipped=3, changed=2)
+
+    with VesselWriterPool(write_batch, workers=3, max_pending=2) as writer_pool:
+        for _ in range(10):
+            writer_pool.submit([{}] * 25)
+
+    assert writer_pool.close() == BatchWriteResult(
+        written=210, failed=10, skipped=30, changed=20
+    )
+    assert writer_pool.batches == 10
+    assert len(connections) <= create_connection.call_count <= 3
+
+
+def test_vessel_writer_pool_backpressure():
+
+    release = threading.Event()
+
+    def write_batch(batch, connection):
+        release.wait()
+        return BatchWriteResult(written=len(batch), failed=0)
+
+    writer_pool = VesselWriterPool(write_batch, workers=1, max_pending=1)
+    writer_pool.submit([{}])
+    writer_pool.submit([{}])
+
+    submitter = threading.Thread(target=writer_pool.submit, args=([{}],))
+    submitter.start()
+    submitter.join(timeout=0.2)
+    assert submitter.is_alive()
+
+    release.set()
+    submitter.join()
+    assert writer_pool.close() == BatchWriteResult(written=3, failed=0)
+
+
+def test_vessel_writer_pool_counts_errors_as_failures():
+
+    def write_batch(batch, connection):
+        raise ConnectionError("Connection reset")
+
+    writer_pool = VesselWriterPool(write_batch, workers=2)
+    writer_pool.submit([{}] * 5)
+
+    assert writer_pool.close() == BatchWriteResult(written=0, failed=5)
+
+    with pytest.raises(RuntimeError):
+        writer_pool.submit([{}])
+
+
+def test_vessel_writer_pool_records_the_first_failed_batch():
+
+    def write_batch(batch, connection):
+        failed = int(batch[0])
+        return BatchWriteResult(written=1 - failed, failed=failed)
+
+    with VesselWriterPool(write_batch, workers=3) as writer_pool:
+        for failed in [False, False, True, False, True]:
+            writer_pool.submit([failed])
+
+    assert writer_pool.first_failed_batch == 2
+
+
+def test_vessel_writer_pool_uses_the_connections_it_is_given(create_connection):
+
+    connections = []
+
+    def write_batch(batch, connection):
+        connections.append(connection)
+        return BatchWriteResult(written=len(batch), failed=0)
+
+    with VesselWriterPool(
+        write_batch, workers=2, create_connection=lambda: None
+    ) as writer_pool:
+        for _ in range(4):
+            writer_pool.submit([{}])
+
+    assert connections == [None] * 4
+    assert create_connection.call_count == 0
+
+
+def test_vessel_writer_pool_estimates_the_time_to_drain():
+
+    rate_limiter = WriteRateLimiter(max_rate=100)
+    rate_limiter.consumed_units = 1000.0
+    release = threading.Event()
+    finished = threading.Event()
+
+    def write_batch(batch, connection):
+        if finished.is_set():
+            release.wait()
+        rate_limiter.record_write(5 * len(batch), None, throttled=False)
+        finished.set()
+        return BatchWriteResult(written=len(batch), failed=0)
+
+    writer_pool = VesselWriterPool(
+        write_batch, workers=1, max_pending=4, rate_limiter=rate_limiter
+    )
+    assert writer_pool.get_drain_ms() == 0.0
+    writer_pool.submit([{}] * 10)
+    finished.wait()
+    writer_pool.submit([{}] * 10)
+    writer_pool.submit([{}] * 10)
+
+    # 20 pending items of 5 units each at 100 units per second
+    assert writer_pool.get_drain_ms() == pytest.approx(1000)
+
+    release.set()
+    writer_pool.close()
+    assert writer_pool.get_drain_ms() == 0.0
+    assert VesselWriterPool(write_batch).get_drain_ms() == 0.0
@@ -35,6 +35,22 @@ def shipping_data_table():
             AttributeDefinitions=[
                 {"AttributeName": "PK", "AttributeType": "S"},
                 {"AttributeName": "SK", "AttributeType": "S"},
+                {"AttributeName": "GSI1PK", "AttributeType": "S"},
+                {"AttributeName": "GSI1SK", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "GSI1",
+                    "KeySchema": [
+                        {"AttributeName": "GSI1PK", "KeyType": "HASH"},
+                        {"AttributeName": "GSI1SK", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                    "ProvisionedThroughput": {
+                        "ReadCapacityUnits": 25,
+                        "WriteCapacityUnits": 25,
+                    },
+                }
             ],
             ProvisionedThroughput={"ReadCapacityUnits": 25, "WriteCapacityUnits": 25},
         )
@@ -47,9 +63,12 @@ def shipping_data_table():
 @pytest.fixture()
 def sample_vessel_item():
     return {
-        "pk": "EU_MRV_EMISSIONS_DATA",
+        "pk": "EU_MRV_EMISSIONS_DATA#3",
         "sk": "REPORTING_PERIOD#2018#IMO_NUMBER#5383304",
+        "gsi1pk": "IMO_NUMBER#5383304",
+        "gsi1sk": "REPORTING_PERIOD#2018",
         "updated_date": "2021-07-30 09:00:00",
+        "content_hash": "c6d8cb0fab3d53bc61281aa2e0d2770aefcf5613a9411f83825b26bb6da993f3",
         "imo_number": "5383304",
         "name": "ASTORIA",
         "ship_type": "Passenger ship",
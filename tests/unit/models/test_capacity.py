@@ -0,0 +1,100 @@
+from copy import deepcopy
+
+import pytest
+
+from src.models.capacity import (
+    WriteRateLimiter,
+    estimate_attribute_size,
+    estimate_write_units,
+    get_consumed_capacity,
+)
+from src.models.pynamo_models import VesselItemModel
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_estimate_attribute_size():
+    assert estimate_attribute_size({"S": "CO₂"}) == 5
+    assert estimate_attribute_size({"N": "6307.75"}) == 4
+    assert estimate_attribute_size({"N": "0.5"}) == 2
+    assert estimate_attribute_size({"NULL": True}) == 1
+    assert estimate_attribute_size({"M": {"value": {"N": "1"}}}) == 3 + 5 + 2 + 1
+    assert estimate_attribute_size({"L": [{"S": "ab"}, {"BOOL": True}]}) == 3 + 3 + 2
+
+
+def test_estimate_write_units(aws_credentials):
+    item = VesselItemModel.from_vessel_item(deepcopy(VESSEL_ITEMS[0])).serialize()
+
+    assert estimate_write_units(item) == 4
+    assert estimate_write_units({"PK": {"S": "EU_MRV_EMISSIONS_DATA"}}) == 1
+
+
+def test_get_consumed_capacity():
+    data = {"ConsumedCapacity": [{"TableName": "shipping-data", "CapacityUnits": 3.0}]}
+
+    assert get_consumed_capacity(data, "shipping-data") == 3.0
+    assert get_consumed_capacity(data, "other-table") is None
+    assert get_consumed_capacity({}, "shipping-data") is None
+
+
+def test_get_consumed_capacity_leaves_out_indexes():
+    data = {
+        "ConsumedCapacity": [
+            {
+                "TableName": "shipping-data",
+                "CapacityUnits": 6.0,
+                "Table": {"CapacityUnits": 3.0},
+                "GlobalSecondaryIndexes": {"GSI1": {"CapacityUnits": 3.0}},
+            }
+        ]
+    }
+
+    assert get_consumed_capacity(data, "shipping-data") == 3.0
+
+
+def test_write_rate_limiter_waits_for_tokens():
+    clock = FakeClock()
+    rate_limiter = WriteRateLimiter(max_rate=100, clock=clock, sleep=clock.sleep)
+
+    rate_limiter.acquire(100)
+    assert clock.sleeps == []
+
+    rate_limiter.acquire(50)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+    rate_limiter.acquire(250)
+    assert clock.now == pytest.approx(1.5)
+    assert rate_limiter.tokens == pytest.approx(-150)
+
+
+def test_write_rate_limiter_aimd():
+    clock = FakeClock()
+    rate_limiter = WriteRateLimiter(
+        max_rate=200, min_rate=10, increase=5, clock=clock, sleep=clock.sleep
+    )
+
+    rate_limiter.record_throttle()
+    rate_limiter.record_write(10, 12.0, throttled=True)
+    assert rate_limiter.rate == 50
+    assert rate_limiter.throttles == 2
+    assert rate_limiter.consumed_units == 12.0
+
+    rate_limiter.record_write(10, None, throttled=False)
+    assert rate_limiter.rate == 55
+    assert rate_limiter.consumed_units == 22.0
+
+    for _ in range(10):
+        rate_limiter.record_throttle()
+    assert rate_limiter.rate == 10
@@ -0,0 +1,152 @@
+import random
+from copy import deepcopy
+from datetime import date, datetime
+
+import pytest
+from pydantic import BaseModel, ValidationError, validator
+
+from src.models.fast_validation import (
+    NotFastValidated,
+    compile_model_validator,
+    fast_validate_vessel_item,
+    validate_vessel_item,
+)
+from src.models.pydantic_models import (
+    Boolean,
+    Unit,
+    VesselItem,
+    model_to_primitive_dict,
+)
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+MISSING = object()
+
+CANDIDATE_VALUES = [
+    MISSING,
+    None,
+    "",
+    "Yes",
+    "No",
+    "maybe",
+    "1234567",
+    "12345678",
+    "1234567\n",
+    "١٢٣٤٥٦٧",
+    "2019-02-05",
+    "2019-02-30",
+    "2019-2-5",
+    "05/02/2019",
+    "20190205",
+    "nautical mile",
+    "metric tonne",
+    "12.5",
+    0,
+    2018,
+    12.5,
+    True,
+    date(2019, 2, 5),
+    datetime(2019, 2, 5, 10, 30),
+    {},
+    [],
+    Boolean.yes,
+    Unit.hour,
+]
+
+
+def get_value_paths(dictionary, path=()):
+    for key, value in dictionary.items():
+        if isinstance(value, dict):
+            yield from get_value_paths(value, path + (key,))
+        yield path + (key,)
+
+
+def replace_value(dictionary, path, value):
+    mutated = deepcopy(dictionary)
+    parent = mutated
+    for key in path[:-1]:
+        parent = parent[key]
+    if value is MISSING:
+        del parent[path[-1]]
+    else:
+        parent[path[-1]] = value
+    return mutated
+
+
+def generate_mutated_vessel_items(seed=20, mutations_per_path=2):
+    generator = random.Random(seed)
+    for vessel_item in VESSEL_ITEMS:
+        paths = list(get_value_paths(vessel_item))
+        for path in paths:
+            for value in generator.sample(CANDIDATE_VALUES, mutations_per_path):
+                yield replace_value(vessel_item, path, value)
+        for _ in range(len(paths) // 2):
+            mutated = vessel_item
+            for path in generator.sample(paths, 3):
+                try:
+                    mutated = replace_value(
+                        mutated, path, generator.choice(CANDIDATE_VALUES)
+                    )
+                except (KeyError, TypeError):
+                    pass
+            yield mutated
+
+
+def validate_with_pydantic(vessel_item):
+    try:
+        return model_to_primitive_dict(VesselItem(**vessel_item)), None
+    except ValidationError as error:
+        return None, error.errors()
+
+
+def test_fast_validator_accepts_vessel_items():
+    for vessel_item in VESSEL_ITEMS:
+        assert fast_validate_vessel_item(deepcopy(vessel_item)) == (
+            validate_with_pydantic(deepcopy(vessel_item))[0]
+        )
+
+
+def test_fast_validator_agrees_with_pydantic():
+
+    fast_validated = 0
+    for vessel_item in generate_mutated_vessel_items():
+        expected, errors = validate_with_pydantic(vessel_item)
+
+        try:
+            assert fast_validate_vessel_item(vessel_item) == expected
+            fast_validated += 1
+        except NotFastValidated:
+            pass
+
+        if errors is None:
+            assert validate_vessel_item(vessel_item) == expected
+        else:
+            with pytest.raises(ValidationError) as error:
+                validate_vessel_item(vessel_item)
+            assert error.value.errors() == errors
+
+    assert fast_validated > 0
+
+
+def test_fast_validator_falls_back_for_coerced_values():
+    vessel_item = deepcopy(VESSEL_ITEMS[0])
+    vessel_item["reporting_period"] = "2018"
+
+    with pytest.raises(NotFastValidated):
+        fast_validate_vessel_item(vessel_item)
+    assert validate_vessel_item(vessel_item)["reporting_period"] == 2018
+
+
+def test_compile_model_validator_requires_checks_for_validators():
+    class Model(BaseModel):
+        value: str
+
+        @validator("value")
+        @classmethod
+        def upper_case(cls, value: str) -> str:
+            return value.upper()
+
+    with pytest.raises(TypeError):
+        compile_model_validator(Model)
+    assert compile_model_validator(Model, {"value": str.isupper})({"value": "A"}) == {
+        "value": "A"
+    }
@@ -0,0 +1,77 @@
+from copy import deepcopy
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.field_projection import (
+    InvalidFieldPath,
+    normalise_field_paths,
+    project_vessel_item,
+    resolve_field_path,
+)
+from src.models.pydantic_models import Metric, VesselItem
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+
+def test_resolve_field_path():
+    model, field = resolve_field_path("co2_emissions_metrics.all_voyages.total")
+
+    assert field.name == "total"
+    assert field.type_ is Metric
+    assert resolve_field_path("imo_number")[0] is VesselItem
+
+
+@pytest.mark.parametrize(
+    "path", ["", "pk", "imo_number.value", "co2_emissions_metrics.total"]
+)
+def test_resolve_field_path_invalid(path):
+    with pytest.raises(InvalidFieldPath):
+        resolve_field_path(path)
+
+
+def test_normalise_field_paths():
+    assert normalise_field_paths(
+        [
+            "name",
+            "time_metrics.total_time_spent_at_sea",
+            "name",
+            "time_metrics",
+        ]
+    ) == ["name", "time_metrics"]
+
+
+def test_project_vessel_item():
+    vessel_item = deepcopy(VESSEL_ITEMS[0])
+
+    assert project_vessel_item(
+        vessel_item,
+        ["imo_number", "doc_issue_date", "co2_emissions_metrics.all_voyages.total"],
+    ) == {
+        "imo_number": "5383304",
+        "doc_issue_date": "2019-02-05",
+        "co2_emissions_metrics": {
+            "all_voyages": {"total": {"value": 20080.25, "unit": "metric tonne"}}
+        },
+    }
+
+
+def test_project_vessel_item_missing_optional_field():
+    assert project_vessel_item({}, ["technical_efficiency"]) == {
+        "technical_efficiency": None
+    }
+
+
+def test_project_vessel_item_validation_error():
+    vessel_item = deepcopy(VESSEL_ITEMS[0])
+    vessel_item["imo_number"] = "12345678"
+    vessel_item["time_metrics"]["total_time_spent_at_sea"]["unit"] = "day"
+
+    with pytest.raises(ValidationError) as error:
+        project_vessel_item(
+            vessel_item, ["imo_number", "time_metrics.total_time_spent_at_sea", "name"]
+        )
+
+    assert [tuple(error["loc"]) for error in error.value.errors()] == [
+        ("imo_number",),
+        ("time_metrics", "total_time_spent_at_sea", "unit"),
+    ]
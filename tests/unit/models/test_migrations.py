@@ -0,0 +1,102 @@
+from copy import deepcopy
+
+import pytest
+from pynamodb.exceptions import PutError
+
+from src.models.migrations import (
+    LEGACY_PARTITION_KEY,
+    backfill_imo_number_index,
+    main,
+    shard_partition_keys,
+)
+from src.models.pynamo_models import VesselItemModel, get_partition_keys
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+
+def write_vessel_items_without_index_keys(table):
+    for vessel_item in deepcopy(VESSEL_ITEMS):
+        item = VesselItemModel.from_vessel_item(vessel_item)
+        item.gsi1pk = None
+        item.gsi1sk = None
+        item.save()
+
+
+def test_backfill_imo_number_index(shipping_data_table, aws_credentials):
+
+    write_vessel_items_without_index_keys(shipping_data_table)
+    assert VesselItemModel.read_vessel_history(VESSEL_ITEMS[0]["imo_number"]) == []
+
+    assert backfill_imo_number_index() == 5
+    assert VesselItemModel.read_vessel_history(VESSEL_ITEMS[0]["imo_number"]) == [
+        VESSEL_ITEMS[0]
+    ]
+    assert backfill_imo_number_index() == 0
+
+
+def test_shard_partition_keys(shipping_data_table, aws_credentials):
+
+    for vessel_item in deepcopy(VESSEL_ITEMS):
+        item = VesselItemModel.from_vessel_item(vessel_item)
+        item.pk = LEGACY_PARTITION_KEY
+        item.save()
+
+    assert shard_partition_keys() == 5
+    assert VesselItemModel.count(LEGACY_PARTITION_KEY) == 0
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
+    for vessel_item in VESSEL_ITEMS:
+        assert (
+            VesselItemModel.read_vessel_item(
+                vessel_item["reporting_period"], vessel_item["imo_number"]
+            )
+            == vessel_item
+        )
+    assert shard_partition_keys() == 0
+
+
+def test_shard_partition_keys_keeps_legacy_items_when_writes_fail(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    for vessel_item in deepcopy(VESSEL_ITEMS):
+        item = VesselItemModel.from_vessel_item(vessel_item)
+        item.pk = LEGACY_PARTITION_KEY
+        item.save()
+    batch_write_item = mocker.patch.object(
+        VesselItemModel._get_connection(),
+        "batch_write_item",
+        side_effect=PutError("Failed to batch write items"),
+    )
+
+    with pytest.raises(PutError):
+        shard_partition_keys()
+
+    assert all(
+        not call.kwargs.get("delete_items") for call in batch_write_item.call_args_list
+    )
+    assert VesselItemModel.count(LEGACY_PARTITION_KEY) == 5
+
+
+def test_migrations_main(shipping_data_table, aws_credentials, caplog):
+
+    write_vessel_items_without_index_keys(shipping_data_table)
+
+    main(["backfill-imo-number-index", "--read-rate-limit", "100"])
+
+    assert caplog.records[-1].message == str(
+        {"message": "Backfilled IMO number index", "content": 5}
+    )
+
+
+def test_migrations_main_shard_partition_keys(
+    shipping_data_table, aws_credentials, caplog
+):
+
+    item = VesselItemModel.from_vessel_item(deepcopy(VESSEL_ITEMS[0]))
+    item.pk = LEGACY_PARTITION_KEY
+    item.save()
+
+    main(["shard-partition-keys"])
+
+    assert caplog.records[-1].message == str(
+        {"message": "Sharded partition keys", "content": 1}
+    )
@@ -1,10 +1,16 @@
+import json
 from copy import deepcopy
 from datetime import date
 
 import pytest
 from pydantic import ValidationError
 
-from src.models.pydantic_models import Boolean, Unit, VesselItem
+from src.models.pydantic_models import (
+    Boolean,
+    Unit,
+    VesselItem,
+    model_to_primitive_dict,
+)
 from tests.resources.vessel_data import VESSEL_ITEMS
 
 
@@ -152,3 +158,11 @@ def test_vessel_item_happy_path():
         },
         "additional_information": None,
     }
+
+
+@pytest.mark.parametrize("vessel_item", VESSEL_ITEMS)
+def test_model_to_primitive_dict_matches_json_round_trip(vessel_item):
+    vessel_item_object = VesselItem(**deepcopy(vessel_item))
+    assert model_to_primitive_dict(vessel_item_object) == json.loads(
+        vessel_item_object.json()
+    )
@@ -1,8 +1,20 @@
 from copy import deepcopy
 
+import pytest
+from botocore.exceptions import ClientError
 from freezegun import freeze_time
+from pynamodb.connection import TableConnection
+from pynamodb.exceptions import GetError, PutError
 
-from src.models.pynamo_models import VesselItemModel
+from src.models.capacity import WriteRateLimiter
+from src.models.pynamo_models import (
+    LEGACY_PARTITION_KEY,
+    BatchWriteResult,
+    VesselItemModel,
+    VesselItemNotFound,
+    VesselItemsUnavailable,
+    get_partition_keys,
+)
 from tests.resources.vessel_data import VESSEL_ITEMS
 
 
@@ -40,8 +52,460 @@ def test_read_vessel_item(sample_vessel_item, shipping_data_table, aws_credentia
     read_item = VesselItemModel.read_vessel_item(
         reporting_period=reporting_period, imo_number=imo_number
     )
-    read_item["pk"] = "EU_MRV_EMISSIONS_DATA"
+    read_item["pk"] = "EU_MRV_EMISSIONS_DATA#3"
     read_item["sk"] = f"REPORTING_PERIOD#{reporting_period}#IMO_NUMBER#{imo_number}"
+    read_item["gsi1pk"] = f"IMO_NUMBER#{imo_number}"
+    read_item["gsi1sk"] = f"REPORTING_PERIOD#{reporting_period}"
     read_item["updated_date"] = "2021-07-30 09:00:00"
+    read_item["content_hash"] = sample_vessel_item["content_hash"]
 
     assert read_item == sample_vessel_item
+
+
+def test_read_vessel_item_not_found(shipping_data_table, aws_credentials):
+
+    with pytest.raises(VesselItemNotFound):
+        VesselItemModel.read_vessel_item(reporting_period=2018, imo_number="5383304")
+
+
+def write_legacy_vessel_item(vessel_item):
+    item = VesselItemModel.from_vessel_item(deepcopy(vessel_item))
+    item.pk = LEGACY_PARTITION_KEY
+    item.save()
+
+
+def test_read_vessel_item_falls_back_to_legacy_partition_key(
+    shipping_data_table, aws_credentials
+):
+
+    write_legacy_vessel_item(VESSEL_ITEMS[0])
+
+    with pytest.raises(VesselItemNotFound):
+        VesselItemModel.read_vessel_item(reporting_period=2018, imo_number="5383304")
+    assert (
+        VesselItemModel.read_vessel_item(
+            reporting_period=2018, imo_number="5383304", legacy_fallback=True
+        )
+        == VESSEL_ITEMS[0]
+    )
+
+
+def test_read_vessel_items_fall_back_to_legacy_partition_key(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    VesselItemModel.write_vessel_items(deepcopy(VESSEL_ITEMS[:1]))
+    write_legacy_vessel_item(VESSEL_ITEMS[1])
+    batch_get_item = mocker.spy(TableConnection, "batch_get_item")
+    keys = [
+        (2018, VESSEL_ITEMS[0]["imo_number"]),
+        (2018, VESSEL_ITEMS[1]["imo_number"]),
+        (2018, "1234567"),
+    ]
+
+    assert VesselItemModel.read_vessel_items(keys, legacy_fallback=True) == [
+        VESSEL_ITEMS[0],
+        VESSEL_ITEMS[1],
+        None,
+    ]
+    assert len(batch_get_item.call_args_list[1].args[1]) == 2
+
+
+def test_read_vessel_item_uses_get_item(shipping_data_table, aws_credentials, mocker):
+
+    VesselItemModel.write_vessel_item(deepcopy(VESSEL_ITEMS[0]))
+    get_item = mocker.spy(TableConnection, "get_item")
+    query = mocker.spy(TableConnection, "query")
+
+    VesselItemModel.read_vessel_item(
+        reporting_period=2018, imo_number="5383304", consistent_read=True
+    )
+
+    assert get_item.call_count == 1
+    assert get_item.call_args.kwargs["consistent_read"] is True
+    assert query.call_count == 0
+
+
+def test_read_vessel_item_attributes_to_get(shipping_data_table, aws_credentials):
+
+    VesselItemModel.write_vessel_item(deepcopy(VESSEL_ITEMS[0]))
+
+    read_item = VesselItemModel.read_vessel_item(
+        reporting_period=2018,
+        imo_number="5383304",
+        attributes_to_get=["imo_number", "name"],
+    )
+
+    assert read_item == {"imo_number": "5383304", "name": "ASTORIA"}
+
+
+def test_read_vessel_items(shipping_data_table, aws_credentials, mocker):
+
+    VesselItemModel.write_vessel_items(deepcopy(VESSEL_ITEMS))
+    batch_get_item = mocker.spy(TableConnection, "batch_get_item")
+    keys = [(2018, str(imo_number)) for imo_number in range(1000000, 1000150)]
+    keys[10] = (2018, VESSEL_ITEMS[1]["imo_number"])
+    keys[120] = (2018, VESSEL_ITEMS[0]["imo_number"])
+    keys[121] = (2018, VESSEL_ITEMS[1]["imo_number"])
+
+    vessel_items = VesselItemModel.read_vessel_items(keys)
+
+    assert batch_get_item.call_count == 2
+    assert len(vessel_items) == 150
+    assert vessel_items[10] == VESSEL_ITEMS[1]
+    assert vessel_items[120] == VESSEL_ITEMS[0]
+    assert vessel_items[121] == VESSEL_ITEMS[1]
+    assert vessel_items.count(None) == 147
+
+
+def test_read_vessel_items_attributes_to_get(shipping_data_table, aws_credentials):
+
+    VesselItemModel.write_vessel_items(deepcopy(VESSEL_ITEMS))
+
+    vessel_items = VesselItemModel.read_vessel_items(
+        [(2018, VESSEL_ITEMS[0]["imo_number"])], attributes_to_get=["name"]
+    )
+
+    assert vessel_items == [{"name": VESSEL_ITEMS[0]["name"]}]
+
+
+def test_read_vessel_items_retries_unprocessed_keys(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    VesselItemModel.write_vessel_items(deepcopy(VESSEL_ITEMS[:2]))
+    unprocessed_key = {
+        "PK": {"S": "EU_MRV_EMISSIONS_DATA#3"},
+        "SK": {"S": "REPORTING_PERIOD#2018#IMO_NUMBER#5383304"},
+    }
+    batch_get_item = TableConnection.batch_get_item
+    responses = []
+
+    def batch_get_item_with_unprocessed_key(self, keys, **kwargs):
+        data = batch_get_item(self, keys, **kwargs)
+        if not responses:
+            data["Responses"]["shipping-data"] = [
+                item
+                for item in data["Responses"]["shipping-data"]
+                if item["SK"] != unprocessed_key["SK"]
+            ]
+            data["UnprocessedKeys"] = {"shipping-data": {"Keys": [unprocessed_key]}}
+        responses.append(data)
+        return data
+
+    mocker.patch("src.models.pynamo_models.time.sleep")
+    mocker.patch.object(
+        TableConnection, "batch_get_item", batch_get_item_with_unprocessed_key
+    )
+
+    vessel_items = VesselItemModel.read_vessel_items(
+        [(2018, item["imo_number"]) for item in VESSEL_ITEMS[:2]]
+    )
+
+    assert vessel_items == VESSEL_ITEMS[:2]
+    assert len(responses) == 2
+
+
+def test_read_vessel_items_unavailable(shipping_data_table, aws_credentials, mocker):
+
+    mocker.patch("src.models.pynamo_models.time.sleep")
+    batch_get_item = mocker.patch.object(
+        TableConnection,
+        "batch_get_item",
+        return_value={
+            "Responses": {"shipping-data": []},
+            "UnprocessedKeys": {
+                "shipping-data": {
+                    "Keys": [
+                        {
+                            "PK": {"S": "EU_MRV_EMISSIONS_DATA#3"},
+                            "SK": {"S": "REPORTING_PERIOD#2018#IMO_NUMBER#5383304"},
+                        }
+                    ]
+                }
+            },
+        },
+    )
+
+    with pytest.raises(VesselItemsUnavailable):
+        VesselItemModel.read_vessel_items([(2018, "5383304")])
+    assert batch_get_item.call_count == 5
+
+
+@pytest.mark.parametrize("limit", [1, 7, 100])
+def test_list_vessel_items(shipping_data_table, aws_credentials, limit):
+
+    vessel_items = []
+    for index in range(60):
+        vessel_item = deepcopy(VESSEL_ITEMS[index % 5])
+        vessel_item["imo_number"] = str(9000000 - index * 7919)
+        vessel_item["reporting_period"] = 2019 if index % 6 == 0 else 2018
+        vessel_items.append(vessel_item)
+    # moto applies the query limit in write order, so write in sort key order
+    vessel_items.sort(key=lambda item: (item["reporting_period"], item["imo_number"]))
+    for start in range(0, len(vessel_items), 25):
+        VesselItemModel.write_vessel_items(vessel_items[start : start + 25])
+
+    pages = []
+    cursor = None
+    while not pages or cursor is not None:
+        page, cursor = VesselItemModel.list_vessel_items(2018, limit, cursor=cursor)
+        pages.append(page)
+
+    assert all(len(page) <= limit for page in pages)
+    assert [item for page in pages for item in page] == sorted(
+        (item for item in vessel_items if item["reporting_period"] == 2018),
+        key=lambda item: item["imo_number"],
+    )
+
+
+def test_list_vessel_items_attributes_to_get(shipping_data_table, aws_credentials):
+
+    VesselItemModel.write_vessel_items(deepcopy(VESSEL_ITEMS))
+
+    page, _ = VesselItemModel.list_vessel_items(
+        2018, limit=10, attributes_to_get=["imo_number", "name"]
+    )
+
+    assert sorted(page, key=lambda item: item["imo_number"]) == sorted(
+        (
+            {"imo_number": item["imo_number"], "name": item["name"]}
+            for item in VESSEL_ITEMS
+        ),
+        key=lambda item: item["imo_number"],
+    )
+
+
+def test_read_vessel_item_nested_attributes_to_get(
+    shipping_data_table, aws_credentials
+):
+
+    VesselItemModel.write_vessel_item(deepcopy(VESSEL_ITEMS[0]))
+
+    read_item = VesselItemModel.read_vessel_item(
+        reporting_period=2018,
+        imo_number="5383304",
+        attributes_to_get=("imo_number", "co2_emissions_metrics.all_voyages.total"),
+    )
+
+    assert read_item == {
+        "imo_number": "5383304",
+        "co2_emissions_metrics": {
+            "all_voyages": {"total": {"value": 20080.25, "unit": "metric tonne"}}
+        },
+    }
+
+
+def test_read_vessel_history(shipping_data_table, aws_credentials):
+
+    vessel_items = []
+    for reporting_period in [2020, 2018, 2019]:
+        vessel_item = deepcopy(VESSEL_ITEMS[0])
+        vessel_item["reporting_period"] = reporting_period
+        vessel_items.append(vessel_item)
+    VesselItemModel.write_vessel_items(vessel_items + deepcopy(VESSEL_ITEMS[1:]))
+
+    history = VesselItemModel.read_vessel_history(VESSEL_ITEMS[0]["imo_number"])
+
+    assert [item["reporting_period"] for item in history] == [2018, 2019, 2020]
+    assert history[0] == VESSEL_ITEMS[0]
+    assert VesselItemModel.read_vessel_history(
+        VESSEL_ITEMS[0]["imo_number"], attributes_to_get=["reporting_period"]
+    ) == [
+        {"reporting_period": 2018},
+        {"reporting_period": 2019},
+        {"reporting_period": 2020},
+    ]
+    assert VesselItemModel.read_vessel_history("1234567") == []
+
+
+def test_write_vessel_items(shipping_data_table, aws_credentials):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+
+    assert VesselItemModel.write_vessel_items(vessel_items) == BatchWriteResult(
+        written=5, failed=0
+    )
+    assert sum(map(VesselItemModel.count, get_partition_keys())) == 5
+
+
+def test_write_vessel_items_sends_the_last_item_of_duplicate_keys(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    duplicate_item = {**vessel_items[0], "name": "RENAMED"}
+    batch_write_item = mocker.spy(TableConnection, "batch_write_item")
+
+    assert VesselItemModel.write_vessel_items(
+        vessel_items + [duplicate_item]
+    ) == BatchWriteResult(written=5, failed=0, superseded=1)
+    put_keys = [
+        (item["PK"]["S"], item["SK"]["S"])
+        for item in batch_write_item.call_args.kwargs["put_items"]
+    ]
+    assert len(put_keys) == len(set(put_keys)) == 5
+    assert (
+        VesselItemModel.read_vessel_item(2018, vessel_items[0]["imo_number"])["name"]
+        == "RENAMED"
+    )
+
+
+def test_write_vessel_items_skips_unchanged_items(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    VesselItemModel.write_vessel_items(vessel_items[:3])
+    vessel_items[0]["name"] = "RENAMED"
+    batch_write_item = mocker.spy(TableConnection, "batch_write_item")
+
+    assert VesselItemModel.write_vessel_items(
+        vessel_items, skip_unchanged=True
+    ) == BatchWriteResult(written=3, failed=0, skipped=2, changed=1)
+    assert [
+        item["SK"]["S"][-7:] for item in batch_write_item.call_args.kwargs["put_items"]
+    ] == [item["imo_number"] for item in vessel_items[:1] + vessel_items[3:]]
+    assert (
+        VesselItemModel.read_vessel_item(2018, vessel_items[0]["imo_number"])["name"]
+        == "RENAMED"
+    )
+
+    assert VesselItemModel.write_vessel_items(
+        vessel_items, skip_unchanged=True
+    ) == BatchWriteResult(written=0, failed=0, skipped=5, changed=0)
+
+
+def test_create_connection_shares_the_table_description(
+    shipping_data_table, aws_credentials
+):
+
+    connection = VesselItemModel.create_connection()
+
+    assert connection is not VesselItemModel._get_connection()
+    assert (
+        connection.get_meta_table()
+        is VesselItemModel._get_connection().get_meta_table()
+    )
+
+
+def test_read_content_hashes_requests_each_key_once(
+    shipping_data_table, aws_credentials
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    VesselItemModel.write_vessel_items(vessel_items[:1])
+    vessel_item = VesselItemModel.from_vessel_item(vessel_items[0])
+
+    assert VesselItemModel.read_content_hashes(
+        [vessel_item, vessel_item], VesselItemModel.create_connection()
+    ) == {vessel_item.sk: vessel_item.content_hash}
+
+
+@pytest.mark.parametrize("error", [VesselItemsUnavailable, GetError])
+def test_write_vessel_items_writes_all_items_when_hashes_are_unavailable(
+    shipping_data_table, aws_credentials, mocker, error
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    VesselItemModel.write_vessel_items(vessel_items)
+    mocker.patch.object(VesselItemModel, "read_content_hashes", side_effect=error)
+
+    assert VesselItemModel.write_vessel_items(
+        vessel_items, skip_unchanged=True
+    ) == BatchWriteResult(written=5, failed=0)
+
+
+def test_write_vessel_items_retries_unprocessed_items(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    unprocessed_item = VesselItemModel.from_vessel_item(vessel_items[0]).serialize()
+    batch_write_item = mocker.patch.object(
+        TableConnection,
+        "batch_write_item",
+        side_effect=[
+            {
+                "UnprocessedItems": {
+                    "shipping-data": [{"PutRequest": {"Item": unprocessed_item}}]
+                }
+            },
+            {"UnprocessedItems": {}},
+        ],
+    )
+    sleep = mocker.patch("src.models.pynamo_models.time.sleep")
+
+    assert VesselItemModel.write_vessel_items(vessel_items) == BatchWriteResult(
+        written=5, failed=0
+    )
+    assert batch_write_item.call_count == 2
+    assert batch_write_item.call_args.kwargs["put_items"] == [unprocessed_item]
+    sleep.assert_called_once()
+
+
+def test_write_vessel_items_counts_failures(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    mocker.patch("src.models.pynamo_models.time.sleep")
+    mocker.patch.object(
+        TableConnection,
+        "batch_write_item",
+        side_effect=lambda put_items, **kwargs: {
+            "UnprocessedItems": {
+                "shipping-data": [{"PutRequest": {"Item": put_items[0]}}]
+            }
+        },
+    )
+
+    assert VesselItemModel.write_vessel_items(vessel_items) == BatchWriteResult(
+        written=4, failed=1
+    )
+
+    mocker.patch.object(TableConnection, "batch_write_item", side_effect=PutError)
+
+    assert VesselItemModel.write_vessel_items(vessel_items) == BatchWriteResult(
+        written=0, failed=5
+    )
+
+    with pytest.raises(ValueError):
+        VesselItemModel.write_vessel_items(vessel_items * 6)
+
+
+def test_write_vessel_items_retries_throttled_requests(
+    shipping_data_table, aws_credentials, mocker
+):
+
+    vessel_items = deepcopy(VESSEL_ITEMS)
+    mocker.patch("src.models.pynamo_models.time.sleep")
+    throttled = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "BatchWriteItem"
+    )
+    batch_write_item = mocker.patch.object(
+        TableConnection,
+        "batch_write_item",
+        side_effect=[
+            PutError(cause=throttled),
+            {
+                "ConsumedCapacity": [
+                    {
+                        "TableName": "shipping-data",
+                        "CapacityUnits": 30.0,
+                        "Table": {"CapacityUnits": 15.0},
+                        "GlobalSecondaryIndexes": {"GSI1": {"CapacityUnits": 15.0}},
+                    }
+                ]
+            },
+        ],
+    )
+    rate_limiter = WriteRateLimiter(max_rate=200, sleep=lambda seconds: None)
+
+    assert VesselItemModel.write_vessel_items(
+        vessel_items, rate_limiter=rate_limiter
+    ) == BatchWriteResult(written=5, failed=0)
+    assert rate_limiter.throttles == 1
+    assert rate_limiter.consumed_units == 15.0
+    assert rate_limiter.rate == 105.0
+    assert batch_write_item.call_args.kwargs["return_consumed_capacity"] == "INDEXES"
@@ -0,0 +1,88 @@
+import os
+import pstats
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from src.profiling.profiler import get_s3_client, profile_handler, should_profile
+
+
+@pytest.fixture(autouse=True)
+def profile_settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-2")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("PROFILE_HANDLER", raising=False)
+    monkeypatch.delenv("PROFILE_BUCKET", raising=False)
+    get_s3_client.cache_clear()
+    yield
+    get_s3_client.cache_clear()
+
+
+@profile_handler("test")
+def handler(event, context):
+    return {"body": sum(range(1000))}
+
+
+class LambdaContext:
+    aws_request_id = "request-id"
+
+
+def test_should_profile(monkeypatch):
+
+    assert not should_profile({})
+    assert not should_profile({"profile": "yes"})
+    assert should_profile({"profile": True})
+
+    monkeypatch.setenv("PROFILE_HANDLER", "true")
+
+    assert should_profile({})
+
+
+def test_profile_handler_only_profiles_when_asked(tmp_path):
+
+    assert handler({}, None) == {"body": 499500}
+    assert os.listdir(tmp_path) == []
+
+    assert handler({"profile": True}, LambdaContext()) == {"body": 499500}
+
+    [name] = os.listdir(tmp_path)
+    assert name.startswith("test-") and name.endswith("-request-id.prof")
+    assert pstats.Stats(str(tmp_path / name)).total_calls > 0
+
+
+def test_profile_handler_uploads_profiles(monkeypatch, tmp_path):
+
+    monkeypatch.setenv("PROFILE_HANDLER", "true")
+    monkeypatch.setenv("PROFILE_BUCKET", "shipping-api-test")
+
+    with mock_s3():
+        s3_client = boto3.client("s3", "eu-west-2")
+        s3_client.create_bucket(
+            Bucket="shipping-api-test",
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+        assert handler({}, LambdaContext()) == {"body": 499500}
+
+        [name] = os.listdir(tmp_path)
+        [profile] = s3_client.list_objects_v2(Bucket="shipping-api-test")["Contents"]
+        assert profile["Key"] == f"profiles/test/{name}"
+
+
+def test_profile_handler_logs_upload_errors(monkeypatch, tmp_path, caplog):
+
+    monkeypatch.setenv("PROFILE_HANDLER", "true")
+    monkeypatch.setenv("PROFILE_BUCKET", "missing-bucket")
+
+    with mock_s3():
+        assert handler({}, None) == {"body": 499500}
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert any(
+        record.msg["message"] == "Profile could not be saved"
+        for record in caplog.records
+        if isinstance(record.msg, dict)
+    )
@@ -0,0 +1,19 @@
+import pytest
+
+from src.rest_api.cache import get_vessel_item_cache
+from src.rest_api.pagination import get_next_token_secret
+
+
+@pytest.fixture(autouse=True)
+def vessel_item_cache():
+    get_vessel_item_cache.cache_clear()
+    yield get_vessel_item_cache()
+    get_vessel_item_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def next_token_secret(monkeypatch):
+    monkeypatch.setenv("NEXT_TOKEN_SECRET", "test-secret")
+    get_next_token_secret.cache_clear()
+    yield b"test-secret"
+    get_next_token_secret.cache_clear()
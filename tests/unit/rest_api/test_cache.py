@@ -0,0 +1,81 @@
+import pytest
+
+from src.models.pynamo_models import VesselItemNotFound
+from src.rest_api.cache import ReadThroughCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def load_not_found():
+    raise VesselItemNotFound
+
+
+def test_read_through_cache_hits_and_misses():
+    cache = ReadThroughCache(max_items=2, ttl=10, not_found_ttl=1, clock=Clock())
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"imo_number": "5383304"}
+
+    assert cache.get("a", load) == {"imo_number": "5383304"}
+    assert cache.get("a", load) == {"imo_number": "5383304"}
+    assert len(loads) == 1
+    assert cache.statistics() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_read_through_cache_expires_entries():
+    clock = Clock()
+    cache = ReadThroughCache(max_items=2, ttl=10, not_found_ttl=1, clock=clock)
+
+    cache.get("a", lambda: 1)
+    clock.now = 9.9
+    assert cache.get("a", lambda: 2) == 1
+    clock.now = 10
+    assert cache.get("a", lambda: 2) == 2
+    assert cache.misses == 2
+
+
+def test_read_through_cache_keeps_not_found_entries():
+    clock = Clock()
+    cache = ReadThroughCache(max_items=2, ttl=10, not_found_ttl=1, clock=clock)
+
+    with pytest.raises(VesselItemNotFound):
+        cache.get("a", load_not_found)
+    with pytest.raises(VesselItemNotFound):
+        cache.get("a", lambda: 1)
+    assert cache.hits == 1
+
+    clock.now = 1
+    assert cache.get("a", lambda: 1) == 1
+
+
+def test_read_through_cache_evicts_least_recently_used():
+    cache = ReadThroughCache(max_items=2, ttl=10, not_found_ttl=1, clock=Clock())
+
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+
+    assert cache.get("a", lambda: 0) == 1
+    assert cache.get("b", lambda: 0) == 0
+    assert cache.evictions == 2
+    assert len(cache) == 2
+
+
+def test_read_through_cache_does_not_cache_other_errors():
+    cache = ReadThroughCache(max_items=2, ttl=10, not_found_ttl=1, clock=Clock())
+
+    def load_error():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        cache.get("a", load_error)
+    assert cache.get("a", lambda: 1) == 1
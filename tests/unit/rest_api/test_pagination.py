@@ -0,0 +1,69 @@
+import pytest
+
+from src.rest_api.pagination import (
+    InvalidNextToken,
+    decode_next_token,
+    encode_next_token,
+    get_next_token_secret,
+)
+
+SECRET = b"secret"
+LAST_EVALUATED_KEY = {
+    "PK": {"S": "EU_MRV_EMISSIONS_DATA"},
+    "SK": {"S": "REPORTING_PERIOD#2019#IMO_NUMBER#5383304"},
+}
+
+
+def test_next_token_round_trip():
+    next_token = encode_next_token(LAST_EVALUATED_KEY, "2019", SECRET)
+
+    assert "EU_MRV" not in next_token
+    assert decode_next_token(next_token, "2019", SECRET) == LAST_EVALUATED_KEY
+
+
+def test_next_token_after_last_page():
+    assert encode_next_token(None, "2019", SECRET) is None
+
+
+@pytest.mark.parametrize(
+    "scope, secret",
+    [("2018", SECRET), ("2019", b"other secret")],
+)
+def test_next_token_rejects_other_scopes_and_secrets(scope, secret):
+    next_token = encode_next_token(LAST_EVALUATED_KEY, "2019", SECRET)
+
+    with pytest.raises(InvalidNextToken):
+        decode_next_token(next_token, scope, secret)
+
+
+@pytest.mark.parametrize("next_token", ["", "abc", "a.b.c", "!!!.???"])
+def test_next_token_rejects_malformed_tokens(next_token):
+    with pytest.raises(InvalidNextToken):
+        decode_next_token(next_token, "2019", SECRET)
+
+
+def test_next_token_rejects_tampered_tokens():
+    next_token = encode_next_token(LAST_EVALUATED_KEY, "2019", SECRET)
+    other_token = encode_next_token({"PK": {"S": "OTHER"}}, "2019", SECRET)
+    tampered_token = f"{other_token.split('.')[0]}.{next_token.split('.')[1]}"
+
+    with pytest.raises(InvalidNextToken):
+        decode_next_token(tampered_token, "2019", SECRET)
+
+
+def test_get_next_token_secret_reads_secure_string_parameter(mocker, monkeypatch):
+    monkeypatch.delenv("NEXT_TOKEN_SECRET")
+    monkeypatch.setenv(
+        "NEXT_TOKEN_SECRET_PARAMETER", "/shipping-api/rest-api/next-token-secret"
+    )
+    get_session = mocker.patch("src.rest_api.pagination.botocore.session.get_session")
+    ssm_client = get_session.return_value.create_client.return_value
+    ssm_client.get_parameter.return_value = {"Parameter": {"Value": "ssm-secret"}}
+
+    assert get_next_token_secret() == b"ssm-secret"
+    assert get_next_token_secret() == b"ssm-secret"
+
+    get_session.return_value.create_client.assert_called_once_with("ssm")
+    ssm_client.get_parameter.assert_called_once_with(
+        Name="/shipping-api/rest-api/next-token-secret", WithDecryption=True
+    )
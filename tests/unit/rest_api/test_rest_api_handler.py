@@ -0,0 +1,291 @@
+import subprocess
+import sys
+from copy import deepcopy
+
+import pytest
+
+from src.models.pynamo_models import VesselItemNotFound, VesselItemsUnavailable
+from src.rest_api.handler import SUMMARY_ATTRIBUTES, handler
+from src.rest_api.pagination import decode_next_token
+from tests.resources.vessel_data import VESSEL_ITEMS
+
+EVENT = {"query": {"reporting_period": 2018, "imo_number": "5383304"}}
+
+
+def test_handler_returns_vessel_item(mocker):
+    read_vessel_item = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_item",
+        return_value=deepcopy(VESSEL_ITEMS[0]),
+    )
+
+    response = handler(EVENT, None)
+
+    assert response == {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": VESSEL_ITEMS[0],
+    }
+    read_vessel_item.assert_called_once_with(
+        "2018", "5383304", attributes_to_get=None, legacy_fallback=True
+    )
+
+
+def test_handler_reads_legacy_partition_key_until_migrated(mocker, monkeypatch):
+    read_vessel_item = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_item",
+        return_value=deepcopy(VESSEL_ITEMS[0]),
+    )
+    monkeypatch.setenv("LEGACY_PARTITION_KEY_FALLBACK", "false")
+
+    handler(EVENT, None)
+
+    assert read_vessel_item.call_args.kwargs["legacy_fallback"] is False
+
+
+def test_handler_caches_vessel_items(mocker, caplog, vessel_item_cache):
+    read_vessel_item = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_item",
+        return_value=deepcopy(VESSEL_ITEMS[0]),
+    )
+
+    first_response = handler(EVENT, None)
+    second_response = handler(EVENT, None)
+
+    assert first_response == second_response
+    assert read_vessel_item.call_count == 1
+    assert vessel_item_cache.statistics() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+    }
+    assert caplog.records[-1].message == str(
+        {
+            "message": "Vessel item cache statistics",
+            "content": {"hits": 1, "misses": 1, "evictions": 0, "size": 1},
+        }
+    )
+
+
+def test_handler_caches_vessel_items_not_found(mocker):
+    read_vessel_item = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_item",
+        side_effect=VesselItemNotFound,
+    )
+
+    assert handler(EVENT, None) == {"status_code": 404}
+    assert handler(EVENT, None) == {"status_code": 404}
+    assert read_vessel_item.call_count == 1
+
+
+def test_handler_returns_vessel_items_batch(mocker):
+    read_vessel_items = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_items",
+        return_value=[None, deepcopy(VESSEL_ITEMS[0])],
+    )
+    event = {
+        "requestPath": "/vessels/batch",
+        "query": {"reporting_period": 2018, "imo_numbers": "1234567, 5383304"},
+    }
+
+    response = handler(event, None)
+
+    read_vessel_items.assert_called_once_with(
+        [("2018", "1234567"), ("2018", "5383304")],
+        attributes_to_get=None,
+        legacy_fallback=True,
+    )
+    assert response == {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": {
+            "vessels": [
+                {
+                    "reporting_period": "2018",
+                    "imo_number": "1234567",
+                    "status_code": 404,
+                },
+                {
+                    "reporting_period": "2018",
+                    "imo_number": "5383304",
+                    "status_code": 200,
+                    "body": VESSEL_ITEMS[0],
+                },
+            ]
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"reporting_period": "2018"},
+        {"imo_numbers": "5383304"},
+        {"reporting_period": "2018,2019", "imo_numbers": ",".join(["5383304"] * 251)},
+    ],
+)
+def test_handler_rejects_invalid_batches(mocker, query):
+    read_vessel_items = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_items"
+    )
+
+    response = handler({"requestPath": "/vessels/batch", "query": query}, None)
+
+    assert response["status_code"] == 400
+    assert read_vessel_items.call_count == 0
+
+
+def test_handler_returns_503_for_unavailable_batch(mocker):
+    mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_items",
+        side_effect=VesselItemsUnavailable,
+    )
+    event = {
+        "requestPath": "/vessels/batch",
+        "query": {"reporting_period": 2018, "imo_numbers": "5383304"},
+    }
+
+    assert handler(event, None) == {"status_code": 503}
+
+
+def test_handler_unknown_route():
+    assert handler({"requestPath": "/ships", "query": {}}, None) == {"status_code": 404}
+
+
+def test_handler_lists_vessels(mocker, next_token_secret):
+    cursor = {
+        "3": {
+            "PK": {"S": "EU_MRV_EMISSIONS_DATA#3"},
+            "SK": {"S": "REPORTING_PERIOD#2018#IMO_NUMBER#5383304"},
+        },
+        "4": None,
+    }
+    list_vessel_items = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.list_vessel_items",
+        return_value=([deepcopy(VESSEL_ITEMS[0])], cursor),
+    )
+    event = {
+        "requestPath": "/vessels/list",
+        "query": {"reporting_period": 2018, "limit": "1"},
+    }
+
+    response = handler(event, None)
+
+    list_vessel_items.assert_called_once_with(
+        "2018", 1, cursor=None, attributes_to_get=None
+    )
+    assert response["body"]["vessels"] == [VESSEL_ITEMS[0]]
+    next_token = response["body"]["next_token"]
+    assert decode_next_token(next_token, "2018", next_token_secret) == (cursor)
+
+    list_vessel_items.return_value = ([], None)
+    event["query"].update({"next_token": next_token, "summary": "true"})
+    response = handler(event, None)
+
+    list_vessel_items.assert_called_with(
+        "2018",
+        1,
+        cursor=cursor,
+        attributes_to_get=list(SUMMARY_ATTRIBUTES),
+    )
+    assert response["body"] == {"vessels": [], "next_token": None}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"limit": "10"},
+        {"reporting_period": "2018", "limit": "ten"},
+        {"reporting_period": "2018", "limit": "0"},
+        {"reporting_period": "2018", "limit": "501"},
+        {"reporting_period": "2018", "next_token": "abc.def"},
+    ],
+)
+def test_handler_rejects_invalid_list_requests(mocker, query):
+    list_vessel_items = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.list_vessel_items"
+    )
+
+    response = handler({"requestPath": "/vessels/list", "query": query}, None)
+
+    assert response["status_code"] == 400
+    assert list_vessel_items.call_count == 0
+
+
+def test_handler_returns_requested_fields(mocker, vessel_item_cache):
+    read_vessel_item = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_item",
+        return_value={"name": "ASTORIA"},
+    )
+    event = {
+        "query": {
+            "reporting_period": 2018,
+            "imo_number": "5383304",
+            "fields": "co2_emissions_metrics.all_voyages.total,name,"
+            "co2_emissions_metrics.all_voyages",
+        }
+    }
+
+    assert handler(event, None)["body"] == {"name": "ASTORIA"}
+    read_vessel_item.assert_called_once_with(
+        "2018",
+        "5383304",
+        attributes_to_get=["name", "co2_emissions_metrics.all_voyages"],
+        legacy_fallback=True,
+    )
+
+    handler({"query": {"reporting_period": 2018, "imo_number": "5383304"}}, None)
+    assert read_vessel_item.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "request_path",
+    ["/vessels", "/vessels/batch", "/vessels/list", "/vessels/history"],
+)
+def test_handler_rejects_unknown_fields(mocker, request_path):
+    event = {
+        "requestPath": request_path,
+        "query": {
+            "reporting_period": 2018,
+            "imo_number": "5383304",
+            "imo_numbers": "5383304",
+            "fields": "name,co2_emissions_metrics.total",
+        },
+    }
+
+    assert handler(event, None) == {
+        "status_code": 400,
+        "headers": {"content-type": "application/json"},
+        "body": {"message": "Unknown field: co2_emissions_metrics.total"},
+    }
+
+
+def test_handler_returns_vessel_history(mocker):
+    read_vessel_history = mocker.patch(
+        "src.rest_api.handler.VesselItemModel.read_vessel_history",
+        return_value=[deepcopy(VESSEL_ITEMS[0])],
+    )
+    event = {"requestPath": "/vessels/history", "query": {"imo_number": "5383304"}}
+
+    assert handler(event, None) == {
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": {"vessels": [VESSEL_ITEMS[0]]},
+    }
+    read_vessel_history.assert_called_once_with("5383304", attributes_to_get=None)
+
+    read_vessel_history.return_value = []
+    assert handler(event, None) == {"status_code": 404}
+
+
+def test_handler_import_leaves_out_lazy_dependencies():
+
+    modules = subprocess.run(
+        [sys.executable, "-c", "import sys, src.rest_api.handler; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    for package in ("aws_lambda_powertools",):
+        assert package not in modules